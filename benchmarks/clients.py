@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the cost of holding many Client instances, one per API key as multi-tenant services do, each making one
+request. Compares clients with their own connection pool to clients sharing a SharedTransport:
+
+    python -m benchmarks.clients --clients 200
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from typing import Dict
+
+import httpx
+
+import zanshinsdk
+from benchmarks.mock_api import API_URL, SyntheticZanshinApi
+
+
+class _SyntheticHTTPTransport(httpx.HTTPTransport):
+    """Real HTTP transport, with a real connection pool and SSL context, that answers from the synthetic API."""
+
+    def __init__(self, api: SyntheticZanshinApi, **kwargs):
+        super(_SyntheticHTTPTransport, self).__init__(**kwargs)
+        self._api = api
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._api(request)
+
+
+def run(count: int, shared: bool) -> Dict:
+    api = SyntheticZanshinApi(total_alerts=0)
+    transport = (
+        zanshinsdk.SharedTransport(transport=_SyntheticHTTPTransport(api))
+        if shared
+        else None
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    clients = []
+    for index in range(count):
+        client = zanshinsdk.Client(
+            profile=None,
+            api_key=f"tenant-{index}",
+            api_url=API_URL,
+            transport=transport or _SyntheticHTTPTransport(api),
+        )
+        # the request only goes through the synthetic API, but building the httpx client is real
+        try:
+            client.get_me()
+        except httpx.HTTPStatusError:
+            pass
+        clients.append(client)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "clients": count,
+        "shared": shared,
+        "seconds": elapsed,
+        "millisecondsPerClient": elapsed / count * 1000,
+        "retainedBytes": current,
+        "peakAllocatedBytes": peak,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    print(f"{'transport':<12}{'clients':>9}{'ms/client':>11}{'retained MB':>13}")
+    for shared in (False, True):
+        result = run(args.clients, shared)
+        print(
+            f"{'shared' if shared else 'per client':<12}{result['clients']:>9}"
+            f"{result['millisecondsPerClient']:>11.2f}{result['retainedBytes'] / 2 ** 20:>13.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
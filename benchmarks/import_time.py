@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Measures how long importing the SDK takes in a fresh interpreter, which is what short-lived Lambda and CLI invocations
+pay on every cold start:
+
+    python -m benchmarks.import_time --runs 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+STATEMENTS = (
+    "import zanshinsdk",
+    "from zanshinsdk import DAILY, ScanTargetKind",
+    "from zanshinsdk import Client",
+    "from zanshinsdk import FilePersistentAlertsIterator",
+)
+
+_TIMER = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "{statement}\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def measure(statement: str, runs: int) -> Dict:
+    """
+    Runs the statement in runs fresh interpreters.
+    :return: a dict with the median, minimum and maximum import time in milliseconds
+    """
+    timings: List[float] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(statement=statement)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append(float(output) * 1000)
+    return {
+        "statement": statement,
+        "runs": runs,
+        "medianMs": statistics.median(timings),
+        "minMs": min(timings),
+        "maxMs": max(timings),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="fail when the median time of `import zanshinsdk` is above this budget",
+    )
+    args = parser.parse_args(argv)
+
+    results = [measure(statement, args.runs) for statement in STATEMENTS]
+    print(f"{'statement':<55}{'median ms':>11}{'min ms':>9}{'max ms':>9}")
+    for result in results:
+        print(
+            f"{result['statement']:<55}{result['medianMs']:>11.1f}"
+            f"{result['minMs']:>9.1f}{result['maxMs']:>9.1f}"
+        )
+
+    if args.max_ms is not None and results[0]["medianMs"] > args.max_ms:
+        print(
+            f"REGRESSION import zanshinsdk takes {results[0]['medianMs']:.1f} ms, "
+            f"above the {args.max_ms:.1f} ms budget",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+A local stand-in for the Zanshin API that generates synthetic alert pages, served through an httpx.MockTransport so
+benchmarks measure the SDK itself rather than the network. An optional latency is added to every response to mimic
+round trips to the real API.
+"""
+import json
+import threading
+import time
+from urllib.parse import parse_qs
+
+import httpx
+
+import zanshinsdk
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+SCAN_TARGET_ID = "e22f4225-43e9-4922-b6b8-8b0620bdb1e3"
+API_URL = "https://api.benchmark.local"
+
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO")
+
+
+def synthetic_alert(index: int) -> dict:
+    """Builds an alert shaped like the ones returned by the API, with a realistic size."""
+    return {
+        "id": f"00000000-0000-4000-8000-{index:012d}",
+        "cursor": str(index + 1),
+        "organizationId": ORGANIZATION_ID,
+        "scanTargetId": SCAN_TARGET_ID,
+        "rule": f"aws-rule-{index % 250}",
+        "severity": SEVERITIES[index % len(SEVERITIES)],
+        "state": "OPEN",
+        "resource": f"arn:aws:s3:::benchmark-bucket-{index}",
+        "title": "S3 bucket allows public read access to its objects",
+        "description": "The bucket policy grants s3:GetObject to everyone. " * 4,
+        "tags": ["benchmark", f"team-{index % 10}"],
+        "createdAt": "2022-07-10T00:04:08.076Z",
+        "updatedAt": "2022-07-10T00:10:24.593Z",
+        "version": 1,
+    }
+
+
+class SyntheticZanshinApi(object):
+    """Serves alerts, grouped alerts, alert history and batch state updates out of a fixed number of alerts."""
+
+    def __init__(self, total_alerts: int, latency: float = 0.0):
+        """Initializes the synthetic API
+        :param total_alerts: number of alerts the organization has
+        :param latency: seconds every response is delayed by
+        """
+        self.total_alerts = total_alerts
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._batch_remaining = {}
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self)
+
+    def client(self, **kwargs) -> zanshinsdk.Client:
+        """Builds a Client whose requests are all served by this synthetic API."""
+        kwargs.setdefault("transport", self.transport())
+        return zanshinsdk.Client(
+            profile=None, api_key="benchmark", api_url=API_URL, **kwargs
+        )
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = request.url.path
+        params = {
+            name: values[0]
+            for name, values in parse_qs(request.url.query.decode()).items()
+        }
+        body = json.loads(request.content) if request.content else {}
+
+        if request.method == "POST" and path.endswith("/alerts/rules"):
+            return self._page(
+                params.get("cursor"), int(params.get("pageSize", 100)), grouped=True
+            )
+        if request.method == "POST" and path.endswith("/alerts"):
+            return self._page(params.get("cursor"), int(params.get("size", 1000)))
+        if request.method == "POST" and path == "/alerts/history":
+            return self._history_page(body.get("cursor"), body["pageSize"])
+        if request.method == "PUT" and path.endswith("/alerts/status/batch"):
+            return self._batch_update(body)
+        return httpx.Response(
+            404, json={"message": f"{request.method} {path} not found"}
+        )
+
+    def _page(self, cursor, page_size: int, grouped: bool = False) -> httpx.Response:
+        start = int(cursor or 0)
+        end = min(start + page_size, self.total_alerts)
+        if grouped:
+            data = [
+                {
+                    "rule": f"aws-rule-{index}",
+                    "severity": SEVERITIES[index % 5],
+                    "totalAlerts": 3,
+                }
+                for index in range(start, end)
+            ]
+        else:
+            data = [synthetic_alert(index) for index in range(start, end)]
+        page = {"data": data, "total": self.total_alerts}
+        if end < self.total_alerts:
+            page["cursor"] = str(end)
+        return httpx.Response(200, json=page)
+
+    def _history_page(self, cursor, page_size: int) -> httpx.Response:
+        start = int(cursor or 0)
+        end = min(start + page_size, self.total_alerts)
+        return httpx.Response(
+            200, json={"data": [synthetic_alert(index) for index in range(start, end)]}
+        )
+
+    def _batch_update(self, body: dict, batch_size: int = 500) -> httpx.Response:
+        key = json.dumps(body, sort_keys=True)
+        with self._lock:
+            remaining = self._batch_remaining.get(key, self.total_alerts)
+            updated = min(batch_size, remaining)
+            remaining -= updated
+            self._batch_remaining[key] = remaining
+        return httpx.Response(200, json={"updated": updated, "remaining": remaining})
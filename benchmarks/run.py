@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the SDK benchmarks against the synthetic Zanshin API.
+
+Every scenario is run once per page size and latency, each in a fresh process so that peak RSS is measured for that
+case alone. Results are printed as a table and can be saved as JSON, then compared with a previous run to catch
+throughput regressions:
+
+    python -m benchmarks --alerts 20000 --page-sizes 100 1000 --latencies 0 0.02 --output baseline.json
+    python -m benchmarks --alerts 20000 --page-sizes 100 1000 --latencies 0 0.02 --baseline baseline.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.mock_api import ORGANIZATION_ID, SCAN_TARGET_ID, SyntheticZanshinApi
+
+
+def _iter_alerts(client, api, page_size: int) -> int:
+    return sum(1 for _ in client.iter_alerts(ORGANIZATION_ID, page_size=page_size))
+
+
+def _iter_alerts_history(client, api, page_size: int) -> int:
+    return sum(
+        1 for _ in client.iter_alerts_history(ORGANIZATION_ID, page_size=page_size)
+    )
+
+
+def _iter_grouped_alerts(client, api, page_size: int) -> int:
+    return sum(
+        1 for _ in client.iter_grouped_alerts(ORGANIZATION_ID, page_size=page_size)
+    )
+
+
+def _persistent_alerts_iterator(client, api, page_size: int) -> int:
+    from zanshinsdk import FilePersistentAlertsIterator
+
+    with tempfile.TemporaryDirectory() as directory:
+        iterator = FilePersistentAlertsIterator(
+            filename=os.path.join(directory, "cursor.json"),
+            scan_target_ids=[SCAN_TARGET_ID],
+            client=client,
+            organization_id=ORGANIZATION_ID,
+        )
+        # the persistent iterators always use the default page size of iter_alerts_history
+        count = sum(1 for _ in iterator)
+        iterator.save()
+    return count
+
+
+def _batch_update_alerts_state(client, api, page_size: int) -> int:
+    from zanshinsdk import AlertState
+
+    client.batch_update_alerts_state(
+        ORGANIZATION_ID, AlertState.RISK_ACCEPTED, dry_run=False, comment="benchmark"
+    )
+    return api.total_alerts
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "iter_alerts": _iter_alerts,
+    "iter_alerts_history": _iter_alerts_history,
+    "iter_grouped_alerts": _iter_grouped_alerts,
+    "persistent_alerts_iterator": _persistent_alerts_iterator,
+    "batch_update_alerts_state": _batch_update_alerts_state,
+}
+
+# scenarios whose requests don't depend on the page size, run for the first page size only
+PAGE_SIZE_INDEPENDENT = frozenset(
+    ["persistent_alerts_iterator", "batch_update_alerts_state"]
+)
+
+
+def run_case(
+    scenario: str,
+    total_alerts: int,
+    page_size: int,
+    latency: float,
+    trace_allocations: bool = True,
+) -> Dict:
+    """
+    Runs one scenario and measures it.
+    :return: a dict with the throughput, CPU time per item, peak RSS and allocation figures of the run
+    """
+    api = SyntheticZanshinApi(total_alerts, latency=latency)
+    client = api.client()
+
+    if trace_allocations:
+        tracemalloc.start()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    items = SCENARIOS[scenario](client, api, page_size)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    if trace_allocations:
+        _, allocated_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        allocated_peak = None
+
+    peak_rss = _peak_rss()
+
+    return {
+        "scenario": scenario,
+        "alerts": total_alerts,
+        "pageSize": page_size,
+        "latency": latency,
+        "items": items,
+        "pages": api.requests,
+        "seconds": wall,
+        "itemsPerSecond": items / wall if wall else None,
+        "pagesPerSecond": api.requests / wall if wall else None,
+        "cpuMicrosecondsPerItem": cpu / items * 1e6 if items else None,
+        "peakRssBytes": peak_rss,
+        "peakAllocatedBytes": allocated_peak,
+    }
+
+
+def _peak_rss() -> Optional[int]:
+    """:return: the peak resident set size of the process in bytes, None on Windows, which lacks the resource module"""
+    if sys.platform == "win32":
+        return None
+    import resource
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak_rss *= 1024
+    return peak_rss
+
+
+def run_isolated(*args, **kwargs) -> Dict:
+    """Runs a case in a fresh process, so that its peak RSS isn't inflated by previous cases."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_case, *args, **kwargs).result()
+
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> List[str]:
+    """
+    :return: a message for every case whose throughput dropped by more than threshold compared to the baseline
+    """
+    key = lambda result: (result["scenario"], result["pageSize"], result["latency"])
+    previous = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(key(result))
+        if not before or not before["itemsPerSecond"]:
+            continue
+        change = result["itemsPerSecond"] / before["itemsPerSecond"] - 1
+        if change < -threshold:
+            regressions.append(
+                f"{result['scenario']} page size {result['pageSize']} latency {result['latency']}: "
+                f"{before['itemsPerSecond']:.0f} -> {result['itemsPerSecond']:.0f} items/s ({change:+.0%})"
+            )
+    return regressions
+
+
+def _print_table(results: List[Dict]) -> None:
+    header = (
+        f"{'scenario':<28}{'page':>7}{'latency':>9}{'items/s':>12}{'pages/s':>10}"
+        f"{'cpu us/item':>13}{'peak RSS MB':>13}{'peak alloc MB':>15}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        allocated = result["peakAllocatedBytes"]
+        peak_rss = result["peakRssBytes"]
+        print(
+            f"{result['scenario']:<28}{result['pageSize']:>7}{result['latency']:>9.3f}"
+            f"{result['itemsPerSecond']:>12.0f}{result['pagesPerSecond']:>10.1f}"
+            f"{result['cpuMicrosecondsPerItem']:>13.1f}{(peak_rss / 2 ** 20 if peak_rss is not None else float('nan')):>13.1f}"
+            f"{(allocated / 2 ** 20 if allocated is not None else float('nan')):>15.1f}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--alerts", type=int, default=10000)
+    parser.add_argument("--page-sizes", nargs="+", type=int, default=[100, 1000])
+    parser.add_argument("--latencies", nargs="+", type=float, default=[0.0, 0.02])
+    parser.add_argument(
+        "--no-allocations",
+        action="store_true",
+        help="don't trace allocations, tracing slows the run down",
+    )
+    parser.add_argument("--output", help="file to save the results to, as JSON")
+    parser.add_argument("--baseline", help="results of a previous run to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="throughput drop, as a fraction, above which a case counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for scenario in args.scenarios:
+        page_sizes = args.page_sizes
+        if scenario in PAGE_SIZE_INDEPENDENT:
+            page_sizes = page_sizes[:1]
+        for page_size in page_sizes:
+            for latency in args.latencies:
+                results.append(
+                    run_isolated(
+                        scenario,
+                        args.alerts,
+                        page_size,
+                        latency,
+                        trace_allocations=not args.no_allocations,
+                    )
+                )
+    _print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.run import SCENARIOS, compare, run_case
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_scenarios_run_against_synthetic_api(self):
+        for scenario in SCENARIOS:
+            with self.subTest(scenario=scenario):
+                result = run_case(scenario, 250, page_size=100, latency=0)
+
+                self.assertEqual(result["items"], 250)
+                self.assertGreater(result["pages"], 0)
+                self.assertGreater(result["peakAllocatedBytes"], 0)
+
+    @patch("benchmarks.run.sys.platform", "win32")
+    def test_peak_rss_is_skipped_on_windows(self):
+        result = run_case(next(iter(SCENARIOS)), 10, page_size=10, latency=0)
+
+        self.assertIsNone(result["peakRssBytes"])
+
+    def test_compare(self):
+        baseline = [
+            {"scenario": "a", "pageSize": 10, "latency": 0, "itemsPerSecond": 100},
+            {"scenario": "b", "pageSize": 10, "latency": 0, "itemsPerSecond": 100},
+        ]
+        results = [
+            {"scenario": "a", "pageSize": 10, "latency": 0, "itemsPerSecond": 85},
+            {"scenario": "b", "pageSize": 10, "latency": 0, "itemsPerSecond": 70},
+        ]
+
+        regressions = compare(results, baseline, threshold=0.2)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("b page size 10"))
@@ -1,30 +1,140 @@
 import logging
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from zanshinsdk.client import (
-    DAILY,
-    WEEKLY,
-    AlertSeverity,
-    AlertsOrderOpts,
-    AlertState,
-    Client,
-    GroupedAlertOrderOpts,
-    Languages,
-    Roles,
-    ScanTargetAWS,
-    ScanTargetAZURE,
-    ScanTargetDOMAIN,
-    ScanTargetGCP,
-    ScanTargetGroupCredentialListORACLE,
-    ScanTargetHUAWEI,
-    ScanTargetKind,
-    ScanTargetSchedule,
-    SortOpts,
-    validate_uuid,
-)
-from zanshinsdk.following_alerts_history import FilePersistentFollowingAlertsIterator
-from zanshinsdk.iterator import AbstractPersistentAlertsIterator, PersistenceEntry
 from zanshinsdk.version import __version__
 
-from zanshinsdk.alerts_history import FilePersistentAlertsIterator  # isort:skip
+# Public names are imported on first access (PEP 562), so that importing the package doesn't load httpx and every
+# module of the SDK up front. Short-lived scripts only pay for what they use.
+_LAZY_ATTRIBUTES = {
+    "Client": "zanshinsdk.client",
+    "ClientPool": "zanshinsdk.client_pool",
+    "CancellationToken": "zanshinsdk.common.cancellation",
+    "OperationCancelled": "zanshinsdk.common.cancellation",
+    "CircuitBreaker": "zanshinsdk.common.circuit_breaker",
+    "CircuitOpenError": "zanshinsdk.common.circuit_breaker",
+    "AdaptiveConcurrencyLimiter": "zanshinsdk.common.concurrency",
+    "AlertSeverity": "zanshinsdk.common.enums",
+    "AlertsOrderOpts": "zanshinsdk.common.enums",
+    "AlertState": "zanshinsdk.common.enums",
+    "GroupedAlertOrderOpts": "zanshinsdk.common.enums",
+    "Languages": "zanshinsdk.common.enums",
+    "Roles": "zanshinsdk.common.enums",
+    "ScanTargetKind": "zanshinsdk.common.enums",
+    "SortOpts": "zanshinsdk.common.enums",
+    "HedgingPolicy": "zanshinsdk.common.hedging",
+    "AbstractHttpCache": "zanshinsdk.common.http_cache",
+    "FileHttpCache": "zanshinsdk.common.http_cache",
+    "InMemoryHttpCache": "zanshinsdk.common.http_cache",
+    "AbstractInstrumentation": "zanshinsdk.common.instrumentation",
+    "MetricsCollector": "zanshinsdk.common.instrumentation",
+    "RequestEvent": "zanshinsdk.common.instrumentation",
+    "AdaptivePageSize": "zanshinsdk.common.page_size",
+    "DiskResponseCache": "zanshinsdk.common.response_cache",
+    "DAILY": "zanshinsdk.common.schedule",
+    "WEEKLY": "zanshinsdk.common.schedule",
+    "ScanTargetSchedule": "zanshinsdk.common.schedule",
+    "BULK": "zanshinsdk.common.scheduler",
+    "INTERACTIVE": "zanshinsdk.common.scheduler",
+    "PriorityClass": "zanshinsdk.common.scheduler",
+    "RequestScheduler": "zanshinsdk.common.scheduler",
+    "request_priority": "zanshinsdk.common.scheduler",
+    "ScanTargetAWS": "zanshinsdk.common.targets",
+    "ScanTargetAZURE": "zanshinsdk.common.targets",
+    "ScanTargetDOMAIN": "zanshinsdk.common.targets",
+    "ScanTargetGCP": "zanshinsdk.common.targets",
+    "ScanTargetGroupCredentialListORACLE": "zanshinsdk.common.targets",
+    "ScanTargetHUAWEI": "zanshinsdk.common.targets",
+    "SharedTransport": "zanshinsdk.common.transport",
+    "validate_uuid": "zanshinsdk.common.validators",
+    "Waiter": "zanshinsdk.common.waiter",
+    "FilePersistentAlertsIterator": "zanshinsdk.alerts_history",
+    "AlertsSnapshot": "zanshinsdk.alerts_snapshot",
+    "FilePersistentFollowingAlertsIterator": "zanshinsdk.following_alerts_history",
+    "AbstractPersistentAlertsIterator": "zanshinsdk.iterator",
+    "PersistenceEntry": "zanshinsdk.iterator",
+    "ScanOrchestrator": "zanshinsdk.scan_orchestrator",
+    "SummaryAggregator": "zanshinsdk.summary_aggregator",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES) + ["__version__"]
+
+if TYPE_CHECKING:  # pragma: no cover
+    from zanshinsdk.alerts_history import FilePersistentAlertsIterator
+    from zanshinsdk.alerts_snapshot import AlertsSnapshot
+    from zanshinsdk.client import Client
+    from zanshinsdk.client_pool import ClientPool
+    from zanshinsdk.common.cancellation import CancellationToken, OperationCancelled
+    from zanshinsdk.common.circuit_breaker import CircuitBreaker, CircuitOpenError
+    from zanshinsdk.common.concurrency import AdaptiveConcurrencyLimiter
+    from zanshinsdk.common.enums import (
+        AlertSeverity,
+        AlertsOrderOpts,
+        AlertState,
+        GroupedAlertOrderOpts,
+        Languages,
+        Roles,
+        ScanTargetKind,
+        SortOpts,
+    )
+    from zanshinsdk.common.hedging import HedgingPolicy
+    from zanshinsdk.common.http_cache import (
+        AbstractHttpCache,
+        FileHttpCache,
+        InMemoryHttpCache,
+    )
+    from zanshinsdk.common.instrumentation import (
+        AbstractInstrumentation,
+        MetricsCollector,
+        RequestEvent,
+    )
+    from zanshinsdk.common.page_size import AdaptivePageSize
+    from zanshinsdk.common.response_cache import DiskResponseCache
+    from zanshinsdk.common.schedule import DAILY, WEEKLY, ScanTargetSchedule
+    from zanshinsdk.common.scheduler import (
+        BULK,
+        INTERACTIVE,
+        PriorityClass,
+        RequestScheduler,
+        request_priority,
+    )
+    from zanshinsdk.common.targets import (
+        ScanTargetAWS,
+        ScanTargetAZURE,
+        ScanTargetDOMAIN,
+        ScanTargetGCP,
+        ScanTargetGroupCredentialListORACLE,
+        ScanTargetHUAWEI,
+    )
+    from zanshinsdk.common.transport import SharedTransport
+    from zanshinsdk.common.validators import validate_uuid
+    from zanshinsdk.common.waiter import Waiter
+    from zanshinsdk.following_alerts_history import (
+        FilePersistentFollowingAlertsIterator,
+    )
+    from zanshinsdk.iterator import AbstractPersistentAlertsIterator, PersistenceEntry
+    from zanshinsdk.scan_orchestrator import ScanOrchestrator
+    from zanshinsdk.summary_aggregator import SummaryAggregator
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        # submodules, e.g. zanshinsdk.client, are attributes of the package once imported
+        try:
+            return import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as error:
+            if error.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    # cache the attribute, so later accesses don't go through __getattr__ again
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
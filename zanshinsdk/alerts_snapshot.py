@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+This module keeps snapshots of alert inventories, to see what changed between two scans. A snapshot only stores a
+fingerprint of the state, severity and update date of each alert, in a SQLite database, and a live walk of the alerts
+is compared against it as it goes, so neither inventory is ever held in memory.
+"""
+import hashlib
+import sqlite3
+from itertools import islice
+from os import PathLike
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+# fields of an alert that make it count as changed
+FINGERPRINT_FIELDS = ("state", "severity", "updatedAt")
+
+
+def alert_fingerprint(alert: Dict) -> bytes:
+    """
+    :param alert: a JSON decoded alert
+    :return: an 8 bytes digest of the fields of the alert that make it count as changed
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for field in FINGERPRINT_FIELDS:
+        digest.update(str(alert.get(field)).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+class AlertsSnapshot(object):
+    """Fingerprints of an alert inventory, stored in a SQLite database."""
+
+    def __init__(
+        self, filename: Union[str, PathLike] = ":memory:", batch_size: int = 500
+    ):
+        """Initializes an alerts snapshot
+        :param filename: the SQLite database holding the snapshot, created if missing. Defaults to a database in
+               memory, only useful to compare walks made while the process runs.
+        :param batch_size: number of alerts looked up in the snapshot at once
+        """
+        if batch_size < 1:
+            raise ValueError(f"{batch_size} shouldn't be lower than 1")
+        self._filename = filename
+        self._batch_size = batch_size
+        self._connection = sqlite3.connect(str(filename))
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS alerts (id TEXT PRIMARY KEY, fingerprint BLOB NOT NULL) WITHOUT ROWID"
+            )
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+
+    def __contains__(self, alert_id):
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM alerts WHERE id = ?", (str(alert_id),)
+            ).fetchone()
+            is not None
+        )
+
+    def save(self, alerts: Iterable[Dict]) -> int:
+        """
+        Replaces the snapshot with the given alerts.
+        :param alerts: the alerts to store, e.g. the iterator returned by Client.iter_alerts
+        :return: the number of alerts stored
+        """
+        for _ in self.diff(alerts):
+            pass
+        return len(self)
+
+    def diff(
+        self, alerts: Iterable[Dict], update: bool = True
+    ) -> Iterator[Tuple[str, str, Optional[Dict]]]:
+        """
+        Compares the given alerts against the snapshot, while they are iterated.
+        :param alerts: the current alerts, e.g. the iterator returned by Client.iter_alerts
+        :param update: whether to replace the snapshot with the given alerts once they are all compared. The snapshot
+               is left as it was if the iteration stops before the end.
+        :return: an iterator over (change, alert ID, alert) tuples, where change is ADDED, CHANGED or REMOVED. Added
+                 and changed alerts come as they are compared, the alert being None for removed alerts, which come
+                 last.
+        """
+        connection = self._connection
+        # the walk is written to a table of its own, so that removed alerts can be found without keeping IDs around
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS walk")
+            connection.execute(
+                "CREATE TEMP TABLE walk (id TEXT PRIMARY KEY, fingerprint BLOB NOT NULL) WITHOUT ROWID"
+            )
+        try:
+            iterator = iter(alerts)
+            while True:
+                batch = {
+                    str(alert["id"]): alert
+                    for alert in islice(iterator, self._batch_size)
+                }
+                if not batch:
+                    break
+                fingerprints = {
+                    alert_id: alert_fingerprint(alert)
+                    for alert_id, alert in batch.items()
+                }
+                placeholders = ",".join("?" * len(batch))
+                previous = dict(
+                    connection.execute(
+                        f"SELECT id, fingerprint FROM alerts WHERE id IN ({placeholders})",
+                        list(batch),
+                    )
+                )
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO walk VALUES (?, ?)",
+                        fingerprints.items(),
+                    )
+                for alert_id, alert in batch.items():
+                    if alert_id not in previous:
+                        yield ADDED, alert_id, alert
+                    elif previous[alert_id] != fingerprints[alert_id]:
+                        yield CHANGED, alert_id, alert
+
+            removed = connection.execute(
+                "SELECT id FROM alerts WHERE id NOT IN (SELECT id FROM walk)"
+            )
+            for (alert_id,) in removed:
+                yield REMOVED, alert_id, None
+
+            if update:
+                with connection:
+                    connection.execute("DELETE FROM alerts")
+                    connection.execute(
+                        "INSERT INTO alerts SELECT id, fingerprint FROM walk"
+                    )
+        finally:
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS walk")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
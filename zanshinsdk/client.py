@@ -1,22 +1,36 @@
 from __future__ import annotations
 
-import json
 import logging
-import sys
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from configparser import RawConfigParser
-from importlib.util import find_spec, module_from_spec
-from math import ceil
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from importlib import import_module
 from os import environ
 from os.path import isfile
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, Optional, Union
+from types import GeneratorType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 from uuid import UUID
+from weakref import WeakKeyDictionary
 
 import httpx
-from pydantic import BaseModel, Field
 
+from zanshinsdk.common.cancellation import CancellationToken, as_token, current_token
+from zanshinsdk.common.circuit_breaker import CircuitBreaker
+from zanshinsdk.common.compression import (
+    DEFAULT_COMPRESSION_THRESHOLD,
+    accept_encoding,
+    encode_json_body,
+    validate_encoding,
+)
+from zanshinsdk.common.concurrency import AdaptiveConcurrencyLimiter, worker_count
 from zanshinsdk.common.enums import (
     AlertSeverity,
     AlertsOrderOpts,
@@ -31,6 +45,34 @@ from zanshinsdk.common.enums import (
     SortOpts,
     TimeOfDay,
 )
+from zanshinsdk.common.hedging import HedgingPolicy
+from zanshinsdk.common.http_cache import (
+    AbstractHttpCache,
+    HttpCacheEntry,
+    http_cache_key,
+)
+from zanshinsdk.common.instrumentation import AbstractInstrumentation, RequestEvent
+from zanshinsdk.common.page_size import AdaptivePageSize, record_response
+from zanshinsdk.common.paginator import (
+    CURSOR,
+    ITEM_CURSOR,
+    PAGE_NUMBER,
+    Page,
+    Paginator,
+)
+from zanshinsdk.common.paths import is_read_only_request, templated_path
+from zanshinsdk.common.response_cache import (
+    CachedResponse,
+    DiskResponseCache,
+    response_cache_key,
+)
+from zanshinsdk.common.schedule import DAILY, WEEKLY, ScanTargetSchedule
+from zanshinsdk.common.scheduler import (
+    BULK,
+    RequestScheduler,
+    current_priority,
+    with_default_priority,
+)
 from zanshinsdk.common.targets import (
     ScanTargetAWS,
     ScanTargetAZURE,
@@ -49,6 +91,8 @@ from zanshinsdk.common.targets import (
     ScanTargetSLACK,
     ScanTargetZENDESK,
 )
+from zanshinsdk.common.tracing import is_tracing_available, trace_client, untrace_client
+from zanshinsdk.common.transport import shared_ssl_context
 from zanshinsdk.common.validators import (
     validate_base_alert_filter,
     validate_class,
@@ -56,39 +100,71 @@ from zanshinsdk.common.validators import (
     validate_int,
     validate_uuid,
 )
+from zanshinsdk.common.waiter import Waiter, is_stack_complete, is_stack_failed
 from zanshinsdk.version import __version__ as sdk_version
 
 CONFIG_DIR = Path.home() / ".tenchi"
 CONFIG_FILE = CONFIG_DIR / "config"
 
+ZANSHIN_STACK_NAME = "tenchi-zanshin-service-role"
+
+# parsed configuration files, keyed by path and contents, shared by every Client of the process
+_CONFIG_CACHE: "OrderedDict[Tuple[str, str], RawConfigParser]" = OrderedDict()
+_CONFIG_CACHE_LOCK = threading.Lock()
+_CONFIG_CACHE_SIZE = 8
+
+
+def _read_config_file(path: Path) -> RawConfigParser:
+    """
+    Parses a configuration file, reusing the result of a previous parse of the same contents. Reading a small file
+    is cheap, parsing it is what clients built over and over would otherwise pay for. A missing file gives an empty
+    configuration, like RawConfigParser.read does. The returned parser is shared and must not be modified.
+    """
+    try:
+        with open(str(path), "r") as f:
+            contents = f.read()
+    except OSError:
+        contents = ""
+    key = (str(path), contents)
+    with _CONFIG_CACHE_LOCK:
+        parser = _CONFIG_CACHE.get(key)
+        if parser is not None:
+            _CONFIG_CACHE.move_to_end(key)
+            return parser
+    parser = RawConfigParser()
+    parser.read_string(contents, source=str(path))
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[key] = parser
+        while len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+            _CONFIG_CACHE.popitem(last=False)
+    return parser
+
+
+# set by Client.iter_pages while it starts an iterator, so that the iterator yields pages instead of items
+_yield_pages: ContextVar[bool] = ContextVar("zanshinsdk_yield_pages", default=False)
+
+# set by Client.uncached, so that the requests of the block always reach the API
+_bypass_caches: ContextVar[bool] = ContextVar("zanshinsdk_bypass_caches", default=False)
+
+# set by Client.cached, the response cache used by each client, by id, for the requests of the block
+_response_cache_overrides: ContextVar[Dict[int, "DiskResponseCache"]] = ContextVar(
+    "zanshinsdk_response_cache_overrides", default={}
+)
 
-class ScanTargetSchedule(BaseModel):
-    frequency: Frequency
-    time_of_day: Optional[TimeOfDay] = Field(TimeOfDay.NIGHT, alias="timeOfDay")
-    day: Optional[Day] = Day.SUNDAY
-
-    def value(self):
-        if self.frequency in (Frequency.SIX_HOURS, Frequency.TWELVE_HOURS):
-            return {"frequency": self.frequency.value}
-        if self.frequency == Frequency.WEEKLY:
-            return {
-                "frequency": self.frequency.value,
-                "timeOfDay": self.time_of_day.value,
-                "day": self.day.value,
-            }
-        return {
-            "frequency": self.frequency.value,
-            "timeOfDay": self.time_of_day.value,
-        }
 
-    def json(self):
-        return json.dumps(self.value())
+def _naive_utc(timestamp: datetime) -> datetime:
+    """Converts a timezone aware datetime to a naive UTC datetime, the form the API filters expect."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
 
 
-DAILY = ScanTargetSchedule(frequency=Frequency.DAILY, time_of_day=TimeOfDay.NIGHT)
-WEEKLY = ScanTargetSchedule(
-    frequency=Frequency.WEEKLY, time_of_day=TimeOfDay.NIGHT, day=Day.SUNDAY
-)
+def _parse_timestamp(value: str) -> datetime:
+    """Parses a timestamp returned by the API into a naive UTC datetime."""
+    # datetime.fromisoformat only accepts a "Z" suffix from Python 3.11 on
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return _naive_utc(datetime.fromisoformat(value))
 
 
 class Client:
@@ -100,6 +176,17 @@ class Client:
         user_agent: Optional[str] = None,
         proxy_url: Optional[str] = None,
         verify: httpx._types.VerifyTypes = True,
+        http_cache: Optional[AbstractHttpCache] = None,
+        response_cache: Optional[DiskResponseCache] = None,
+        instrumentations: Optional[Iterable[AbstractInstrumentation]] = None,
+        tracing: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        request_compression: Optional[str] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        scheduler: Optional[RequestScheduler] = None,
     ):
         """
         Initialize a new connection to the Zanshin API
@@ -109,8 +196,32 @@ class Client:
         :param user_agent: optional addition of the user agent to use in requests performed
         :param proxy_url: optional URL indicating which proxy server to use, or None for direct connections to the API
         :verify: optional parameter to control how SSL connections are verified as per the parameter of the same name in the constructor of :httpx:Client
-        """
-        self._client = None
+        :param http_cache: optional cache used to send conditional GET requests and serve 304 responses from it
+        :param response_cache: optional persistent cache that serves read requests locally while its entries are fresh
+        :param instrumentations: optional objects notified when each request starts and ends, e.g. a MetricsCollector
+        :param tracing: whether to wrap API calls in OpenTelemetry spans, ignored if OpenTelemetry isn't installed
+        :param transport: optional httpx transport, e.g. a SharedTransport used by many clients, in which case proxy_url
+               and verify are ignored in favor of the settings of the transport
+        :param request_compression: optional encoding request bodies are compressed with, "gzip" or "zstd" (which
+               requires the zstandard package)
+        :param compression_threshold: size in bytes from which request bodies are compressed
+        :param circuit_breaker: optional circuit breaker that fails requests right away while their endpoint is
+               failing, it can be shared by many clients
+        :param hedging: optional policy sending a duplicate of read requests that are slower than usual, and using
+               the first response
+        :param concurrency_limiter: optional limiter adapting the number of requests in flight to how the API
+               responds, it can be shared by many clients. The thread pools of the SDK size themselves after it.
+        :param scheduler: optional scheduler admitting requests by priority class, so that calls made while paginated
+               iterators run don't queue behind their pages. With a concurrency_limiter too, the scheduler alone
+               admits requests, and should be given the limiter as max_concurrency to follow its limit.
+        """
+        # the httpx client, and its SSL context, are only built when the first request is made
+        self._client_lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        # requests in flight per httpx client, and discarded clients closed once their last request completes
+        self._http_client_users: Dict[int, int] = {}
+        self._retired_http_clients: Dict[int, httpx.Client] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._logger: logging.Logger = logging.getLogger("zanshinsdk")
 
         (
@@ -128,8 +239,7 @@ class Client:
             and isfile(CONFIG_FILE)
             or all(value is None for value in [api_key, api_url, user_agent])
         ):
-            parser = RawConfigParser()
-            parser.read(str(CONFIG_FILE))
+            parser = _read_config_file(CONFIG_FILE)
             if not parser.has_section(profile):
                 raise ValueError(f"profile {profile} not found in {CONFIG_FILE}")
         else:
@@ -192,6 +302,48 @@ class Client:
         # set verify
         self._verify = verify
 
+        # set transport
+        self._transport = transport
+
+        # set request compression
+        self._request_compression = validate_encoding(request_compression)
+        self._compression_threshold = validate_int(
+            compression_threshold, min_value=0, required=True
+        )
+
+        # set circuit breaker
+        self._circuit_breaker = circuit_breaker
+
+        # set hedging
+        self._hedging = hedging
+
+        # set concurrency limiter
+        self._concurrency_limiter = concurrency_limiter
+
+        # set request scheduler
+        self._scheduler = scheduler
+
+        # set HTTP cache
+        self._http_cache = http_cache
+
+        # set response cache
+        self._response_cache = response_cache
+
+        # set instrumentations
+        self._instrumentations = []
+        for instrumentation in instrumentations or []:
+            self.add_instrumentation(instrumentation)
+
+        # set tracing
+        self._traced_methods = []
+        if tracing:
+            self.enable_tracing()
+
+        # boto3 sessions and clients reused across onboardings
+        self._boto3_lock = threading.Lock()
+        self._boto3_sessions = {}
+        self._boto3_clients = WeakKeyDictionary()
+
         self._update_client()
 
     def _get_config_from_env_if_not_exists(
@@ -229,26 +381,184 @@ class Client:
 
     def _update_client(self):
         """
-        Internal method to create a new pre-configured httpx Client instance when one of the relevant settings
-        is changed (API key, proxy URL or user-agent).
+        Internal method to discard the current httpx Client instance when one of the relevant settings is changed
+        (API key, proxy URL or user-agent). A new pre-configured one is built on the next request. Requests other
+        threads are sending with the discarded one complete normally, the last of them closes it.
         """
+        with self._client_lock:
+            http_client, self._http_client = self._http_client, None
+            if http_client is not None and id(http_client) in self._http_client_users:
+                self._retired_http_clients[id(http_client)] = http_client
+                http_client = None
+        self._close_http_client(http_client)
+
+    @staticmethod
+    def _close_http_client(http_client: Optional[httpx.Client]) -> None:
         try:
-            if self._client:
-                self._client.close()
+            if http_client:
+                http_client.close()
         except AttributeError:
             pass
-        finally:
-            self._client = httpx.Client(
-                proxy=self._proxy_url,
-                timeout=60,
-                verify=self._verify,
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "Accept-Encoding": "gzip, deflate",
-                    "User-Agent": self.user_agent,
-                    "Accept": "application/json",
-                },
+
+    def _acquire_http_client(self) -> httpx.Client:
+        """
+        Internal method returning the httpx Client to send a request with, which isn't closed until
+        _release_http_client is called, even if settings change meanwhile.
+        """
+        while True:
+            http_client = self._client
+            with self._client_lock:
+                # the client may have been discarded between building and counting it
+                if http_client is self._http_client:
+                    key = id(http_client)
+                    self._http_client_users[key] = (
+                        self._http_client_users.get(key, 0) + 1
+                    )
+                    return http_client
+
+    def _release_http_client(self, http_client: httpx.Client) -> None:
+        with self._client_lock:
+            key = id(http_client)
+            users = self._http_client_users.pop(key) - 1
+            if users:
+                self._http_client_users[key] = users
+                return
+            retired = self._retired_http_clients.pop(key, None)
+        self._close_http_client(retired)
+
+    def close(self) -> None:
+        """
+        Closes the connections of this client, and stops the threads of submit and map once their calls complete. The
+        client stays usable, a new httpx client is built on the next request. Connections of a shared transport are
+        left open for the other clients using it.
+        """
+        with self._client_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self._update_client()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        executor = self._executor
+        if executor is None:
+            with self._client_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=worker_count(self, None, 8),
+                        thread_name_prefix="zanshinsdk-client",
+                    )
+                executor = self._executor
+        return executor
+
+    def _call(self, method, *args, **kwargs):
+        """Internal method calling a method of the client in a worker thread, consuming the iterators it returns."""
+        if isinstance(method, str):
+            method = getattr(self, method)
+        result = method(*args, **kwargs)
+        if isinstance(result, GeneratorType):
+            return list(result)
+        return result
+
+    def submit(self, method, *args, **kwargs) -> Future:
+        """
+        Calls a method of the client in a thread of the client, all threads sharing the connections of the client.
+        The call sees the request_priority and cancellation scopes of the caller.
+        >>> futures = [client.submit("get_alert", alert_id) for alert_id in alert_ids]
+        :param method: the method, or its name
+        :param args: positional arguments of the method
+        :param kwargs: keyword arguments of the method
+        :return: a future of what the method returned, iterators being turned into lists
+        """
+        return self._get_executor().submit(
+            copy_context().run, self._call, method, *args, **kwargs
+        )
+
+    def map(
+        self, method, *iterables: Iterable, workers: Optional[int] = None, **kwargs
+    ) -> Iterator:
+        """
+        Calls a method of the client concurrently, once per item of the iterables, like the builtin map.
+        >>> for alert in client.map("get_alert", alert_ids, workers=16):
+        ...     print(alert["state"])
+        :param method: the method, or its name
+        :param iterables: the iterables the positional arguments of each call are taken from
+        :param workers: optional number of concurrent calls, defaults to the threads of submit, which are as many as
+               the max_limit of the concurrency limiter of the client if it has one, 8 otherwise
+        :param kwargs: keyword arguments of every call
+        :return: an iterator over what the calls returned, in the order of the iterables. Arguments are consumed as
+                 calls complete, and the error of a call is raised when its result is reached.
+        """
+        if workers is None:
+            executor, owned = self._get_executor(), None
+            window = worker_count(self, None, 8)
+        else:
+            validate_int(workers, min_value=1, required=True)
+            executor = owned = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="zanshinsdk-map"
             )
+            window = workers
+        pending = deque()
+        try:
+            for args in zip(*iterables):
+                # twice as many calls as threads are queued, so that threads don't wait for the consumer
+                if len(pending) >= 2 * window:
+                    yield pending.popleft().result()
+                pending.append(
+                    executor.submit(
+                        copy_context().run, self._call, method, *args, **kwargs
+                    )
+                )
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if owned is not None:
+                owned.shutdown(wait=False)
+
+    @property
+    def _client(self) -> httpx.Client:
+        """
+        The httpx Client used to perform requests, built on first access so that creating a Client doesn't pay for
+        connection setup and SSL context creation.
+        """
+        http_client = self._http_client
+        if http_client is None:
+            with self._client_lock:
+                if self._http_client is None:
+                    headers = {
+                        "Authorization": f"Bearer {self._api_key}",
+                        "Accept-Encoding": accept_encoding(),
+                        "User-Agent": self.user_agent,
+                        "Accept": "application/json",
+                    }
+                    if self._transport is not None:
+                        # the transport owns proxy and TLS settings; environment proxies would mount new transports
+                        self._http_client = httpx.Client(
+                            transport=self._transport,
+                            trust_env=False,
+                            timeout=60,
+                            headers=headers,
+                        )
+                    else:
+                        self._http_client = httpx.Client(
+                            proxy=self._proxy_url,
+                            timeout=60,
+                            verify=shared_ssl_context(self._verify),
+                            headers=headers,
+                        )
+                http_client = self._http_client
+        return http_client
+
+    @_client.setter
+    def _client(self, new_client: Optional[httpx.Client]) -> None:
+        self._http_client = new_client
 
     @property
     def api_url(self) -> str:
@@ -309,6 +619,100 @@ class Client:
         self._user_agent = f"{new_user_agent} (Zanshin Python SDK v{sdk_version})"
         self._update_client()
 
+    @property
+    def concurrency_limiter(self) -> Optional[AdaptiveConcurrencyLimiter]:
+        return self._concurrency_limiter
+
+    @property
+    def http_cache(self) -> Optional[AbstractHttpCache]:
+        return self._http_cache
+
+    @http_cache.setter
+    def http_cache(self, new_http_cache: Optional[AbstractHttpCache]) -> None:
+        if new_http_cache is not None:
+            validate_class(new_http_cache, AbstractHttpCache)
+        self._http_cache = new_http_cache
+
+    @property
+    def response_cache(self) -> Optional[DiskResponseCache]:
+        """The response cache of the client, or the one given to an enclosing cached block of the current thread."""
+        return _response_cache_overrides.get().get(id(self), self._response_cache)
+
+    @response_cache.setter
+    def response_cache(self, new_response_cache: Optional[DiskResponseCache]) -> None:
+        if new_response_cache is not None:
+            validate_class(new_response_cache, DiskResponseCache)
+        self._response_cache = new_response_cache
+
+    @property
+    def instrumentations(self) -> List[AbstractInstrumentation]:
+        return list(self._instrumentations)
+
+    def add_instrumentation(self, instrumentation: AbstractInstrumentation) -> None:
+        """
+        Registers an object to be notified when each request starts and ends.
+        :param instrumentation: an instance of a subclass of AbstractInstrumentation
+        """
+        validate_class(instrumentation, AbstractInstrumentation)
+        # copy on write, so requests running in other threads keep iterating over a stable list
+        self._instrumentations = self._instrumentations + [instrumentation]
+
+    def remove_instrumentation(self, instrumentation: AbstractInstrumentation) -> None:
+        self._instrumentations = [
+            other for other in self._instrumentations if other is not instrumentation
+        ]
+
+    def enable_tracing(self, tracer=None) -> bool:
+        """
+        Wraps every public method of this client in an OpenTelemetry span, every API request in a child span and
+        every iterator in a span that records how many pages and items it went through.
+        :param tracer: optional OpenTelemetry tracer, defaults to the one of the global tracer provider
+        :return: whether tracing was enabled, False if OpenTelemetry isn't installed
+        """
+        if not is_tracing_available():
+            self._logger.debug("OpenTelemetry not present, tracing is disabled")
+            return False
+        self.disable_tracing()
+        self._traced_methods = trace_client(self, tracer)
+        return True
+
+    def disable_tracing(self) -> None:
+        untrace_client(self, self._traced_methods)
+        self._traced_methods = []
+
+    @contextmanager
+    def cached(self, response_cache: DiskResponseCache):
+        """
+        Context manager that serves the read requests made by the current thread within the block from the given
+        response cache. Other threads using the client keep its own response cache.
+        >>> with client.cached(DiskResponseCache("zanshin-cache.sqlite", ttl=3600)):
+        ...     alerts = list(client.iter_alerts(organization_id))
+        :param response_cache: the cache to use inside the block
+        """
+        validate_class(response_cache, DiskResponseCache)
+        token = _response_cache_overrides.set(
+            {**_response_cache_overrides.get(), id(self): response_cache}
+        )
+        try:
+            yield self
+        finally:
+            _response_cache_overrides.reset(token)
+
+    @contextmanager
+    def uncached(self):
+        """
+        Context manager that sends the requests made by the current thread within the block to the API, neither
+        serving them from the response cache nor revalidating them with the HTTP cache, e.g. to poll for changes.
+        Fresh responses are still stored in the caches.
+        >>> with client.uncached():
+        ...     scan_target = client.get_organization_scan_target(organization_id, scan_target_id)
+        """
+        token = _bypass_caches.set(True)
+        try:
+            yield self
+        finally:
+            _bypass_caches.reset(token)
+
     def _get_sanitized_proxy_url(self) -> Optional[str]:
         """
         Returns a sanitized proxy URL that doesn't expose a password, if one is present.
@@ -341,26 +745,271 @@ class Client:
         :return: the requests.Response object returned by httpx.Client.request
         """
 
-        self._logger.debug("Requesting body=%s", body)
-        response = self._client.request(
-            method=method, url=self.api_url + path, params=params, json=body
+        url = self.api_url + path
+        if not self._instrumentations:
+            response = self._perform_request(method, url, path, params, body)
+            record_response(response)
+            return response
+
+        event = RequestEvent(method, templated_path(path), url)
+        self._notify_instrumentations("on_request_start", event)
+        started = time.perf_counter()
+        try:
+            response = self._perform_request(method, url, path, params, body, event)
+        except Exception as error:
+            event.error = error
+            if isinstance(error, httpx.HTTPStatusError):
+                event.status_code = error.response.status_code
+            raise
+        else:
+            event.status_code = response.status_code
+            event.response_bytes = len(response.content)
+            record_response(response)
+            return response
+        finally:
+            event.duration = time.perf_counter() - started
+            self._notify_instrumentations("on_request_end", event)
+
+    def _paginate(
+        self,
+        load_page,
+        style: str,
+        page_size: Union[int, AdaptivePageSize, None],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        deadline: Union[float, CancellationToken, None] = None,
+    ) -> Iterator:
+        """
+        Internal method that walks a paginated operation, yielding its items, or its pages when called by iter_pages
+        :param load_page: the method loading a page, given its page_size and its cursor or page number
+        :param style: how pages follow each other, see zanshinsdk.common.paginator
+        :param page_size: the page size, or an AdaptivePageSize choosing it for each page
+        :param limit: optional maximum number of items
+        :param cursor: optional cursor the iteration starts from
+        :param deadline: optional time budget in seconds, or CancellationToken, stopping the iteration
+        :return: an iterator over the items, or the pages
+        """
+        if self._scheduler is not None:
+            # pages are bulk traffic, unless the caller chose a priority class
+            load_page = with_default_priority(BULK, load_page)
+        paginator = Paginator(
+            load_page,
+            style,
+            page_size=page_size,
+            limit=limit,
+            cursor=cursor,
+            cancellation=as_token(deadline),
         )
-        if response.request.content:
-            self._logger.debug(
-                "%s %s (%d bytes in request body) status code %d",
-                response.request.method,
-                response.request.url,
-                len(response.request.content),
-                response.status_code,
-            )
+        if _yield_pages.get():
+            yield from paginator.iter_pages()
         else:
-            self._logger.debug(
-                "%s %s status code %d",
-                response.request.method,
-                response.request.url,
-                response.status_code,
+            yield from paginator
+
+    def iter_pages(self, iterator, *args, **kwargs) -> Iterator[Page]:
+        """
+        Iterates over the pages of a paginated iterator, e.g. iter_alerts, rather than over its items.
+        :param iterator: the iterator method, or its name
+        :param args: positional arguments of the iterator
+        :param kwargs: keyword arguments of the iterator
+        :return: an iterator over zanshinsdk.common.paginator.Page objects, holding the items and how they were loaded
+        """
+        if isinstance(iterator, str):
+            iterator = getattr(self, iterator)
+        iterator = iterator(*args, **kwargs)
+        # the iterator decides what to yield when it starts, which happens on the first next()
+        token = _yield_pages.set(True)
+        try:
+            first = next(iterator, None)
+        finally:
+            _yield_pages.reset(token)
+        if first is None:
+            return
+        if not isinstance(first, Page):
+            raise TypeError("iter_pages only accepts paginated iterators")
+        yield first
+        yield from iterator
+
+    def _perform_request(
+        self,
+        method: str,
+        url: str,
+        path: str,
+        params=None,
+        body=None,
+        event: Optional[RequestEvent] = None,
+    ) -> httpx.Response:
+        """
+        Internal method that performs a request, going through the response cache and the HTTP cache
+        :param method: HTTP method to pass along to httpx.Client.request
+        :param url: absolute URL of the request
+        :param path: API path to access, used as cache key
+        :param params: parameters to pass along to httpx.Client.request
+        :param body: request body to pass along to httpx.Client.request
+        :param event: the instrumentation event of the request, if any
+        :return: the requests.Response object returned by httpx.Client.request
+        """
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self._logger.debug("Requesting body=%s", body)
+        kwargs = {}
+
+        # persistent cache: serve fresh entries without touching the network at all
+        bypass_caches = _bypass_caches.get()
+        response_cache = self.response_cache
+        response_key = None
+        if response_cache is not None and is_read_only_request(method, path):
+            response_key = response_cache_key(self._api_key, method, url, params, body)
+            cached_response = (
+                None if bypass_caches else response_cache.get(response_key)
+            )
+            if cached_response:
+                if debug:
+                    self._logger.debug(
+                        "Serving %s %s from response cache", method, path
+                    )
+                if event is not None:
+                    event.source = "response_cache"
+                return cached_response.to_response(method, url, params)
+
+        # conditional GET: revalidate a previously cached response instead of downloading it again
+        cache_key = None
+        cache_entry = None
+        if self._http_cache is not None and method.upper() == "GET":
+            cache_key = http_cache_key(self._api_key, method, url, params)
+            cache_entry = None if bypass_caches else self._http_cache.get(cache_key)
+            if cache_entry:
+                kwargs["headers"] = cache_entry.validators()
+
+        # requests made within a cancellation scope don't start once it is cancelled, nor outlive its deadline
+        token = current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+            if token.remaining() is not None:
+                kwargs["timeout"] = token.request_timeout(self._client.timeout)
+
+        send = partial(self._send, method, url, params, body, event, **kwargs)
+        if self._scheduler is not None:
+            # the scheduler is the only gate, a limiter then only adapts the limit the scheduler may follow
+            if self._concurrency_limiter is not None:
+                send = partial(self._concurrency_limiter.observe, send)
+            send = partial(self._scheduler.call, current_priority(), send)
+        elif self._concurrency_limiter is not None:
+            send = partial(self._concurrency_limiter.call, send)
+        if self._hedging is not None and is_read_only_request(method, path):
+            send = partial(
+                self._hedging.run, f"{method.upper()} {templated_path(path)}", send
+            )
+        if self._circuit_breaker is not None:
+            response = self._circuit_breaker.call(
+                f"{method.upper()} {templated_path(path)}", send
             )
+        else:
+            response = send()
+        if cache_key is not None:
+            response = self._handle_http_cache(response, cache_key, cache_entry)
         response.raise_for_status()
+        if response_key is not None:
+            response_cache.set(
+                response_key,
+                CachedResponse(
+                    response.content,
+                    {
+                        "content-type": response.headers.get(
+                            "content-type", "application/json"
+                        )
+                    },
+                ),
+            )
+        return response
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params=None,
+        body=None,
+        event: Optional[RequestEvent] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Internal method that sends a request over the network
+        :param method: HTTP method to pass along to httpx.Client.request
+        :param url: absolute URL of the request
+        :param params: parameters to pass along to httpx.Client.request
+        :param body: request body, compressed if request compression is enabled
+        :param event: the instrumentation event of the request, if any
+        :param kwargs: other arguments to pass along to httpx.Client.request
+        :return: the requests.Response object returned by httpx.Client.request
+        """
+        http_client = self._acquire_http_client()
+        try:
+            if self._request_compression is not None and body is not None:
+                content, headers = encode_json_body(
+                    body, self._request_compression, self._compression_threshold
+                )
+                kwargs["headers"] = {**kwargs.get("headers", {}), **headers}
+                response = http_client.request(
+                    method=method, url=url, params=params, content=content, **kwargs
+                )
+            else:
+                response = http_client.request(
+                    method=method, url=url, params=params, json=body, **kwargs
+                )
+        finally:
+            self._release_http_client(http_client)
+        if event is not None:
+            event.request_bytes = len(response.request.content)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            if response.request.content:
+                self._logger.debug(
+                    "%s %s (%d bytes in request body) status code %d",
+                    response.request.method,
+                    response.request.url,
+                    len(response.request.content),
+                    response.status_code,
+                )
+            else:
+                self._logger.debug(
+                    "%s %s status code %d",
+                    response.request.method,
+                    response.request.url,
+                    response.status_code,
+                )
+        return response
+
+    def _notify_instrumentations(self, hook: str, event: RequestEvent) -> None:
+        """
+        Internal method that calls a hook on every instrumentation. A failing hook is logged and never breaks the
+        request it observes.
+        """
+        for instrumentation in self._instrumentations:
+            try:
+                getattr(instrumentation, hook)(event)
+            except Exception:
+                self._logger.exception("Instrumentation %s failed", hook)
+
+    def _handle_http_cache(
+        self,
+        response: httpx.Response,
+        cache_key: str,
+        cache_entry: Optional[HttpCacheEntry],
+    ) -> httpx.Response:
+        """
+        Internal method that serves 304 Not Modified responses from the HTTP cache, and stores new responses in it.
+        :param response: the response to the (possibly conditional) GET request
+        :param cache_key: the key of the request in the HTTP cache
+        :param cache_entry: the entry that was used to build the conditional request, if any
+        :return: the response the caller should see
+        """
+        if response.status_code == 304 and cache_entry:
+            self._logger.debug("Serving %s from HTTP cache", response.request.url)
+            return cache_entry.to_response(response.request)
+        if response.status_code == 200:
+            new_entry = HttpCacheEntry.from_response(response)
+            if new_entry:
+                self._http_cache.set(cache_key, new_entry)
+            elif cache_entry:
+                self._http_cache.delete(cache_key)
         return response
 
     ###################################################
@@ -1570,7 +2219,9 @@ class Client:
         cursor: Optional[str] = None,
         order: Optional[AlertsOrderOpts] = None,
         sort: Optional[SortOpts] = None,
-        page_size: Optional[int] = 1000,
+        page_size: Union[int, AdaptivePageSize, None] = 1000,
+        limit: Optional[int] = None,
+        deadline: Union[float, CancellationToken, None] = None,
     ) -> Iterator[Dict]:
         """
         Iterates over the alerts of an organization by loading them, transparently paginating on the API
@@ -1593,39 +2244,22 @@ class Client:
         :param cursor: Cursor of the last alert consumed, when this value is passed, subsequent alert histories will be returned.
         :param order: Sort order to use (ascending or descending)
         :param sort: Which field to sort on
+        :param page_size: the number of alerts to load from the API at a time, or an AdaptivePageSize tuning it
+               for each page
+        :param limit: optional maximum number of alerts to iterate over, the last page requested only asks for what
+               is missing
+        :param deadline: optional time budget in seconds, counted from the first item requested, or a
+               CancellationToken. Once it runs out the iteration raises OperationCancelled, holding the cursor to
+               resume from
         :return: an iterator over the JSON decoded alerts
         """
-        page = self._get_alerts_page(
-            organization_id,
-            scan_target_ids,
-            scan_target_tags=scan_target_tags,
-            include_empty_scan_target_tags=include_empty_scan_target_tags,
-            cursor=cursor,
-            order=order,
-            rules=rules,
-            states=states,
-            severities=severities,
-            lang=lang,
-            opened_at_start=opened_at_start,
-            opened_at_end=opened_at_end,
-            resolved_at_start=resolved_at_start,
-            resolved_at_end=resolved_at_end,
-            created_at_start=created_at_start,
-            created_at_end=created_at_end,
-            updated_at_start=updated_at_start,
-            updated_at_end=updated_at_end,
-            search=search,
-            sort=sort,
-            page_size=page_size,
-        )
-        yield from page.get("data", [])
-        while page.get("cursor"):
-            page = self._get_alerts_page(
+        yield from self._paginate(
+            partial(
+                self._get_alerts_page,
                 organization_id,
                 scan_target_ids,
                 scan_target_tags=scan_target_tags,
                 include_empty_scan_target_tags=include_empty_scan_target_tags,
-                cursor=page.get("cursor"),
                 order=order,
                 rules=rules,
                 states=states,
@@ -1641,9 +2275,91 @@ class Client:
                 updated_at_end=updated_at_end,
                 search=search,
                 sort=sort,
+            ),
+            CURSOR,
+            page_size,
+            limit=limit,
+            cursor=cursor,
+            deadline=deadline,
+        )
+
+    def watch_alerts(
+        self,
+        organization_id: Union[UUID, str],
+        poll_interval: float = 60,
+        overlap: float = 60,
+        updated_at_start: Optional[Union[str, datetime]] = None,
+        scan_target_ids: Optional[Iterable[Union[UUID, str]]] = None,
+        states: Optional[Iterable[AlertState]] = None,
+        severities: Optional[Iterable[AlertSeverity]] = None,
+        page_size: Optional[int] = 1000,
+        max_polls: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Polls the alerts of an organization, yielding each alert once per update. A high-water mark of the updatedAt
+        of the alerts seen is kept, and each poll only lists alerts updated since it, so traffic follows the number
+        of changes rather than the number of alerts.
+        :param organization_id: the ID of the organization
+        :param poll_interval: seconds to wait between polls
+        :param overlap: seconds before the high-water mark also listed by each poll, so that alerts whose update was
+               committed late aren't missed. Alerts already yielded with the same updatedAt are skipped.
+        :param updated_at_start: only yield alerts updated since this date, defaults to all alerts on the first poll
+        :param scan_target_ids: optional list of scan target IDs to list alerts from, defaults to all
+        :param states: optional list of states to filter returned alerts, defaults to all
+        :param severities: optional list of severities to filter returned alerts, defaults to all
+        :param page_size: the number of alerts per page
+        :param max_polls: optional number of polls after which the iterator ends, defaults to polling forever
+        :return: an iterator over the JSON decoded alerts
+        """
+        validate_int(max_polls, min_value=1)
+        if poll_interval < 0 or overlap < 0:
+            raise ValueError("poll_interval and overlap shouldn't be negative")
+        watermark = validate_date(updated_at_start)
+        if watermark is not None:
+            watermark = _naive_utc(watermark)
+        # (id, updatedAt) of the alerts yielded inside the overlap window, and their update time
+        seen: Dict[Tuple[str, str], datetime] = {}
+        polls = 0
+        while True:
+            start = (
+                None if watermark is None else watermark - timedelta(seconds=overlap)
+            )
+            alerts = self.iter_alerts(
+                organization_id,
+                scan_target_ids,
+                states=states,
+                severities=severities,
+                updated_at_start=start,
+                order=AlertsOrderOpts.UPDATED_AT,
+                sort=SortOpts.ASC,
                 page_size=page_size,
             )
-            yield from page.get("data", [])
+            while True:
+                # each poll sends the same request until the watermark moves, a cached answer would hide changes
+                with self.uncached():
+                    alert = next(alerts, None)
+                if alert is None:
+                    break
+                updated_at = alert.get("updatedAt")
+                if not updated_at:
+                    yield alert
+                    continue
+                key = (alert.get("id"), updated_at)
+                if key in seen:
+                    continue
+                timestamp = _parse_timestamp(updated_at)
+                seen[key] = timestamp
+                if watermark is None or timestamp > watermark:
+                    watermark = timestamp
+                yield alert
+
+            if watermark is not None:
+                start = watermark - timedelta(seconds=overlap)
+                seen = {key: value for key, value in seen.items() if value >= start}
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                return
+            time.sleep(poll_interval)
 
     def _get_following_alerts_page(
         self,
@@ -1784,7 +2500,9 @@ class Client:
         cursor: Optional[str] = None,
         order: Optional[AlertsOrderOpts] = None,
         sort: Optional[SortOpts] = None,
-        page_size: int = 100,
+        page_size: Union[int, AdaptivePageSize, None] = 100,
+        limit: Optional[int] = None,
+        deadline: Union[float, CancellationToken, None] = None,
     ) -> Iterator[Dict]:
         """
         Iterates over the following alerts from organizations being followed by transparently paginating on the API.
@@ -1807,40 +2525,21 @@ class Client:
         :param cursor: Cursor of the last alert consumed, when this value is passed, subsequent alert histories will be returned.
         :param order: Sort order to use based od alert order opts
         :param sort: Which field to sort on
-        :param page_size: Page size of alerts
+        :param page_size: Page size of alerts, or an AdaptivePageSize tuning it for each page
+        :param limit: optional maximum number of alerts to iterate over, the last page requested only asks for what
+               is missing
+        :param deadline: optional time budget in seconds, counted from the first item requested, or a
+               CancellationToken. Once it runs out the iteration raises OperationCancelled, holding the cursor to
+               resume from
         :return: an iterator over the JSON decoded alerts
         """
-        page = self._get_following_alerts_page(
-            organization_id,
-            following_ids,
-            following_tags=following_tags,
-            include_empty_following_tags=include_empty_following_tags,
-            cursor=cursor,
-            order=order,
-            rules=rules,
-            states=states,
-            severities=severities,
-            lang=lang,
-            opened_at_start=opened_at_start,
-            opened_at_end=opened_at_end,
-            resolved_at_start=resolved_at_start,
-            resolved_at_end=resolved_at_end,
-            created_at_start=created_at_start,
-            created_at_end=created_at_end,
-            updated_at_start=updated_at_start,
-            updated_at_end=updated_at_end,
-            search=search,
-            sort=sort,
-            page_size=page_size,
-        )
-        yield from page.get("data", [])
-        while page.get("cursor"):
-            page = self._get_following_alerts_page(
+        yield from self._paginate(
+            partial(
+                self._get_following_alerts_page,
                 organization_id,
                 following_ids,
                 following_tags=following_tags,
                 include_empty_following_tags=include_empty_following_tags,
-                cursor=page.get("cursor"),
                 order=order,
                 rules=rules,
                 states=states,
@@ -1856,9 +2555,13 @@ class Client:
                 updated_at_end=updated_at_end,
                 search=search,
                 sort=sort,
-                page_size=page_size,
-            )
-            yield from page.get("data", [])
+            ),
+            CURSOR,
+            page_size,
+            limit=limit,
+            cursor=cursor,
+            deadline=deadline,
+        )
 
     def _get_alerts_history_page(
         self,
@@ -1899,43 +2602,42 @@ class Client:
         self,
         organization_id: Union[UUID, str],
         scan_target_ids: Optional[Iterable[Union[UUID, str]]] = None,
-        page_size: int = 100,
+        page_size: Union[int, AdaptivePageSize, None] = 100,
         language: Optional[Languages] = None,
         cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        deadline: Union[float, CancellationToken, None] = None,
     ) -> Iterator[Dict]:
         """
         Iterates over the alert's history of an organization by loading them, transparently paginating on the API.
         <https://api.zanshin.tenchisecurity.com/#operation/listAllAlertsHistory>
         :param organization_id: the ID of the organization
         :param scan_target_ids: optional list of scan target IDs to list alerts from, defaults to all
-        :param page_size: the number of alerts to load from the API at a time
+        :param page_size: the number of alerts to load from the API at a time, or an AdaptivePageSize tuning it
+               for each page
         :param language: language the rule will be returned.
         :param cursor: Alert Cursor of the last alert consumed, when this value is passed, subsequent alert histories
                will be returned.
+        :param limit: optional maximum number of alerts to iterate over, the last page requested only asks for what
+               is missing
+        :param deadline: optional time budget in seconds, counted from the first item requested, or a
+               CancellationToken. Once it runs out the iteration raises OperationCancelled, holding the cursor to
+               resume from
         :return: an iterator over the JSON decoded alerts
         """
-
-        page = self._get_alerts_history_page(
-            organization_id,
-            scan_target_ids,
-            page_size=page_size,
-            language=language,
-            cursor=cursor,
-        )
-        data = page.get("data", [])
-        yield from data
-
-        while len(data) > 0:
-            cursor = data[len(data) - 1]["cursor"]
-            page = self._get_alerts_history_page(
+        yield from self._paginate(
+            partial(
+                self._get_alerts_history_page,
                 organization_id,
                 scan_target_ids,
-                page_size=page_size,
                 language=language,
-                cursor=cursor,
-            )
-            data = page.get("data", [])
-            yield from data
+            ),
+            ITEM_CURSOR,
+            page_size,
+            limit=limit,
+            cursor=cursor,
+            deadline=deadline,
+        )
 
     def _get_alerts_following_history_page(
         self,
@@ -1977,9 +2679,11 @@ class Client:
         self,
         organization_id: Union[UUID, str],
         following_ids: Optional[Iterable[Union[UUID, str]]] = None,
-        page_size: int = 100,
+        page_size: Union[int, AdaptivePageSize, None] = 100,
         language: Optional[Languages] = None,
         cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        deadline: Union[float, CancellationToken, None] = None,
     ) -> Iterator[Dict]:
         """
         Iterates over the alert's history of an organization by loading them, transparently paginating on the API
@@ -1987,33 +2691,31 @@ class Client:
         :param organization_id: the ID of the organization
         :param following_ids: optional list of IDs of organizations you are following to list alerts from, defaults to
                all
-        :param page_size: the number of alerts to load from the API at a time
+        :param page_size: the number of alerts to load from the API at a time, or an AdaptivePageSize tuning it
+               for each page
         :param language: language the rule will be returned. Ignored when historical is enabled
         :param cursor: Alert Cursor of the last alert consumed, when this value is passed, subsequent alert histories
                will be returned
+        :param limit: optional maximum number of alerts to iterate over, the last page requested only asks for what
+               is missing
+        :param deadline: optional time budget in seconds, counted from the first item requested, or a
+               CancellationToken. Once it runs out the iteration raises OperationCancelled, holding the cursor to
+               resume from
         :return: an iterator over the JSON decoded alerts
         """
-        page = self._get_alerts_following_history_page(
-            organization_id,
-            following_ids,
-            page_size=page_size,
-            language=language,
-            cursor=cursor,
-        )
-        data = page.get("data", [])
-        yield from data
-
-        while len(data) > 0:
-            cursor = data[len(data) - 1]["cursor"]
-            page = self._get_alerts_following_history_page(
+        yield from self._paginate(
+            partial(
+                self._get_alerts_following_history_page,
                 organization_id,
                 following_ids,
-                page_size=page_size,
                 language=language,
-                cursor=cursor,
-            )
-            data = page.get("data", [])
-            yield from data
+            ),
+            ITEM_CURSOR,
+            page_size,
+            limit=limit,
+            cursor=cursor,
+            deadline=deadline,
+        )
 
     def _get_grouped_alerts_page(
         self,
@@ -2121,9 +2823,11 @@ class Client:
         updated_at_end: Optional[str] = None,
         search: Optional[str] = None,
         cursor: Optional[str] = None,
-        page_size: Optional[int] = 100,
+        page_size: Union[int, AdaptivePageSize, None] = 100,
         order: Optional[GroupedAlertOrderOpts] = None,
         sort: Optional[SortOpts] = None,
+        limit: Optional[int] = None,
+        deadline: Union[float, CancellationToken, None] = None,
     ) -> Iterator[Dict]:
         """
         Iterates over the grouped alerts of an organization by loading them, transparently paginating on the API.
@@ -2147,40 +2851,22 @@ class Client:
         :param cursor: Cursor of the last alert consumed, when this value is passed, subsequent alert histories will be returned.
         :param order: Sort order to use (ascending or descending)
         :param sort: Which field to sort on
+        :param page_size: the number of alerts to load from the API at a time, or an AdaptivePageSize tuning it
+               for each page
+        :param limit: optional maximum number of alerts to iterate over, the last page requested only asks for what
+               is missing
+        :param deadline: optional time budget in seconds, counted from the first item requested, or a
+               CancellationToken. Once it runs out the iteration raises OperationCancelled, holding the cursor to
+               resume from
         :return: an iterator over the JSON decoded alerts
         """
-        page = self._get_grouped_alerts_page(
-            organization_id,
-            scan_target_ids=scan_target_ids,
-            scan_target_tags=scan_target_tags,
-            include_empty_scan_target_tags=include_empty_scan_target_tags,
-            cursor=cursor,
-            page_size=page_size,
-            order=order,
-            rules=rules,
-            states=states,
-            severities=severities,
-            lang=lang,
-            opened_at_start=opened_at_start,
-            opened_at_end=opened_at_end,
-            resolved_at_start=resolved_at_start,
-            resolved_at_end=resolved_at_end,
-            created_at_start=created_at_start,
-            created_at_end=created_at_end,
-            updated_at_start=updated_at_start,
-            updated_at_end=updated_at_end,
-            search=search,
-            sort=sort,
-        )
-        yield from page.get("data", [])
-        while page.get("cursor"):
-            page = self._get_grouped_alerts_page(
+        yield from self._paginate(
+            partial(
+                self._get_grouped_alerts_page,
                 organization_id,
-                scan_target_ids,
+                scan_target_ids=scan_target_ids,
                 scan_target_tags=scan_target_tags,
                 include_empty_scan_target_tags=include_empty_scan_target_tags,
-                cursor=page.get("cursor"),
-                page_size=page_size,
                 order=order,
                 rules=rules,
                 states=states,
@@ -2196,8 +2882,13 @@ class Client:
                 updated_at_end=updated_at_end,
                 search=search,
                 sort=sort,
-            )
-            yield from page.get("data", [])
+            ),
+            CURSOR,
+            page_size,
+            limit=limit,
+            cursor=cursor,
+            deadline=deadline,
+        )
 
     def _get_grouped_following_alerts_page(
         self,
@@ -2313,9 +3004,11 @@ class Client:
         updated_at_end: Optional[str] = None,
         search: Optional[str] = None,
         cursor: Optional[str] = None,
-        page_size: Optional[int] = 100,
+        page_size: Union[int, AdaptivePageSize, None] = 100,
         order: Optional[GroupedAlertOrderOpts] = None,
         sort: Optional[SortOpts] = None,
+        limit: Optional[int] = None,
+        deadline: Union[float, CancellationToken, None] = None,
     ) -> Iterator[Dict]:
         """
         Iterates over the grouped following alerts from organizations being followed by transparently paginating on the API.
@@ -2339,40 +3032,21 @@ class Client:
         :param order: Sort order to use (ascending or descending)
         :param cursor: Cursor of the last alert consumed, when this value is passed, subsequent alert histories will be returned.
         :param sort: Which field to sort on
-        """
-
-        page = self._get_grouped_following_alerts_page(
-            organization_id,
-            following_ids,
-            following_tags=following_tags,
-            include_empty_following_tags=include_empty_following_tags,
-            cursor=cursor,
-            page_size=page_size,
-            order=order,
-            rules=rules,
-            states=states,
-            severities=severities,
-            lang=lang,
-            opened_at_start=opened_at_start,
-            opened_at_end=opened_at_end,
-            resolved_at_start=resolved_at_start,
-            resolved_at_end=resolved_at_end,
-            created_at_start=created_at_start,
-            created_at_end=created_at_end,
-            updated_at_start=updated_at_start,
-            updated_at_end=updated_at_end,
-            search=search,
-            sort=sort,
-        )
-        yield from page.get("data", [])
-        while page.get("cursor"):
-            page = self._get_grouped_following_alerts_page(
+        :param page_size: the number of alerts to load from the API at a time, or an AdaptivePageSize tuning it
+               for each page
+        :param limit: optional maximum number of alerts to iterate over, the last page requested only asks for what
+               is missing
+        :param deadline: optional time budget in seconds, counted from the first item requested, or a
+               CancellationToken. Once it runs out the iteration raises OperationCancelled, holding the cursor to
+               resume from
+        """
+        yield from self._paginate(
+            partial(
+                self._get_grouped_following_alerts_page,
                 organization_id,
                 following_ids,
                 following_tags=following_tags,
                 include_empty_following_tags=include_empty_following_tags,
-                cursor=page.get("cursor"),
-                page_size=page_size,
                 order=order,
                 rules=rules,
                 states=states,
@@ -2388,8 +3062,13 @@ class Client:
                 updated_at_end=updated_at_end,
                 search=search,
                 sort=sort,
-            )
-            yield from page.get("data", [])
+            ),
+            CURSOR,
+            page_size,
+            limit=limit,
+            cursor=cursor,
+            deadline=deadline,
+        )
 
     def get_alert(self, alert_id: Union[UUID, str]) -> Dict:
         """
@@ -2417,27 +3096,28 @@ class Client:
         self,
         alert_id: Union[UUID, str],
         page_size: Optional[int] = 100,
+        limit: Optional[int] = None,
+        deadline: Union[float, CancellationToken, None] = None,
     ) -> Iterator[Dict]:
         """
         Iterates over the history of an alert.
         <https://api.zanshin.tenchisecurity.com/#operation/listAllAlertHistory>
         :param alert_id: the ID of the alert
+        :param page_size: the number of items to load from the API at a time
+        :param limit: optional maximum number of items to iterate over
+        :param deadline: optional time budget in seconds, counted from the first item requested, or a
+               CancellationToken. Once it runs out the iteration raises OperationCancelled; this endpoint is
+               paginated by page number, so the exception holds no cursor and the iteration can't be resumed
         :return:
         """
-
-        page = self._get_alert_history_page(
-            alert_id=alert_id, page_size=page_size, page=1
+        yield from self._paginate(
+            partial(self._get_alert_history_page, alert_id=alert_id),
+            PAGE_NUMBER,
+            page_size,
+            limit=limit,
+            deadline=deadline,
         )
 
-        yield from page.get("data", [])
-        for page_number in range(
-            2, int(ceil(page.get("total", 0) / float(page_size))) + 1
-        ):
-            page = self._get_alert_history_page(
-                alert_id=alert_id, page_size=page_size, page=page_number
-            )
-            yield from page.get("data", [])
-
     def _get_alert_comment_page(
         self,
         alert_id: Union[UUID, str],
@@ -2455,26 +3135,27 @@ class Client:
         self,
         alert_id: Union[UUID, str],
         page_size: Optional[int] = 100,
+        limit: Optional[int] = None,
+        deadline: Union[float, CancellationToken, None] = None,
     ) -> Iterator[Dict]:
         """
         Iterates over the comment of an alert.
         <https://api.zanshin.tenchisecurity.com/#operation/listAllAlertComments>
         :param alert_id: the ID of the alert
+        :param page_size: the number of items to load from the API at a time
+        :param limit: optional maximum number of items to iterate over
+        :param deadline: optional time budget in seconds, counted from the first item requested, or a
+               CancellationToken. Once it runs out the iteration raises OperationCancelled; this endpoint is
+               paginated by page number, so the exception holds no cursor and the iteration can't be resumed
         :return:
         """
-        page = self._get_alert_comment_page(
-            alert_id=alert_id, page_size=page_size, page=1
+        yield from self._paginate(
+            partial(self._get_alert_comment_page, alert_id=alert_id),
+            PAGE_NUMBER,
+            page_size,
+            limit=limit,
+            deadline=deadline,
         )
-        yield from page.get("data", [])
-        for page_number in range(
-            2, int(ceil(page.get("total", 0) / float(page_size))) + 1
-        ):
-            page = self._get_alert_comment_page(
-                alert_id=alert_id,
-                page_size=page_size,
-                page=page_number,
-            )
-            yield from page.get("data", [])
 
     def update_alert(
         self,
@@ -2761,6 +3442,7 @@ class Client:
         boto3_session: any = None,
         boto3_profile: str = "default",
         schedule: ScanTargetSchedule = DAILY,
+        waiter: Optional[Waiter] = None,
     ) -> Dict:
         """
         Currently supports only AWS Scan Targets.
@@ -2779,6 +3461,7 @@ class Client:
         :param schedule: schedule in string or enum format.
         :param boto3_profile: boto3 profile name used for CloudFormation Deployment. If none, uses \"default\" profile.
         :param boto3_session: boto3 session used for CloudFormation Deployment. If informed, will ignore boto3_profile.
+        :param waiter: optional Waiter controlling how the CloudFormation Stack completion is polled.
         :return: JSON object containing newly created scan target .
         """
 
@@ -2796,58 +3479,211 @@ class Client:
 
         self._check_aws_credentials_are_valid(boto3_session=boto3_session)
 
-        if len(name) < 3:
-            name = f"{name}_{credential['account']}"
+        name = self._scan_target_name(name, credential["account"])
 
         new_scan_target = self.create_organization_scan_target(
             organization_id, kind, name, credential, schedule
         )
         new_scan_target_id = new_scan_target["id"]
 
-        zanshin_stack_name = "tenchi-zanshin-service-role"
+        zanshin_stack_name = ZANSHIN_STACK_NAME
         try:
             cloudformation_client = self._deploy_cloudformation_zanshin_service_role(
                 boto3_session, region, new_scan_target_id, zanshin_stack_name
             )
-            retries = 0
-            max_retry = 10
-            wait_between_retries = 10
-            zanshin_stack = self._get_cloudformation_stack_status(
-                zanshin_stack_name, cloudformation_client
-            )
-
-            while zanshin_stack["StackStatus"] != "CREATE_COMPLETE":
-                if not retries:
-                    self._logger.debug(
-                        f"Failed to confirm CloudFormation Stack {zanshin_stack_name} completion. Retrying."
-                    )
-                if retries >= max_retry:
-                    raise RuntimeError("CloudFormation Stack wasn't deployed")
-                time.sleep(wait_between_retries)
-                self._logger.debug(
-                    f"Checking CloudFormation Stack {zanshin_stack_name}..."
-                )
-                retries += 1
-                zanshin_stack = self._get_cloudformation_stack_status(
+            (waiter or Waiter()).wait(
+                lambda: self._get_cloudformation_stack_status(
                     zanshin_stack_name, cloudformation_client
-                )
-
+                )["StackStatus"],
+                is_done=is_stack_complete,
+                is_failed=is_stack_failed,
+                description=f"CloudFormation Stack {zanshin_stack_name}",
+            )
         except Exception as error:
-            print("err", error)
+            self._logger.error(
+                f"Failed to confirm CloudFormation Stack {zanshin_stack_name} completion: {error}"
+            )
             raise ValueError(
                 f"Failed to confirm CloudFormation Stack {zanshin_stack_name} completion."
             )
 
+        return self._finish_onboarding(organization_id, new_scan_target_id)
+
+    def onboard_scan_targets(
+        self,
+        organization_id: Union[UUID, str],
+        accounts: Iterable[Tuple],
+        schedule: ScanTargetSchedule = DAILY,
+        max_workers: Optional[int] = None,
+        waiter: Optional[Waiter] = None,
+    ) -> List[Dict]:
+        """
+        Onboards many AWS accounts at once. CloudFormation stacks are deployed concurrently by a bounded pool of
+        workers, each stack is polled along with the others as soon as its deployment completes, and each account is
+        checked and scanned as soon as its stack completes. Failures are reported per account instead of interrupting the other onboardings.
+        :param organization_id: the ID of the organization to have the new Scan Targets.
+        :param accounts: tuples of (account ID, boto3 session or profile name, region), optionally followed by the
+            name of the new scan target, which defaults to the account ID.
+        :param schedule: schedule of the new scan targets.
+        :param max_workers: maximum number of accounts handled concurrently, defaults to the max_limit of the
+            concurrency limiter of the client if it has one, 8 otherwise.
+        :param waiter: optional Waiter controlling the delays between polls of the pending stacks, and the deadline
+            after which stacks still pending are reported as failed.
+        :return: a list with one report per account, in the same order as accounts. Each report has the keys
+            account, region, scanTargetId, scanTarget, status (ONBOARDED or FAILED) and error.
+        """
+        validate_uuid(organization_id)
+        max_workers = worker_count(self, max_workers, 8)
+        boto3 = self._check_boto3_installation()
+
+        reports = []
+        for entry in accounts:
+            account, session, region = entry[0], entry[1], entry[2]
+            name = self._scan_target_name(
+                entry[3] if len(entry) > 3 and entry[3] else str(account), account
+            )
+            reports.append(
+                {
+                    "account": str(account),
+                    "region": region,
+                    "name": name,
+                    "session": session,
+                    "scanTargetId": None,
+                    "scanTarget": None,
+                    "status": None,
+                    "error": None,
+                }
+            )
+
+        def deploy(report):
+            session = report["session"]
+            if session is None or isinstance(session, str):
+                session = self._get_session_from_boto3_profile(
+                    boto3_profile=session or "default", boto3=boto3
+                )
+            self._check_aws_credentials_are_valid(boto3_session=session)
+            scan_target = self.create_organization_scan_target(
+                organization_id,
+                ScanTargetKind.AWS,
+                report["name"],
+                ScanTargetAWS(report["account"]),
+                schedule,
+            )
+            report["scanTargetId"] = scan_target["id"]
+            return self._deploy_cloudformation_zanshin_service_role(
+                session, report["region"], scan_target["id"], ZANSHIN_STACK_NAME
+            )
+
+        def finish(report):
+            report["scanTarget"] = self._finish_onboarding(
+                organization_id, report["scanTargetId"]
+            )
+            report["status"] = "ONBOARDED"
+
+        def fail(report, error):
+            self._logger.error(
+                "Failed to onboard AWS account %s: %s", report["account"], error
+            )
+            report["status"] = "FAILED"
+            report["error"] = str(error)
+
+        waiter = waiter or Waiter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            deployments = {executor.submit(deploy, r): r for r in reports}
+            finishing = []
+            delays = None
+            while deployments or pending:
+                # stacks join the polled ones as soon as their deployment completes, whatever the order of accounts
+                deployed = [future for future in deployments if future.done()]
+                if not deployed and not pending:
+                    deployed, _ = wait(deployments, return_when=FIRST_COMPLETED)
+                for future in deployed:
+                    report = deployments.pop(future)
+                    try:
+                        pending[id(report)] = (report, future.result())
+                    except Exception as error:
+                        fail(report, error)
+                if not pending:
+                    continue
+
+                if delays is None:
+                    delays = waiter.delays()
+                statuses = [
+                    (
+                        report,
+                        executor.submit(
+                            self._get_cloudformation_stack_status,
+                            ZANSHIN_STACK_NAME,
+                            cloudformation_client,
+                        ),
+                    )
+                    for report, cloudformation_client in pending.values()
+                ]
+                for report, future in statuses:
+                    try:
+                        stack_status = future.result()["StackStatus"]
+                    except Exception as error:
+                        fail(report, error)
+                        del pending[id(report)]
+                        continue
+                    if is_stack_complete(stack_status):
+                        finishing.append((report, executor.submit(finish, report)))
+                        del pending[id(report)]
+                    elif is_stack_failed(stack_status):
+                        fail(
+                            report,
+                            RuntimeError(
+                                f"CloudFormation Stack {ZANSHIN_STACK_NAME} is {stack_status}"
+                            ),
+                        )
+                        del pending[id(report)]
+
+                if not pending:
+                    continue
+                delay = next(delays, None)
+                if delay is None:
+                    for report, _ in pending.values():
+                        fail(
+                            report, TimeoutError("CloudFormation Stack wasn't deployed")
+                        )
+                    pending.clear()
+                    continue
+                waiter.sleep(delay)
+
+            for report, future in finishing:
+                try:
+                    future.result()
+                except Exception as error:
+                    fail(report, error)
+
+        for report in reports:
+            del report["session"]
+        return reports
+
+    @staticmethod
+    def _scan_target_name(name: str, account) -> str:
+        """The name of a new AWS scan target, names shorter than the API accepts being suffixed with the account."""
+        if len(name) < 3:
+            name = f"{name}_{account}"
+        return name
+
+    def _finish_onboarding(
+        self, organization_id: Union[UUID, str], scan_target_id: Union[UUID, str]
+    ) -> Dict:
+        """
+        Checks a newly onboarded scan target, starts its first scan and returns its updated details.
+        """
         self.check_organization_scan_target(
-            organization_id=organization_id, scan_target_id=new_scan_target_id
+            organization_id=organization_id, scan_target_id=scan_target_id
         )
         self.start_organization_scan_target_scan(
             organization_id=organization_id,
-            scan_target_id=new_scan_target_id,
+            scan_target_id=scan_target_id,
             force=True,
         )
         return self.get_organization_scan_target(
-            organization_id=organization_id, scan_target_id=new_scan_target_id
+            organization_id=organization_id, scan_target_id=scan_target_id
         )
 
     def _deploy_cloudformation_zanshin_service_role(
@@ -2861,8 +3697,8 @@ class Client:
         Instantiate boto3 client for CloudFormation, and create the Stack containing Zanshin Service Role.
         :return: boto3 cloudformation client.
         """
-        cloudformation_client = boto3_session.client(
-            "cloudformation", region_name=region
+        cloudformation_client = self._get_boto3_client(
+            boto3_session, "cloudformation", region
         )
         try:
             cloudformation_client.describe_stacks(StackName=zanshin_stack_name)
@@ -2913,10 +3749,34 @@ class Client:
 
     def _get_session_from_boto3_profile(self, boto3_profile, boto3):
         """
-        Return boto3_session from boto3_profile informed
+        Return boto3_session from boto3_profile informed. Sessions are created once per profile and reused.
         :return: boto3_session.
         """
-        return boto3.Session(profile_name=boto3_profile)
+        with self._boto3_lock:
+            session = self._boto3_sessions.get(boto3_profile)
+            if session is None:
+                session = boto3.Session(profile_name=boto3_profile)
+                self._boto3_sessions[boto3_profile] = session
+            return session
+
+    def _get_boto3_client(self, boto3_session, service_name, region=None):
+        """
+        Return a boto3 client for the given session, service and region, creating it only once. Clients are
+        thread-safe, but creating them from a shared session isn't, hence the lock.
+        :return: boto3 client.
+        """
+        with self._boto3_lock:
+            clients = self._boto3_clients.setdefault(boto3_session, {})
+            boto3_client = clients.get((service_name, region))
+            if boto3_client is None:
+                if region:
+                    boto3_client = boto3_session.client(
+                        service_name, region_name=region
+                    )
+                else:
+                    boto3_client = boto3_session.client(service_name)
+                clients[(service_name, region)] = boto3_client
+            return boto3_client
 
     def _check_aws_credentials_are_valid(self, boto3_session):
         """
@@ -2925,7 +3785,7 @@ class Client:
 
         """
         try:
-            sts = boto3_session.client("sts")
+            sts = self._get_boto3_client(boto3_session, "sts")
             sts.get_caller_identity()
         except Exception as e:
             self._logger.exception(f"boto3 session is invalid: {e}")
@@ -2944,21 +3804,18 @@ class Client:
 
     def _check_boto3_installation(self):
         """
-        Check if boto3 is installed in the current environment. If not, raises ImportError.
+        Check if boto3 is installed in the current environment. If not, raises ImportError. boto3 is imported only
+        once; later calls get the module already loaded in sys.modules.
         :return: boto3 module if present.
         """
         package_name = "boto3"
-        spec = find_spec(package_name)
-        if spec is None:
+        try:
+            return import_module(package_name)
+        except ImportError:
             raise ImportError(
                 f"{package_name} not present. {package_name} is required to perform AWS onboard."
             )
 
-        module = module_from_spec(spec)
-        sys.modules[package_name] = module
-        spec.loader.exec_module(module)
-        return module
-
     def __repr__(self):
         return (
             f"Connection(api_url='{self.api_url}', api_key='***{self._api_key[-6:]}', "
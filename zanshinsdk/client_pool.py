@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+This module keeps Client instances around for services that act on behalf of many tenants, each with its own
+configuration profile or API key. Clients are built on first use, reused afterwards, and share one connection pool.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from zanshinsdk.client import Client
+from zanshinsdk.common.instrumentation import MetricsCollector
+from zanshinsdk.common.transport import SharedTransport
+
+
+class ClientPool(object):
+    """Thread-safe pool of clients keyed by profile or API key, holding at most max_clients least recently used ones."""
+
+    def __init__(
+        self,
+        max_clients: int = 64,
+        transport: Optional[SharedTransport] = None,
+        metrics: Optional[MetricsCollector] = None,
+        **client_kwargs,
+    ):
+        """Initializes a client pool
+        :param max_clients: maximum number of clients kept, the least recently used one is closed beyond it
+        :param transport: optional transport shared by every client, a new SharedTransport owned by the pool if None
+        :param metrics: optional collector of the requests of every client, a new MetricsCollector if None
+        :param client_kwargs: other arguments passed to every Client built, e.g. api_url or user_agent
+        """
+        if max_clients < 1:
+            raise ValueError(f"{max_clients} shouldn't be lower than 1")
+        if "api_key" in client_kwargs or "profile" in client_kwargs:
+            raise ValueError("api_key and profile are given per client to get")
+        self._max_clients = max_clients
+        self._owns_transport = transport is None
+        self._transport = transport or SharedTransport()
+        self._metrics = metrics or MetricsCollector()
+        self._client_kwargs = client_kwargs
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[Tuple[str, str], Client]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_clients(self) -> int:
+        return self._max_clients
+
+    @property
+    def transport(self) -> SharedTransport:
+        return self._transport
+
+    @property
+    def metrics(self) -> MetricsCollector:
+        return self._metrics
+
+    def get(self, profile: str = "default", api_key: Optional[str] = None) -> Client:
+        """
+        Returns the client of a tenant, building it on first use.
+        :param profile: which configuration file section the client uses, ignored when api_key is given
+        :param api_key: optional API key of the tenant, takes precedence over profile
+        :return: a Client, shared by every caller asking for the same profile or API key
+        """
+        if api_key:
+            # the pool only keeps a digest of API keys, clients keep the key itself
+            key = ("api_key", hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+        else:
+            key = ("profile", profile)
+
+        evicted = []
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._hits += 1
+                self._clients.move_to_end(key)
+                return client
+            self._misses += 1
+            client = Client(
+                profile=None if api_key else profile,
+                api_key=api_key,
+                transport=self._transport,
+                instrumentations=[self._metrics],
+                **self._client_kwargs,
+            )
+            self._clients[key] = client
+            while len(self._clients) > self._max_clients:
+                evicted.append(self._clients.popitem(last=False)[1])
+                self._evictions += 1
+        # evicted clients may still be in use by other threads; closing them only drops their httpx client
+        for evicted_client in evicted:
+            evicted_client.close()
+        return client
+
+    def stats(self) -> Dict:
+        """
+        :return: a dict with the number of live clients, cache hits, misses and evictions, and the request metrics
+                 of every client, per endpoint
+        """
+        with self._lock:
+            stats = {
+                "clients": len(self._clients),
+                "maxClients": self._max_clients,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+        stats["requests"] = self._metrics.snapshot()
+        return stats
+
+    def close(self) -> None:
+        """Closes every client, and the transport if it was created by the pool."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+        if self._owns_transport:
+            self._transport.shutdown()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clients)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+This module bounds how long paginated iterations may run. A CancellationToken carries an optional time budget and can
+also be cancelled from another thread. Iterations stop before loading the next page or yielding the next item once
+their token is cancelled, raising an OperationCancelled holding the cursor the iteration can be resumed from.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, Union
+
+import httpx
+
+DEADLINE_EXCEEDED = "deadline exceeded"
+CANCELLED = "cancelled"
+
+_current_token: ContextVar[Optional["CancellationToken"]] = ContextVar(
+    "zanshinsdk_cancellation_token", default=None
+)
+
+
+class OperationCancelled(RuntimeError):
+    """Raised when an iteration is stopped by its CancellationToken."""
+
+    def __init__(self, reason: str, cursor: Optional[str] = None):
+        super(OperationCancelled, self).__init__(
+            reason if cursor is None else f"{reason}, resume from cursor {cursor}"
+        )
+        self.reason = reason
+        self.cursor = cursor
+
+
+class CancellationToken(object):
+    """
+    Tells iterations when to stop, once its time budget ran out or it was cancelled. A token can be shared by many
+    iterations, e.g. every iteration of a scheduled job.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initializes a cancellation token
+        :param timeout: optional budget in seconds, counted from now, after which the token is cancelled
+        :param clock: function returning the current time in seconds
+        """
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"{timeout} shouldn't be lower than 0")
+        self._clock = clock
+        self._deadline = None if timeout is None else clock() + timeout
+        self._reason = None
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token was cancelled or its deadline passed."""
+        if self._event.is_set():
+            return True
+        if self._deadline is not None and self._clock() >= self._deadline:
+            self.cancel(DEADLINE_EXCEEDED)
+            return True
+        return False
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why the token was cancelled, None while it isn't."""
+        return self._reason if self.cancelled else None
+
+    def remaining(self) -> Optional[float]:
+        """:return: the seconds left before the deadline, None if the token has none"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - self._clock())
+
+    def cancel(self, reason: str = CANCELLED) -> None:
+        """
+        Cancels the token, the iterations using it stop before their next page or item.
+        :param reason: why the token is cancelled, kept by the first call
+        """
+        if self._reason is None:
+            self._reason = reason
+        self._event.set()
+
+    def raise_if_cancelled(self, cursor: Optional[str] = None) -> None:
+        """
+        :param cursor: the cursor to resume from, given to the exception
+        :raise OperationCancelled: if the token is cancelled
+        """
+        if self.cancelled:
+            raise OperationCancelled(self._reason, cursor)
+
+    def request_timeout(self, timeout: httpx.Timeout) -> httpx.Timeout:
+        """
+        :param timeout: the timeout of the client
+        :return: the timeout of a request, so that it doesn't outlive the deadline
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+
+        def bound(value: Optional[float]) -> float:
+            return remaining if value is None else min(value, remaining)
+
+        return httpx.Timeout(
+            connect=bound(timeout.connect),
+            read=bound(timeout.read),
+            write=bound(timeout.write),
+            pool=bound(timeout.pool),
+        )
+
+
+def as_token(
+    deadline: Union[float, CancellationToken, None]
+) -> Optional[CancellationToken]:
+    """
+    :param deadline: a budget in seconds, a CancellationToken, or None
+    :return: the CancellationToken, a new one if a budget was given
+    """
+    if deadline is None or isinstance(deadline, CancellationToken):
+        return deadline
+    return CancellationToken(deadline)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """:return: the token of the enclosing cancellation_scope, if any"""
+    return _current_token.get()
+
+
+@contextmanager
+def cancellation_scope(token: Optional[CancellationToken]) -> Iterator[None]:
+    """
+    Makes a token apply to the requests and iterations run by the current thread within the block. Passing None keeps
+    the token of an enclosing block, if any.
+    """
+    if token is None:
+        yield
+        return
+    reset = _current_token.set(token)
+    try:
+        yield
+    finally:
+        _current_token.reset(reset)
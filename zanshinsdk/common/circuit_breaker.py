@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+This module stops sending requests to an endpoint of the API while it is failing. Each endpoint, identified by its
+method and templated path, has a circuit: once too many of its recent requests failed the circuit opens and requests
+fail right away, instead of each waiting for a timeout. After a while a few probe requests are let through, and the
+circuit closes again once they succeed.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Tuple
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request to an endpoint whose circuit is open."""
+
+    def __init__(self, route: str, retry_after: float):
+        super(CircuitOpenError, self).__init__(
+            f"circuit of {route} is open, retry in {retry_after:.1f}s"
+        )
+        self.route = route
+        self.retry_after = retry_after
+
+
+def is_failure_status(status_code: int) -> bool:
+    """Whether a response status code says the endpoint is unhealthy or overloaded."""
+    return status_code >= 500 or status_code == 429
+
+
+def is_circuit_failure(error: Exception) -> bool:
+    """Whether a request error says the endpoint is unhealthy, rather than the request being wrong."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return is_failure_status(error.response.status_code)
+    return isinstance(error, httpx.TransportError)
+
+
+class _Circuit(object):
+    __slots__ = ("state", "outcomes", "failures", "opened_at", "probes", "successes")
+
+    def __init__(self):
+        self.state = CLOSED
+        # (time, failed) of the requests in the window
+        self.outcomes: Deque[Tuple[float, bool]] = deque()
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.successes = 0
+
+
+class CircuitBreaker(object):
+    """
+    Circuits of the endpoints of the API. An instance can be shared by many clients, so that all workers talking to
+    the API stop at once when an endpoint fails.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_requests: int = 10,
+        window: float = 60,
+        open_duration: float = 30,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initializes a circuit breaker
+        :param failure_rate_threshold: share of failed requests in the window, from 0 to 1, that opens a circuit
+        :param minimum_requests: number of requests in the window below which a circuit never opens
+        :param window: seconds of requests the failure rate is computed over
+        :param open_duration: seconds an open circuit fails requests before letting probes through
+        :param half_open_probes: number of probe requests let through at once, all of which must succeed to close the
+               circuit
+        :param clock: function returning the current time in seconds
+        """
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError(f"{failure_rate_threshold} should be between 0 and 1")
+        if minimum_requests < 1:
+            raise ValueError(f"{minimum_requests} shouldn't be lower than 1")
+        if half_open_probes < 1:
+            raise ValueError(f"{half_open_probes} shouldn't be lower than 1")
+        self._failure_rate_threshold = failure_rate_threshold
+        self._minimum_requests = minimum_requests
+        self._window = window
+        self._open_duration = open_duration
+        self._half_open_probes = half_open_probes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def state(self, route: str) -> str:
+        """
+        :param route: the method and templated path of an endpoint, e.g. "GET /organizations/{id}"
+        :return: the state of the circuit of the endpoint, CLOSED, OPEN or HALF_OPEN
+        """
+        with self._lock:
+            circuit = self._circuits.get(route)
+            if circuit is None:
+                return CLOSED
+            if (
+                circuit.state == OPEN
+                and self._clock() - circuit.opened_at >= self._open_duration
+            ):
+                return HALF_OPEN
+            return circuit.state
+
+    def snapshot(self) -> Dict[str, str]:
+        """:return: the state of every endpoint whose circuit isn't closed"""
+        states = {route: self.state(route) for route in list(self._circuits)}
+        return {route: state for route, state in states.items() if state != CLOSED}
+
+    def reset(self) -> None:
+        """Closes every circuit and forgets past requests."""
+        with self._lock:
+            self._circuits.clear()
+
+    def before_request(self, route: str) -> None:
+        """
+        Called before a request is sent.
+        :param route: the method and templated path of the endpoint
+        :raise CircuitOpenError: if the circuit is open, or half open with all its probes in flight
+        """
+        with self._lock:
+            circuit = self._circuits.get(route)
+            if circuit is None:
+                circuit = self._circuits[route] = _Circuit()
+            if circuit.state == CLOSED:
+                return
+            now = self._clock()
+            if circuit.state == OPEN:
+                retry_after = circuit.opened_at + self._open_duration - now
+                if retry_after > 0:
+                    raise CircuitOpenError(route, retry_after)
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+                circuit.successes = 0
+            if circuit.probes >= self._half_open_probes:
+                raise CircuitOpenError(route, 0)
+            circuit.probes += 1
+
+    def record(self, route: str, failed: bool) -> None:
+        """
+        Called after a request completed.
+        :param route: the method and templated path of the endpoint
+        :param failed: whether the request failed in a way that counts against the endpoint
+        """
+        with self._lock:
+            circuit = self._circuits.get(route)
+            if circuit is None:
+                circuit = self._circuits[route] = _Circuit()
+            now = self._clock()
+            if circuit.state == HALF_OPEN:
+                if failed:
+                    self._open(circuit, now)
+                    return
+                circuit.successes += 1
+                if circuit.successes >= self._half_open_probes:
+                    circuit.state = CLOSED
+                    circuit.outcomes.clear()
+                    circuit.failures = 0
+                return
+            if circuit.state == OPEN:
+                # a request sent before the circuit opened
+                return
+
+            circuit.outcomes.append((now, failed))
+            circuit.failures += failed
+            while circuit.outcomes and circuit.outcomes[0][0] <= now - self._window:
+                circuit.failures -= circuit.outcomes.popleft()[1]
+            requests = len(circuit.outcomes)
+            if (
+                requests >= self._minimum_requests
+                and circuit.failures >= self._failure_rate_threshold * requests
+            ):
+                self._open(circuit, now)
+
+    def release(self, route: str) -> None:
+        """
+        Called instead of record after a request that says nothing about the endpoint, e.g. one cancelled before it
+        got an answer, so that another probe can take its place.
+        :param route: the method and templated path of the endpoint
+        """
+        with self._lock:
+            circuit = self._circuits.get(route)
+            if circuit is not None and circuit.state == HALF_OPEN and circuit.probes:
+                circuit.probes -= 1
+
+    @staticmethod
+    def _open(circuit: _Circuit, now: float) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.outcomes.clear()
+        circuit.failures = 0
+
+    def call(self, route: str, function: Callable, *args, **kwargs):
+        """
+        Calls a function sending a request, going through the circuit of its endpoint.
+        :param route: the method and templated path of the endpoint
+        :param function: the function sending the request
+        :return: what the function returned; responses with a 5xx or 429 status code count as failures, only
+                 requests the endpoint answered count as successes
+        """
+        self.before_request(route)
+        # None while the request says nothing about the endpoint
+        failed = None
+        try:
+            result = function(*args, **kwargs)
+            if isinstance(result, httpx.Response):
+                failed = is_failure_status(result.status_code)
+            return result
+        except Exception as error:
+            if is_circuit_failure(error):
+                failed = True
+            elif isinstance(error, httpx.HTTPStatusError):
+                failed = False
+            raise
+        finally:
+            if failed is None:
+                self.release(route)
+            else:
+                self.record(route, failed)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+This module adapts how many requests are sent to the API at once. The limit grows by about one request per round trip
+while responses stay fast, and is cut by a ratio when the API answers with 429 or 5xx responses, times out, or when
+latency spikes well above its recent average (additive increase, multiplicative decrease). Concurrent code paths of the
+SDK thus settle at whatever concurrency the API sustains at the time, rather than at a fixed number of workers.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from zanshinsdk.common.circuit_breaker import is_circuit_failure, is_failure_status
+from zanshinsdk.common.validators import validate_int
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limits the requests in flight, adapting the limit to how the API responds. An instance can be shared by many
+    clients and threads, which then share the limit.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initializes an adaptive concurrency limiter
+        :param initial_limit: number of requests in flight allowed at first
+        :param min_limit: smallest limit
+        :param max_limit: largest limit, also the number of workers of the SDK thread pools using the limiter
+        :param backoff_ratio: ratio, between 0 and 1, the limit is multiplied by when the API is overloaded
+        :param latency_tolerance: how many times the average latency a response may take before it counts as a
+               latency spike
+        :param smoothing: weight, between 0 and 1, of each new latency in the average latency
+        :param clock: function returning the current time in seconds
+        """
+        if min_limit < 1:
+            raise ValueError(f"{min_limit} shouldn't be lower than 1")
+        if not min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                f"{initial_limit} should be between {min_limit} and {max_limit}"
+            )
+        if not 0 < backoff_ratio < 1:
+            raise ValueError(f"{backoff_ratio} should be between 0 and 1")
+        if latency_tolerance <= 1:
+            raise ValueError(f"{latency_tolerance} should be greater than 1")
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"{smoothing} should be between 0 and 1")
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._backoff_ratio = backoff_ratio
+        self._latency_tolerance = latency_tolerance
+        self._smoothing = smoothing
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._latency = None
+        self._last_decrease = float("-inf")
+        self._requests = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """The number of requests allowed in flight at once."""
+        return int(self._limit)
+
+    @property
+    def max_limit(self) -> int:
+        return self._max_limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def stats(self) -> Dict:
+        """The current limit, requests in flight, average latency, requests completed and times the limit was cut."""
+        with self._condition:
+            return {
+                "limit": int(self._limit),
+                "inFlight": self._in_flight,
+                "latency": self._latency,
+                "requests": self._requests,
+                "decreases": self._decreases,
+            }
+
+    def acquire(self) -> float:
+        """
+        Waits until a request can be sent.
+        :return: the time the request started, to give to release
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            return self._clock()
+
+    def release(
+        self, started: float, overloaded: bool = False, latency: Optional[float] = None
+    ) -> None:
+        """
+        Called once a request sent after acquire completed, adjusting the limit.
+        :param started: the time returned by acquire
+        :param overloaded: whether the API answered with a 429 or 5xx response, or didn't answer in time
+        :param latency: the seconds the request took, None if it says nothing about the API, e.g. a client error
+        """
+        with self._condition:
+            saturated = self._in_flight * 2 >= self._limit
+            self._in_flight -= 1
+            self._requests += 1
+            if not overloaded and latency is not None:
+                overloaded = (
+                    self._latency is not None
+                    and latency > self._latency * self._latency_tolerance
+                )
+                if self._latency is None:
+                    self._latency = latency
+                else:
+                    self._latency += self._smoothing * (latency - self._latency)
+            if overloaded:
+                # requests sent before the last cut saw the old limit, they don't cut it again
+                if started >= self._last_decrease and self._limit > self._min_limit:
+                    self._limit = max(
+                        float(self._min_limit), self._limit * self._backoff_ratio
+                    )
+                    self._last_decrease = self._clock()
+                    self._decreases += 1
+            elif latency is not None and saturated:
+                # about one more request per round trip of the whole limit
+                self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def call(self, function: Callable, *args, **kwargs):
+        """
+        Calls a function sending a request once the limit allows it.
+        :param function: the function sending the request
+        :return: what the function returned; responses with a 5xx or 429 status code count as overloads
+        """
+        return self._measure(self.acquire(), function, *args, **kwargs)
+
+    def observe(self, function: Callable, *args, **kwargs):
+        """
+        Calls a function sending a request admitted by another gate, e.g. a RequestScheduler following this limiter,
+        adjusting the limit to its outcome without waiting for the limit.
+        :param function: the function sending the request
+        :return: what the function returned; responses with a 5xx or 429 status code count as overloads
+        """
+        with self._condition:
+            self._in_flight += 1
+            started = self._clock()
+        return self._measure(started, function, *args, **kwargs)
+
+    def _measure(self, started: float, function: Callable, *args, **kwargs):
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            if is_circuit_failure(error):
+                self.release(started, overloaded=True)
+            else:
+                self.release(started)
+            raise
+        self.release(
+            started,
+            overloaded=isinstance(result, httpx.Response)
+            and is_failure_status(result.status_code),
+            latency=self._clock() - started,
+        )
+        return result
+
+
+def worker_count(client, max_workers: Optional[int], default: int) -> int:
+    """
+    The number of workers of a thread pool sending requests through a client. Without an explicit number, a pool
+    using a concurrency limiter has as many workers as the limit can grow to, leaving the limiter to decide how many
+    of them send requests at once.
+    :param client: the zanshinsdk.Client the workers use
+    :param max_workers: the number of workers asked for, if any
+    :param default: the number of workers of a client without concurrency limiter
+    :return: the number of workers
+    """
+    if max_workers is not None:
+        return validate_int(max_workers, min_value=1, required=True)
+    limiter = getattr(client, "concurrency_limiter", None)
+    if isinstance(limiter, AdaptiveConcurrencyLimiter):
+        return limiter.max_limit
+    return default
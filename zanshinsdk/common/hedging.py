@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+This module hedges read requests to cut tail latency. When a read request takes longer than most requests to the same
+endpoint did, a duplicate is sent and whichever response arrives first is used. Since a few slow requests are usually
+caused by one slow server or connection rather than by the query itself, the duplicate tends to come back quickly,
+and the cost is a small share of extra requests.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _close_response(future: Future) -> None:
+    """Releases the response of a request that lost the race, whenever it arrives."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class HedgingPolicy(object):
+    """
+    Decides when to hedge read requests and sends the duplicates. An instance can be shared by many clients, which
+    then share the latencies observed and the threads sending requests.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        max_delay: float = 10.0,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 16,
+    ):
+        """Initializes a hedging policy
+        :param percentile: percentile of the latencies of an endpoint after which a duplicate request is sent
+        :param initial_delay: seconds after which a duplicate is sent while fewer than min_samples were observed
+        :param min_delay: smallest delay before a duplicate is sent
+        :param max_delay: largest delay before a duplicate is sent
+        :param min_samples: number of latencies of an endpoint needed before its percentile is used
+        :param window: number of latest latencies of each endpoint the percentile is computed over
+        :param max_workers: maximum number of requests in flight at once, duplicates included
+        """
+        if not 0 < percentile < 100:
+            raise ValueError(f"{percentile} should be between 0 and 100")
+        if min_samples < 1 or window < min_samples:
+            raise ValueError(
+                f"window ({window}) shouldn't be lower than min_samples ({min_samples}), nor min_samples than 1"
+            )
+        self._percentile = percentile
+        self._initial_delay = initial_delay
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._min_samples = min_samples
+        self._window = window
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._executor = None
+        self._requests = 0
+        self._hedges = 0
+        self._hedges_won = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of requests sent through the policy, of duplicates sent, and of duplicates that came back first."""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedges": self._hedges,
+                "hedgesWon": self._hedges_won,
+            }
+
+    def delay(self, route: str) -> float:
+        """
+        :param route: the method and templated path of an endpoint
+        :return: the seconds to wait for a response of the endpoint before sending a duplicate request
+        """
+        with self._lock:
+            latencies = self._latencies.get(route)
+            if latencies is None or len(latencies) < self._min_samples:
+                delay = self._initial_delay
+            else:
+                ordered = sorted(latencies)
+                index = min(
+                    len(ordered) - 1, int(len(ordered) * self._percentile / 100)
+                )
+                delay = ordered[index]
+        return max(self._min_delay, min(self._max_delay, delay))
+
+    def record(self, route: str, latency: float) -> None:
+        """Adds the latency of a response of an endpoint."""
+        with self._lock:
+            latencies = self._latencies.get(route)
+            if latencies is None:
+                latencies = self._latencies[route] = deque(maxlen=self._window)
+            latencies.append(latency)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="zanshinsdk-hedging",
+                    )
+        return self._executor
+
+    def _timed(self, route: str, send: Callable[[], httpx.Response]):
+        started = time.perf_counter()
+        response = send()
+        self.record(route, time.perf_counter() - started)
+        return response
+
+    def run(self, route: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Sends a request, and a duplicate if it is slow to respond.
+        :param route: the method and templated path of the endpoint
+        :param send: function sending the request, called again for the duplicate
+        :return: the first response received; if one of the two requests fails, the response of the other
+        """
+        executor = self._get_executor()
+        with self._lock:
+            self._requests += 1
+        primary = executor.submit(self._timed, route, send)
+        delay = self.delay(route)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        with self._lock:
+            self._hedges += 1
+        logger.debug("Hedging %s after %.3fs", route, delay)
+        hedge = executor.submit(self._timed, route, send)
+        pending = {primary, hedge}
+        error = None
+        fallback = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    if error is None or future is primary:
+                        error = future.exception()
+                    continue
+                if pending and future.result().status_code >= 500:
+                    # a server error only wins if the other request fails too
+                    fallback = future
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._hedges_won += 1
+                # sync requests can't be interrupted, the other one is left to finish and its response discarded
+                for other in pending:
+                    if not other.cancel():
+                        other.add_done_callback(_close_response)
+                return future.result()
+        if fallback is not None:
+            return fallback.result()
+        raise error
+
+    def close(self) -> None:
+        """Stops the threads sending requests, once the requests in flight are done."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+This module implements a small HTTP validator cache used by the Client to issue conditional GET requests. Responses
+that carry an ETag or Last-Modified header are stored along with their bodies, and subsequent requests to the same URL
+send If-None-Match / If-Modified-Since so that the API can answer with 304 Not Modified.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from os.path import isfile
+from typing import Dict, Optional
+
+import httpx
+
+# Only these headers are kept with a cached body; transfer related headers such as Content-Encoding and
+# Content-Length describe the original wire format and would be wrong for the decoded body we store.
+CACHED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+class HttpCacheEntry(object):
+    """Class that encapsulates a cached response body along with the validators needed to revalidate it."""
+
+    def __init__(
+        self,
+        content: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Initializes a cache entry
+        :param content: the decoded response body
+        :param etag: the value of the ETag header of the cached response, if any
+        :param last_modified: the value of the Last-Modified header of the cached response, if any
+        :param headers: other headers of the cached response to restore when it is served from cache
+        """
+        self._content = content
+        self._etag = etag
+        self._last_modified = last_modified
+        self._headers = headers or {}
+
+    @property
+    def content(self) -> bytes:
+        return self._content
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self._etag
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self._last_modified
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self._headers
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> Optional["HttpCacheEntry"]:
+        """
+        Builds a cache entry out of a response, if the response can be revalidated later on.
+        :param response: a successful httpx response
+        :return: a new entry, or None if the response has neither an ETag nor a Last-Modified header
+        """
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if not etag and not last_modified:
+            return None
+        if "no-store" in response.headers.get("cache-control", "").lower():
+            return None
+        headers = {
+            name: response.headers[name]
+            for name in CACHED_HEADERS
+            if name in response.headers
+        }
+        return cls(
+            content=response.content,
+            etag=etag,
+            last_modified=last_modified,
+            headers=headers,
+        )
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Returns the conditional request headers that revalidate this entry.
+        """
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        """
+        Rebuilds the cached response so callers can use it exactly like a fresh 200 response.
+        :param request: the request that was answered with 304 Not Modified
+        """
+        return httpx.Response(
+            status_code=200,
+            headers=self._headers,
+            content=self._content,
+            request=request,
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "content": base64.b64encode(self._content).decode("ascii"),
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "headers": self._headers,
+        }
+
+    @classmethod
+    def from_dict(cls, value: Dict) -> "HttpCacheEntry":
+        return cls(
+            content=base64.b64decode(value["content"]),
+            etag=value.get("etag"),
+            last_modified=value.get("last_modified"),
+            headers=value.get("headers"),
+        )
+
+
+class AbstractHttpCache(object):
+    """Abstract class for the storage used by the Client to keep cached responses."""
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[HttpCacheEntry]:
+        """Abstract method that returns the entry stored under key, or None."""
+
+    @abstractmethod
+    def set(self, key: str, entry: HttpCacheEntry) -> None:
+        """Abstract method that stores an entry under key, replacing any previous one."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Abstract method that removes the entry stored under key, if any."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Abstract method that removes every entry from the cache."""
+
+
+class InMemoryHttpCache(AbstractHttpCache):
+    """Keeps cached responses in process memory, evicting the least recently used ones past max_entries."""
+
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError(f"{max_entries} shouldn't be lower than 1")
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[HttpCacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: HttpCacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileHttpCache(AbstractHttpCache):
+    """Keeps cached responses as JSON files inside a directory, so they survive across processes."""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def _filename(self, key: str) -> str:
+        return os.path.join(
+            self._directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+        )
+
+    def get(self, key: str) -> Optional[HttpCacheEntry]:
+        filename = self._filename(key)
+        if not isfile(filename):
+            return None
+        try:
+            with open(filename, "r") as f:
+                return HttpCacheEntry.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, entry: HttpCacheEntry) -> None:
+        filename = self._filename(key)
+        # write to a temporary file first so concurrent readers never see a partial entry
+        temporary = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(entry.to_dict(), f)
+        os.replace(temporary, filename)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._filename(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self._directory):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self._directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+def http_cache_key(api_key: str, method: str, url: str, params=None) -> str:
+    """
+    Builds the key under which a response is cached. The API key is part of the key, hashed, because the same URL
+    returns different data to different users.
+    """
+    owner = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    request_url = httpx.URL(url, params=params) if params else httpx.URL(url)
+    return f"{owner} {method.upper()} {request_url}"
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the hooks the Client calls around every API request, and a collector that keeps per endpoint
+latency histograms and error counters in process memory. Endpoints are identified by their templated path, e.g.
+/organizations/{id}/alerts, so that requests to the same endpoint are aggregated regardless of the IDs involved.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence, Tuple
+
+# upper bounds, in seconds, of the latency histogram buckets; slower requests go to an extra overflow bucket
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+class RequestEvent(object):
+    """Class that describes an API request, passed to instrumentation hooks when it starts and when it ends."""
+
+    def __init__(self, method: str, path: str, url: str):
+        """Initializes a request event
+        :param method: the HTTP method of the request
+        :param path: the templated path of the request, e.g. /organizations/{id}/alerts
+        :param url: the actual URL of the request, without query parameters
+        """
+        self.method = method.upper()
+        self.path = path
+        self.url = url
+        # filled in when the request ends
+        self.status_code: Optional[int] = None
+        self.request_bytes: int = 0
+        self.response_bytes: int = 0
+        self.duration: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        # where the response came from: network, or response_cache when no request was sent at all
+        self.source: str = "network"
+
+    @property
+    def failed(self) -> bool:
+        """Whether the request raised an exception or the API answered with an error status."""
+        return self.error is not None or (
+            self.status_code is not None and self.status_code >= 400
+        )
+
+    def __repr__(self):
+        return (
+            f"RequestEvent({self.method} {self.path}, status_code={self.status_code}, "
+            f"duration={self.duration})"
+        )
+
+
+class AbstractInstrumentation(object):
+    """
+    Base class of the objects notified by the Client around every request. Subclasses override the hooks they need;
+    hooks are called synchronously in the thread performing the request, so they should be quick.
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        """Called right before a request is performed, only method, path and url are set."""
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        """Called once a request finished, successfully or not, with all the fields of the event set."""
+
+
+class EndpointMetrics(object):
+    """Class that accumulates the latencies, sizes and errors of the requests made to one endpoint."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self._buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self._buckets) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_duration = 0.0
+        self.min_duration: Optional[float] = None
+        self.max_duration: Optional[float] = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status_codes: Dict[int, int] = {}
+
+    @property
+    def buckets(self) -> Tuple[float, ...]:
+        return self._buckets
+
+    @property
+    def mean_duration(self) -> Optional[float]:
+        return self.total_duration / self.count if self.count else None
+
+    def record(self, event: RequestEvent) -> None:
+        duration = event.duration or 0.0
+        self.count += 1
+        self.total_duration += duration
+        self.min_duration = (
+            duration if self.min_duration is None else min(self.min_duration, duration)
+        )
+        self.max_duration = (
+            duration if self.max_duration is None else max(self.max_duration, duration)
+        )
+        self.bucket_counts[bisect_left(self._buckets, duration)] += 1
+        self.request_bytes += event.request_bytes
+        self.response_bytes += event.response_bytes
+        if event.status_code is not None:
+            self.status_codes[event.status_code] = (
+                self.status_codes.get(event.status_code, 0) + 1
+            )
+        if event.failed:
+            self.errors += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimates a latency percentile out of the histogram, as the upper bound of the bucket it falls in.
+        :param q: the percentile, between 0 and 100
+        :return: the estimated latency in seconds, or None if nothing was recorded
+        """
+        if not 0 <= q <= 100:
+            raise ValueError(f"{q} should be between 0 and 100")
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                if index < len(self._buckets):
+                    return min(self._buckets[index], self.max_duration)
+                return self.max_duration
+        return self.max_duration
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "totalDuration": self.total_duration,
+            "meanDuration": self.mean_duration,
+            "minDuration": self.min_duration,
+            "maxDuration": self.max_duration,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "requestBytes": self.request_bytes,
+            "responseBytes": self.response_bytes,
+            "statusCodes": dict(self.status_codes),
+            "histogram": {
+                **{
+                    str(bound): count
+                    for bound, count in zip(self._buckets, self.bucket_counts)
+                },
+                "+Inf": self.bucket_counts[-1],
+            },
+        }
+
+
+class MetricsCollector(AbstractInstrumentation):
+    """Instrumentation that keeps latency histograms and error counters per endpoint, in process memory."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """Initializes a metrics collector
+        :param buckets: increasing upper bounds, in seconds, of the latency histogram buckets
+        """
+        buckets = tuple(buckets)
+        if not buckets or any(
+            lower >= upper for lower, upper in zip(buckets, buckets[1:])
+        ):
+            raise ValueError(f"{buckets} should be a non empty increasing sequence")
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        key = (event.method, event.path)
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = EndpointMetrics(self._buckets)
+            metrics.record(event)
+
+    def get(self, method: str, path: str) -> Optional[EndpointMetrics]:
+        """
+        :param method: the HTTP method of the endpoint
+        :param path: the templated path of the endpoint, e.g. /organizations/{id}/alerts
+        :return: the metrics of the endpoint, or None if it wasn't requested
+        """
+        with self._lock:
+            return self._endpoints.get((method.upper(), path))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Returns the metrics of every endpoint requested so far, keyed by "METHOD path" and ordered by decreasing
+        total duration, so the endpoints that dominate the runtime come first.
+        """
+        with self._lock:
+            items = [
+                (f"{method} {path}", metrics.to_dict())
+                for (method, path), metrics in self._endpoints.items()
+            ]
+        items.sort(key=lambda item: item[1]["totalDuration"], reverse=True)
+        return dict(items)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
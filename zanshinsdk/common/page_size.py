@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+This module tunes the page size of cursor paginated iterators while they run. The time taken and bytes returned by
+each page are measured, and the page size grows or shrinks toward a target page latency, within bounds. Timeouts and
+server errors halve the page size and retry the same page, so organizations with large alerts still get through.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+from zanshinsdk.common.cancellation import current_token
+
+_response_bytes: ContextVar[Optional[List[int]]] = ContextVar(
+    "zanshinsdk_response_bytes", default=None
+)
+
+
+def record_response(response: httpx.Response) -> None:
+    """Called by the client with every response, counts its bytes if a page is being measured."""
+    sizes = _response_bytes.get()
+    if sizes is not None:
+        sizes.append(len(response.content))
+
+
+@contextmanager
+def count_response_bytes() -> Iterator[List[int]]:
+    """
+    Counts the bytes of the responses received by the current thread within the block.
+    :return: the list the size of each response is appended to, also added to the list of an enclosing block
+    """
+    outer = _response_bytes.get()
+    sizes = []
+    token = _response_bytes.set(sizes)
+    try:
+        yield sizes
+    finally:
+        _response_bytes.reset(token)
+        if outer is not None:
+            outer.extend(sizes)
+
+
+def is_retryable_page_error(error: Exception) -> bool:
+    """Whether a page request failed in a way that a smaller page might avoid."""
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    return (
+        isinstance(error, httpx.HTTPStatusError) and error.response.status_code >= 500
+    )
+
+
+class AdaptivePageSize(object):
+    """
+    Page size controller, passed as the page_size of a cursor paginated iterator, e.g. Client.iter_alerts. An instance
+    can be reused across iterations and threads, so that what was learned about an organization carries over.
+    """
+
+    def __init__(
+        self,
+        initial: int = 100,
+        min_size: int = 10,
+        max_size: int = 1000,
+        target_latency: float = 2.0,
+        max_page_bytes: Optional[int] = None,
+        max_retries: int = 3,
+    ):
+        """Initializes an adaptive page size
+        :param initial: page size of the first page
+        :param min_size: smallest page size used
+        :param max_size: largest page size used
+        :param target_latency: seconds a page should take to load
+        :param max_page_bytes: optional cap on the size of response bodies, based on the bytes per item seen so far
+        :param max_retries: how many times a page is retried, with half its size, after a timeout or server error
+        """
+        if min_size < 1:
+            raise ValueError(f"{min_size} shouldn't be lower than 1")
+        if not min_size <= initial <= max_size:
+            raise ValueError(f"{initial} should be between {min_size} and {max_size}")
+        if target_latency <= 0:
+            raise ValueError(f"{target_latency} should be positive")
+        self._size = initial
+        self._min_size = min_size
+        self._max_size = max_size
+        self._target_latency = target_latency
+        self._max_page_bytes = max_page_bytes
+        self._max_retries = max_retries
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """The page size of the next page."""
+        return self._size
+
+    def _clamp(self, size: float) -> int:
+        return max(self._min_size, min(self._max_size, int(size)))
+
+    def record(
+        self, items: int, duration: float, response_bytes: Optional[int] = None
+    ) -> int:
+        """
+        Adjusts the page size after a page loaded.
+        :param items: the number of items in the page
+        :param duration: the seconds the page took to load
+        :param response_bytes: optional size of the response body
+        :return: the page size of the next page
+        """
+        with self._lock:
+            size = self._size
+            # latency barely depends on the page size for small pages, so don't move more than 2x at a time
+            ratio = max(0.5, min(2.0, self._target_latency / max(duration, 1e-3)))
+            if ratio > 1 and items < size:
+                # a short page says nothing about how larger pages would do
+                ratio = 1
+            size = size * ratio
+            if self._max_page_bytes and response_bytes and items:
+                size = min(size, self._max_page_bytes * items / response_bytes)
+            self._size = self._clamp(size)
+            return self._size
+
+    def record_failure(self) -> int:
+        """
+        Halves the page size after a timeout or server error.
+        :return: the page size of the next page
+        """
+        with self._lock:
+            self._size = self._clamp(self._size / 2)
+            return self._size
+
+    def load(self, load_page: Callable[[int], Dict]) -> Dict:
+        """
+        Loads a page with the current page size, adjusting it afterwards.
+        :param load_page: function loading a page given its size, returning the JSON decoded page
+        :return: the JSON decoded page
+        """
+        retries = 0
+        while True:
+            size = self._size
+            started = time.perf_counter()
+            try:
+                with count_response_bytes() as sizes:
+                    page = load_page(size)
+            except Exception as error:
+                token = current_token()
+                if (
+                    not is_retryable_page_error(error)
+                    or (token is not None and token.cancelled)
+                    or retries >= self._max_retries
+                    or size <= self._min_size
+                ):
+                    raise
+                retries += 1
+                self.record_failure()
+                continue
+            self.record(
+                len(page.get("data", [])),
+                time.perf_counter() - started,
+                sum(sizes) or None,
+            )
+            return page
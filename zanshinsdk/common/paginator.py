@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+This module holds the pagination engine behind the paginated iterators of the Client. The API paginates in three
+ways: with a cursor returned along each page, with the cursor of the last item of each page, or with page numbers and
+a total. The Paginator walks all of them the same way, yielding pages with their metadata or the items themselves,
+stopping as soon as the last page is known to be reached and shrinking the last request when only a few more items
+are wanted. Given a CancellationToken, it stops before the next page or item once the token is cancelled, raising an
+OperationCancelled holding the cursor to resume from.
+"""
+import time
+from math import ceil
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from zanshinsdk.common.cancellation import (
+    CancellationToken,
+    OperationCancelled,
+    cancellation_scope,
+    current_token,
+)
+from zanshinsdk.common.page_size import AdaptivePageSize, count_response_bytes
+
+# the next cursor is the cursor field of the page
+CURSOR = "cursor"
+# the next cursor is the cursor field of the last item of the page
+ITEM_CURSOR = "item_cursor"
+# pages are numbered from 1, the first page holding the total number of items
+PAGE_NUMBER = "page_number"
+
+STYLES = (CURSOR, ITEM_CURSOR, PAGE_NUMBER)
+
+
+class Page(object):
+    """A page of items, along with how it was loaded."""
+
+    __slots__ = (
+        "items",
+        "number",
+        "page_size",
+        "cursor",
+        "next_cursor",
+        "bytes",
+        "duration",
+    )
+
+    def __init__(
+        self,
+        items: List,
+        number: int,
+        page_size: Optional[int],
+        cursor=None,
+        next_cursor=None,
+        bytes: Optional[int] = None,
+        duration: float = 0.0,
+    ):
+        """Initializes a page
+        :param items: the items of the page
+        :param number: the position of the page in the iteration, starting at 1
+        :param page_size: the page size requested
+        :param cursor: the cursor the page was requested with, None for the first page or numbered pages
+        :param next_cursor: the cursor of the following page, None if this is the last page
+        :param bytes: the size of the response bodies, None if unknown
+        :param duration: the seconds the page took to load
+        """
+        self.items = items
+        self.number = number
+        self.page_size = page_size
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.bytes = bytes
+        self.duration = duration
+
+    @property
+    def item_count(self) -> int:
+        return len(self.items)
+
+    def __repr__(self):
+        return (
+            f"Page(number={self.number}, item_count={self.item_count}, page_size={self.page_size}, "
+            f"cursor={self.cursor!r}, next_cursor={self.next_cursor!r}, bytes={self.bytes}, "
+            f"duration={self.duration:.3f})"
+        )
+
+
+class Paginator(object):
+    """Walks the pages of a paginated API operation."""
+
+    def __init__(
+        self,
+        load_page: Callable[..., Dict],
+        style: str = CURSOR,
+        page_size: Union[int, AdaptivePageSize, None] = None,
+        limit: Optional[int] = None,
+        cursor=None,
+        min_page_size: int = 1,
+        stop_on_short_page: Optional[bool] = None,
+        cancellation: Optional[CancellationToken] = None,
+    ):
+        """Initializes a paginator
+        :param load_page: function loading a page, called with page_size and either cursor or page as keyword
+               arguments, and returning the JSON decoded page
+        :param style: how pages follow each other, one of CURSOR, ITEM_CURSOR or PAGE_NUMBER
+        :param page_size: the page size, or an AdaptivePageSize tuning it for each page. Numbered pages always use
+               the same size, since page numbers depend on it.
+        :param limit: optional maximum number of items, the last request asks for no more than what is missing
+        :param cursor: optional cursor the iteration starts from
+        :param min_page_size: smallest page size the API accepts, the last request doesn't go below it
+        :param stop_on_short_page: whether a page with fewer items than requested ends the iteration, saving the
+               request that would return an empty page. Defaults to True, except for CURSOR paginated operations,
+               which tell where they end.
+        :param cancellation: optional token stopping the iteration, defaults to the token of the enclosing
+               cancellation_scope, if any
+        """
+        if style not in STYLES:
+            raise ValueError(f"{style!r} isn't one of {', '.join(STYLES)}")
+        if limit is not None and limit < 0:
+            raise ValueError(f"{limit} shouldn't be lower than 0")
+        if style == PAGE_NUMBER and isinstance(page_size, AdaptivePageSize):
+            raise TypeError("numbered pages can't change their size")
+        self._load_page = load_page
+        self._style = style
+        self._page_size = page_size
+        self._limit = limit
+        self._cursor = cursor
+        self._min_page_size = min_page_size
+        self._stop_on_short_page = (
+            style != CURSOR if stop_on_short_page is None else stop_on_short_page
+        )
+        self._cancellation = cancellation
+        self._resume_cursor = cursor
+
+    @property
+    def style(self) -> str:
+        return self._style
+
+    @property
+    def limit(self) -> Optional[int]:
+        return self._limit
+
+    @property
+    def cursor(self):
+        """
+        The cursor an interrupted iteration can be resumed from: the cursor of the last item yielded for ITEM_CURSOR
+        paginated operations, and of the first page not entirely consumed for CURSOR ones. Always None for numbered
+        pages.
+        """
+        return self._resume_cursor
+
+    def _check_cancelled(self, token: Optional[CancellationToken]) -> None:
+        if token is not None:
+            token.raise_if_cancelled(self._resume_cursor)
+
+    def _request_size(self, remaining: Optional[int]) -> Optional[int]:
+        """The page size of the next request, no more than the items still wanted."""
+        size = self._page_size
+        if isinstance(size, AdaptivePageSize):
+            size = size.size
+        if remaining is None or self._style == PAGE_NUMBER:
+            return size
+        if size is None or remaining < size:
+            return max(remaining, self._min_page_size)
+        return size
+
+    def _load(self, size: Optional[int], remaining: Optional[int], **kwargs):
+        """Loads a page, returning it along with the page size it was requested with."""
+        if not isinstance(self._page_size, AdaptivePageSize):
+            return self._load_page(page_size=size, **kwargs), size
+
+        requested = []
+        cap = None if remaining is None else max(remaining, self._min_page_size)
+
+        def load_page(adaptive_size):
+            requested.append(adaptive_size if cap is None else min(adaptive_size, cap))
+            return self._load_page(page_size=requested[-1], **kwargs)
+
+        # the controller retries with smaller pages on timeouts, the last size requested is the one that worked
+        return self._page_size.load(load_page), requested[-1]
+
+    def iter_pages(self) -> Iterator[Page]:
+        """
+        Iterates over the pages, loading each one when the previous one was consumed.
+        :return: an iterator over the pages, the items of the last one cut at the limit
+        """
+        token = self._cancellation or current_token()
+        remaining = self._limit
+        cursor = self._cursor
+        number = 0
+        total_pages = None
+        while remaining is None or remaining > 0:
+            self._check_cancelled(token)
+            number += 1
+            size = self._request_size(remaining)
+            if self._style == PAGE_NUMBER:
+                kwargs = {"page": number}
+            else:
+                kwargs = {"cursor": cursor}
+            started = time.perf_counter()
+            try:
+                with cancellation_scope(token), count_response_bytes() as sizes:
+                    page, requested = self._load(size, remaining, **kwargs)
+            except Exception as error:
+                # a request cut short by the deadline fails with a timeout, rather than OperationCancelled
+                if token is not None and token.cancelled:
+                    raise OperationCancelled(
+                        token.reason, self._resume_cursor
+                    ) from error
+                raise
+            duration = time.perf_counter() - started
+            items = page.get("data", [])
+
+            if self._style == CURSOR:
+                next_cursor = page.get("cursor")
+                last = not next_cursor
+            elif self._style == ITEM_CURSOR:
+                next_cursor = items[-1]["cursor"] if items else None
+                last = not items
+            else:
+                if number == 1 and page.get("total") is not None and size:
+                    total_pages = int(ceil(page["total"] / float(size)))
+                next_cursor = None
+                last = not items or (total_pages is not None and number >= total_pages)
+            if (
+                not last
+                and self._stop_on_short_page
+                and requested
+                and len(items) < requested
+            ):
+                last = True
+
+            if remaining is not None:
+                if len(items) >= remaining:
+                    items = items[:remaining]
+                    last = True
+                remaining -= len(items)
+            yield Page(
+                items,
+                number,
+                requested,
+                cursor=kwargs.get("cursor"),
+                next_cursor=None if last else next_cursor,
+                bytes=sum(sizes) if sizes else None,
+                duration=duration,
+            )
+            if last:
+                return
+            cursor = next_cursor
+            if self._style != PAGE_NUMBER:
+                self._resume_cursor = cursor
+
+    def __iter__(self) -> Iterator:
+        token = self._cancellation or current_token()
+        for page in self.iter_pages():
+            for item in page.items:
+                self._check_cancelled(token)
+                yield item
+                if self._style == ITEM_CURSOR:
+                    self._resume_cursor = item["cursor"]
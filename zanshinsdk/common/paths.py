@@ -0,0 +1,132 @@
+import re
+from typing import Dict, List, Optional
+
+UUID_SEGMENT = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+
+# POST endpoints that only query data. They are safe to cache or repeat, just like GET requests.
+READ_ONLY_POST_PATHS = frozenset(
+    [
+        "/organizations/{id}/alerts",
+        "/organizations/{id}/alerts/rules",
+        "/organizations/{id}/followings/alerts",
+        "/organizations/{id}/followings/alerts/rules",
+        "/organizations/{id}/summaries/scantargets/details",
+        "/organizations/{id}/followings/summaries/scantargets/details",
+        "/alerts/history",
+        "/alerts/history/following",
+    ]
+)
+
+
+# routes of the API, in which {id} and {email} stand for the segments identifying an entity. IDs are templated by
+# their position in a route, so that those that don't look like UUIDs, e.g. scan IDs, don't make a route per entity.
+ROUTES = (
+    "/alerts/history",
+    "/alerts/history/following",
+    "/alerts/{id}",
+    "/alerts/{id}/comments",
+    "/alerts/{id}/history",
+    "/gworkspace/oauth/link",
+    "/me",
+    "/me/apikeys",
+    "/me/apikeys/{id}",
+    "/me/invites",
+    "/me/invites/{id}",
+    "/me/invites/{id}/accept",
+    "/oauth/link",
+    "/organizations",
+    "/organizations/{id}",
+    "/organizations/{id}/alerts",
+    "/organizations/{id}/alerts/rules",
+    "/organizations/{id}/alerts/status/batch",
+    "/organizations/{id}/followers",
+    "/organizations/{id}/followers/requests",
+    "/organizations/{id}/followers/requests/{id}",
+    "/organizations/{id}/followers/{id}",
+    "/organizations/{id}/following",
+    "/organizations/{id}/following/requests",
+    "/organizations/{id}/following/requests/{id}",
+    "/organizations/{id}/following/requests/{id}/accept",
+    "/organizations/{id}/following/requests/{id}/decline",
+    "/organizations/{id}/following/{id}",
+    "/organizations/{id}/followings/alerts",
+    "/organizations/{id}/followings/alerts/rules",
+    "/organizations/{id}/followings/summaries/scantargets/details",
+    "/organizations/{id}/invites",
+    "/organizations/{id}/invites/{email}",
+    "/organizations/{id}/invites/{email}/resend",
+    "/organizations/{id}/members",
+    "/organizations/{id}/members/{id}",
+    "/organizations/{id}/members/{id}/mfa/reset",
+    "/organizations/{id}/members/{id}/password/reset",
+    "/organizations/{id}/scantargetgroups",
+    "/organizations/{id}/scantargetgroups/{id}",
+    "/organizations/{id}/scantargetgroups/{id}/scantargets",
+    "/organizations/{id}/scantargetgroups/{id}/scripts",
+    "/organizations/{id}/scantargetgroups/{id}/targets",
+    "/organizations/{id}/scantargets",
+    "/organizations/{id}/scantargets/{id}",
+    "/organizations/{id}/scantargets/{id}/alerts/{id}",
+    "/organizations/{id}/scantargets/{id}/alerts/{id}/comments",
+    "/organizations/{id}/scantargets/{id}/check",
+    "/organizations/{id}/scantargets/{id}/scan",
+    "/organizations/{id}/scantargets/{id}/scans",
+    "/organizations/{id}/scantargets/{id}/scans/{id}",
+    "/organizations/{id}/scantargets/{id}/stop",
+    "/organizations/{id}/summaries",
+    "/organizations/{id}/summaries/scantargets/details",
+)
+
+_ROUTES_BY_LENGTH: Dict[int, List[List[str]]] = {}
+for _route in ROUTES:
+    _ROUTES_BY_LENGTH.setdefault(_route.count("/"), []).append(_route.split("/"))
+
+
+def _route_of(segments: List[str]) -> Optional[List[str]]:
+    """The route matching the segments of a path, the one with the most literal segments if many match."""
+    best, best_literals = None, -1
+    for route in _ROUTES_BY_LENGTH.get(len(segments) - 1, ()):
+        literals = 0
+        for segment, expected in zip(segments, route):
+            if expected.startswith("{"):
+                continue
+            if segment != expected:
+                break
+            literals += 1
+        else:
+            if literals > best_literals:
+                best, best_literals = route, literals
+    return best
+
+
+def templated_path(path: str) -> str:
+    """
+    Returns the path with its variable segments replaced by placeholders, e.g. /organizations/{id}/alerts, so that
+    requests to the same endpoint can be grouped together.
+    """
+    path = path.split("?", 1)[0]
+    route = _route_of(path.split("/"))
+    if route is not None:
+        return "/".join(route)
+    # a path outside the known routes, only segments that look like IDs can be told apart
+    segments = []
+    for segment in path.split("/"):
+        if UUID_SEGMENT.match(segment):
+            segments.append("{id}")
+        elif "@" in segment:
+            segments.append("{email}")
+        else:
+            segments.append(segment)
+    return "/".join(segments)
+
+
+def is_read_only_request(method: str, path: str) -> bool:
+    """
+    Whether a request only reads data, either because it is a GET or because it is one of the POST list queries.
+    """
+    method = method.upper()
+    if method in ("GET", "HEAD"):
+        return True
+    return method == "POST" and templated_path(path) in READ_ONLY_POST_PATHS
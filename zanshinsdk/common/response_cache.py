@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+This module implements a persistent response cache stored in a SQLite file. Unlike the HTTP validator cache, it does
+not talk to the API at all while an entry is fresh, which makes repeated analysis of the same data work offline.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+
+
+class CachedResponse(object):
+    """Class that encapsulates a response body stored in the response cache."""
+
+    def __init__(self, content: bytes, headers: Optional[Dict[str, str]] = None):
+        self._content = content
+        self._headers = headers or {}
+
+    @property
+    def content(self) -> bytes:
+        return self._content
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self._headers
+
+    def to_response(self, method: str, url: str, params=None) -> httpx.Response:
+        """
+        Rebuilds the cached response so callers can use it exactly like a fresh one.
+        """
+        return httpx.Response(
+            status_code=200,
+            headers=self._headers,
+            content=self._content,
+            request=httpx.Request(method, url, params=params),
+        )
+
+
+class DiskResponseCache(object):
+    """Stores responses in a SQLite file with a time to live, a size limit and least recently used eviction."""
+
+    def __init__(
+        self,
+        filename: str,
+        ttl: float = 3600,
+        max_size: int = 256 * 1024 * 1024,
+        clock=time.time,
+    ):
+        """Initializes a response cache
+        :param filename: path of the SQLite file holding the cache, created if missing
+        :param ttl: number of seconds an entry is served before it is fetched again
+        :param max_size: maximum number of body bytes kept in the cache
+        :param clock: function returning the current time in seconds
+        """
+        if ttl <= 0:
+            raise ValueError(f"{ttl} shouldn't be lower than or equal to 0")
+        if max_size <= 0:
+            raise ValueError(f"{max_size} shouldn't be lower than or equal to 0")
+        self._filename = filename
+        self._ttl = ttl
+        self._max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, created REAL, accessed REAL, "
+                "size INTEGER, headers TEXT, content BLOB)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+        # body bytes stored, kept up to date by every change so that set doesn't sum the whole table
+        self._total = self._stored_size()
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """Number of body bytes currently stored."""
+        with self._lock:
+            return self._stored_size()
+
+    def _stored_size(self) -> int:
+        return self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _delete(self, key: str) -> None:
+        row = self._connection.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total -= row[0]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = self._clock()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT created, headers, content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            created, headers, content = row
+            if created + self._ttl <= now:
+                self._delete(key)
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return CachedResponse(content, json.loads(headers))
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        now = self._clock()
+        size = len(value.content)
+        if size > self._max_size:
+            return
+        with self._lock, self._connection:
+            self._delete(key)
+            self._connection.execute(
+                "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, now, now, size, json.dumps(value.headers), value.content),
+            )
+            self._total += size
+            if self._total > self._max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Removes expired entries, then the least recently used ones until the cache fits in max_size."""
+        self._connection.execute(
+            "DELETE FROM responses WHERE created <= ?", (self._clock() - self._ttl,)
+        )
+        # summed again, as other processes sharing the file may have changed it
+        total = self._stored_size()
+        if total <= self._max_size:
+            self._total = total
+            return
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self._max_size:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+        self._total = total
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._delete(key)
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self._total = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+
+def response_cache_key(api_key: str, method: str, url: str, params=None, body=None):
+    """
+    Builds the key under which a response is cached, out of the method, absolute URL, parameters and a hash of the
+    body. The URL holds the API it was sent to, so clients of different APIs can share a cache file. The API key is
+    part of the key, hashed, because the same request returns different data to different users.
+    """
+    owner = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    body_hash = hashlib.sha256(
+        json.dumps(body, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    encoded_params = json.dumps(params or {}, sort_keys=True, default=str)
+    return f"{owner} {method.upper()} {url} {encoded_params} {body_hash}"
@@ -0,0 +1,72 @@
+import json
+from typing import Dict, Optional, Union
+
+from zanshinsdk.common.enums import Day, Frequency, TimeOfDay
+
+
+class ScanTargetSchedule(object):
+    """Class that encapsulates how often, and when, a scan target is scanned."""
+
+    __slots__ = ("frequency", "time_of_day", "day")
+
+    def __init__(
+        self,
+        frequency: Union[Frequency, str],
+        time_of_day: Optional[Union[TimeOfDay, str]] = TimeOfDay.NIGHT,
+        day: Optional[Union[Day, str]] = Day.SUNDAY,
+        **kwargs,
+    ):
+        """Initializes a scan target schedule
+        :param frequency: the scan frequency, as an enum or its value (e.g. "1d")
+        :param time_of_day: the period of the day scans run at, ignored by the 6 and 12 hours frequencies.
+               Also accepted as timeOfDay, the name used by the API.
+        :param day: the day of the week scans run at, only used by the weekly frequency
+        """
+        if "timeOfDay" in kwargs:
+            time_of_day = kwargs.pop("timeOfDay")
+        if kwargs:
+            raise TypeError(f"unexpected arguments: {', '.join(kwargs)}")
+        self.frequency = Frequency(frequency)
+        self.time_of_day = None if time_of_day is None else TimeOfDay(time_of_day)
+        self.day = None if day is None else Day(day)
+
+    def value(self) -> Dict[str, str]:
+        if self.frequency in (Frequency.SIX_HOURS, Frequency.TWELVE_HOURS):
+            return {"frequency": self.frequency.value}
+        if self.frequency == Frequency.WEEKLY:
+            return {
+                "frequency": self.frequency.value,
+                "timeOfDay": self.time_of_day.value,
+                "day": self.day.value,
+            }
+        return {
+            "frequency": self.frequency.value,
+            "timeOfDay": self.time_of_day.value,
+        }
+
+    def json(self) -> str:
+        return json.dumps(self.value())
+
+    def __eq__(self, other):
+        if not isinstance(other, ScanTargetSchedule):
+            return NotImplemented
+        return (self.frequency, self.time_of_day, self.day) == (
+            other.frequency,
+            other.time_of_day,
+            other.day,
+        )
+
+    def __hash__(self):
+        return hash((self.frequency, self.time_of_day, self.day))
+
+    def __repr__(self):
+        return (
+            f"ScanTargetSchedule(frequency={self.frequency}, time_of_day={self.time_of_day}, "
+            f"day={self.day})"
+        )
+
+
+DAILY = ScanTargetSchedule(frequency=Frequency.DAILY, time_of_day=TimeOfDay.NIGHT)
+WEEKLY = ScanTargetSchedule(
+    frequency=Frequency.WEEKLY, time_of_day=TimeOfDay.NIGHT, day=Day.SUNDAY
+)
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+This module schedules the requests of a client by priority, so that interactive calls don't queue behind bulk
+pagination. Each request belongs to a priority class, INTERACTIVE by default and BULK for the pages of paginated
+iterators. Waiting requests of a higher priority class always go first, and each class may only use a share of the
+concurrency, and of the request rate, so that some capacity is always left for the others.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Deque, Dict, Iterable, Iterator, Optional, Union
+
+from zanshinsdk.common.concurrency import AdaptiveConcurrencyLimiter
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+_current_priority: ContextVar[Optional[str]] = ContextVar(
+    "zanshinsdk_request_priority", default=None
+)
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """Makes the requests sent by the current thread within the block belong to the given priority class."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Optional[str]:
+    """:return: the priority class of the enclosing request_priority block, if any"""
+    return _current_priority.get()
+
+
+def with_default_priority(priority: str, function: Callable) -> Callable:
+    """
+    :return: the function, sending its requests with the given priority class unless the caller chose another one
+    """
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if _current_priority.get() is not None:
+            return function(*args, **kwargs)
+        with request_priority(priority):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+class PriorityClass(object):
+    """A class of requests sharing a priority, a share of the concurrency and a share of the request rate."""
+
+    def __init__(
+        self,
+        name: str,
+        priority: int,
+        concurrency_share: float = 1.0,
+        rate_share: float = 1.0,
+    ):
+        """Initializes a priority class
+        :param name: the name requests refer to the class with
+        :param priority: the priority of the class, lower values go first
+        :param concurrency_share: share of the maximum concurrency, from 0 to 1, the requests of the class may use
+        :param rate_share: share of the maximum request rate, from 0 to 1, the requests of the class may use
+        """
+        if not 0 < concurrency_share <= 1:
+            raise ValueError(f"{concurrency_share} should be between 0 and 1")
+        if not 0 < rate_share <= 1:
+            raise ValueError(f"{rate_share} should be between 0 and 1")
+        self.name = name
+        self.priority = priority
+        self.concurrency_share = concurrency_share
+        self.rate_share = rate_share
+
+    def __repr__(self):
+        return (
+            f"PriorityClass(name={self.name!r}, priority={self.priority}, "
+            f"concurrency_share={self.concurrency_share}, rate_share={self.rate_share})"
+        )
+
+
+DEFAULT_PRIORITY_CLASSES = (
+    PriorityClass(INTERACTIVE, 0),
+    # bulk traffic always leaves a quarter of the capacity to interactive calls
+    PriorityClass(BULK, 10, concurrency_share=0.75, rate_share=0.75),
+)
+
+
+class _ClassState(object):
+    __slots__ = ("spec", "waiting", "in_flight", "completed", "tokens", "refilled_at")
+
+    def __init__(self, spec: PriorityClass, now: float):
+        self.spec = spec
+        self.waiting: Deque[object] = deque()
+        self.in_flight = 0
+        self.completed = 0
+        self.tokens = None
+        self.refilled_at = now
+
+
+class RequestScheduler(object):
+    """
+    Admits the requests of one or many clients by priority, within a maximum concurrency and request rate.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Union[int, AdaptiveConcurrencyLimiter] = 16,
+        max_rate: Optional[float] = None,
+        classes: Iterable[PriorityClass] = DEFAULT_PRIORITY_CLASSES,
+        default_class: str = INTERACTIVE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initializes a request scheduler
+        :param max_concurrency: maximum number of requests in flight, or the AdaptiveConcurrencyLimiter of the
+               client, whose limit is then followed
+        :param max_rate: optional maximum number of requests started per second
+        :param classes: the priority classes
+        :param default_class: the class of requests sent outside of any request_priority block
+        :param clock: function returning the current time in seconds
+        """
+        if isinstance(max_concurrency, int) and max_concurrency < 1:
+            raise ValueError(f"{max_concurrency} shouldn't be lower than 1")
+        if max_rate is not None and max_rate <= 0:
+            raise ValueError(f"{max_rate} should be positive")
+        self._max_concurrency = max_concurrency
+        self._max_rate = max_rate
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._classes: Dict[str, _ClassState] = {}
+        for spec in sorted(classes, key=lambda c: c.priority):
+            self._classes[spec.name] = _ClassState(spec, clock())
+        if default_class not in self._classes:
+            raise ValueError(f"{default_class!r} isn't a priority class")
+        self._default_class = default_class
+
+    @property
+    def default_class(self) -> str:
+        return self._default_class
+
+    @property
+    def capacity(self) -> int:
+        """The number of requests allowed in flight at once."""
+        if isinstance(self._max_concurrency, AdaptiveConcurrencyLimiter):
+            return self._max_concurrency.limit
+        return self._max_concurrency
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """The requests in flight, waiting and completed of each priority class."""
+        with self._condition:
+            return {
+                name: {
+                    "inFlight": state.in_flight,
+                    "waiting": len(state.waiting),
+                    "completed": state.completed,
+                }
+                for name, state in self._classes.items()
+            }
+
+    def _refill(self, state: _ClassState, now: float) -> None:
+        rate = self._max_rate * state.spec.rate_share
+        # a second worth of requests may start at once
+        burst = max(1.0, rate)
+        if state.tokens is None:
+            state.tokens = burst
+        else:
+            state.tokens = min(burst, state.tokens + (now - state.refilled_at) * rate)
+        state.refilled_at = now
+
+    def _wait_time(self, state: _ClassState, capacity: int, now: float) -> float:
+        """The seconds before the first waiting request of a class may start, inf if it depends on other requests."""
+        if self._in_flight >= capacity or state.in_flight >= max(
+            1, int(capacity * state.spec.concurrency_share)
+        ):
+            return float("inf")
+        if self._max_rate is None:
+            return 0.0
+        self._refill(state, now)
+        if state.tokens >= 1:
+            return 0.0
+        return (1 - state.tokens) / (self._max_rate * state.spec.rate_share)
+
+    def acquire(self, priority: Optional[str] = None) -> str:
+        """
+        Waits until a request can be sent.
+        :param priority: the priority class of the request, defaults to the default class
+        :return: the priority class, to give to release
+        """
+        priority = priority or self._default_class
+        state = self._classes.get(priority)
+        if state is None:
+            raise ValueError(f"{priority!r} isn't a priority class")
+        ticket = object()
+        with self._condition:
+            state.waiting.append(ticket)
+            try:
+                while True:
+                    timeout = self._admit(state, ticket)
+                    if timeout == 0:
+                        break
+                    self._condition.wait(None if timeout == float("inf") else timeout)
+            except BaseException:
+                state.waiting.remove(ticket)
+                self._condition.notify_all()
+                raise
+            state.waiting.popleft()
+            state.in_flight += 1
+            self._in_flight += 1
+            if self._max_rate is not None:
+                state.tokens -= 1
+            # the next request of the class, or of a lower priority class, may be able to start too
+            self._condition.notify_all()
+        return priority
+
+    def _admit(self, state: _ClassState, ticket) -> float:
+        """The seconds before the request may start, 0 if it may start now."""
+        capacity = self.capacity
+        now = self._clock()
+        for other in self._classes.values():
+            if other is state:
+                break
+            # a waiting request of a higher priority class goes first, unless it can't start anyway
+            if other.waiting and self._wait_time(other, capacity, now) == 0:
+                return float("inf")
+        if state.waiting[0] is not ticket:
+            return float("inf")
+        return self._wait_time(state, capacity, now)
+
+    def release(self, priority: str) -> None:
+        """Called once a request sent after acquire completed."""
+        with self._condition:
+            state = self._classes[priority]
+            state.in_flight -= 1
+            state.completed += 1
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def call(self, priority: Optional[str], function: Callable, *args, **kwargs):
+        """
+        Calls a function sending a request once the scheduler admits it.
+        :param priority: the priority class of the request, defaults to the default class
+        :param function: the function sending the request
+        :return: what the function returned
+        """
+        priority = self.acquire(priority)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.release(priority)
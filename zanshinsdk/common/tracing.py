@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+This module wraps the methods of a Client in OpenTelemetry spans. Each public method gets a span, each API request a
+child span, and iterators a span that stays open while they are consumed, with the number of pages requested and
+items yielded as attributes. OpenTelemetry is an optional dependency: when it isn't installed nothing is wrapped, so
+tracing costs nothing.
+"""
+import inspect
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from typing import Iterator, List, Optional
+
+import httpx
+
+from zanshinsdk.common.paths import templated_path
+from zanshinsdk.version import __version__ as sdk_version
+
+TRACER_NAME = "zanshinsdk"
+
+# public methods that are not API calls, and are therefore never traced
+UNTRACED_METHODS = frozenset(
+    [
+        "add_instrumentation",
+        "remove_instrumentation",
+        "cached",
+        "uncached",
+        "enable_tracing",
+        "disable_tracing",
+        "close",
+        "iter_pages",
+        "submit",
+        "map",
+    ]
+)
+
+
+class _IteratorStats(object):
+    """Counters of the iterator span currently being advanced."""
+
+    def __init__(self):
+        self.pages = 0
+
+
+_iterator_stats: ContextVar[Optional[_IteratorStats]] = ContextVar(
+    "zanshinsdk_iterator_stats", default=None
+)
+
+
+@lru_cache(maxsize=None)
+def _load_trace():
+    """Imports the OpenTelemetry tracing API the first time it is needed, so importing the SDK doesn't pay for it."""
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace
+
+
+def is_tracing_available() -> bool:
+    """Whether OpenTelemetry is installed."""
+    return _load_trace() is not None
+
+
+def trace_client(client, tracer=None) -> List[str]:
+    """
+    Replaces, on the given instance only, every public method and _request with a traced version.
+    :param client: the zanshinsdk.Client to trace
+    :param tracer: optional OpenTelemetry tracer, defaults to the one of the global tracer provider
+    :return: the names of the wrapped attributes, empty if OpenTelemetry isn't installed
+    """
+    trace = _load_trace()
+    if trace is None:
+        return []
+    tracer = tracer or trace.get_tracer(TRACER_NAME, sdk_version)
+
+    names = []
+    for name, function in inspect.getmembers(type(client), inspect.isfunction):
+        if name.startswith("_") or name in UNTRACED_METHODS:
+            continue
+        setattr(client, name, _traced_method(tracer, name, getattr(client, name)))
+        names.append(name)
+    client._request = _traced_request(tracer, client._request)
+    names.append("_request")
+    return names
+
+
+def untrace_client(client, names: List[str]) -> None:
+    """Restores the methods replaced by trace_client."""
+    for name in names:
+        client.__dict__.pop(name, None)
+
+
+def _traced_method(tracer, name: str, method):
+    span_name = f"zanshinsdk.Client.{name}"
+
+    @wraps(method)
+    def traced(*args, **kwargs):
+        if inspect.isgeneratorfunction(method):
+            return _traced_iterator(tracer, span_name, method(*args, **kwargs))
+        with tracer.start_as_current_span(span_name):
+            return method(*args, **kwargs)
+
+    return traced
+
+
+def _traced_iterator(tracer, span_name: str, iterator: Iterator):
+    """
+    Keeps a span open while the iterator is consumed. The span is only made current while the iterator is advanced,
+    so that requests made to fetch pages are its children while the code consuming the items isn't.
+    """
+    trace = _load_trace()
+    span = tracer.start_span(span_name)
+    stats = _IteratorStats()
+    items = 0
+    try:
+        while True:
+            with trace.use_span(span, end_on_exit=False):
+                token = _iterator_stats.set(stats)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    _iterator_stats.reset(token)
+            items += 1
+            yield item
+    finally:
+        span.set_attribute("zanshin.page_count", stats.pages)
+        span.set_attribute("zanshin.item_count", items)
+        span.end()
+
+
+def _traced_request(tracer, request):
+    @wraps(request)
+    def traced(method: str, path: str, params=None, body=None) -> httpx.Response:
+        route = templated_path(path)
+        trace = _load_trace()
+        with tracer.start_as_current_span(
+            f"{method.upper()} {route}",
+            kind=trace.SpanKind.CLIENT,
+            attributes={"http.request.method": method.upper(), "url.template": route},
+        ) as span:
+            stats = _iterator_stats.get()
+            if stats is not None:
+                stats.pages += 1
+            try:
+                response = request(method, path, params=params, body=body)
+            except httpx.HTTPStatusError as error:
+                span.set_attribute(
+                    "http.response.status_code", error.response.status_code
+                )
+                raise
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    return traced
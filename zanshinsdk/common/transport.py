@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+This module lets many Client instances share TLS setup and connections. Loading the CA bundle into an SSL context is
+one of the most expensive parts of creating an httpx client, and every client otherwise keeps its own connection pool,
+so services that hold one Client per API key would see memory and connection counts grow with the number of keys.
+"""
+import os
+import ssl
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+import httpx
+
+from zanshinsdk.common.validators import validate_class
+
+_SSL_CONTEXTS: Dict[Tuple, ssl.SSLContext] = {}
+_SSL_CONTEXTS_LOCK = threading.Lock()
+
+
+def shared_ssl_context(
+    verify: Union[ssl.SSLContext, str, bool] = True
+) -> ssl.SSLContext:
+    """
+    Returns an SSL context for the given verify setting, creating it only once per process. SSL contexts are safe to
+    share between threads and connections.
+    :param verify: as per the parameter of the same name of httpx.Client; SSL contexts are returned as they are
+    :return: an SSL context
+    """
+    if isinstance(verify, ssl.SSLContext):
+        return verify
+    # httpx honors these variables when building a context, so they are part of what the context depends on
+    key = (verify, os.environ.get("SSL_CERT_FILE"), os.environ.get("SSL_CERT_DIR"))
+    context = _SSL_CONTEXTS.get(key)
+    if context is None:
+        with _SSL_CONTEXTS_LOCK:
+            context = _SSL_CONTEXTS.get(key)
+            if context is None:
+                context = _SSL_CONTEXTS[key] = httpx.create_ssl_context(verify=verify)
+    return context
+
+
+class SharedTransport(httpx.BaseTransport):
+    """
+    Connection pool meant to be shared by many Client instances, e.g. one per customer API key. Closing a Client
+    leaves the pool open for the others, and so does leaving the block of an httpx client used as a context manager;
+    call shutdown once every Client is done with the transport.
+    """
+
+    def __init__(
+        self,
+        verify: Union[ssl.SSLContext, str, bool] = True,
+        proxy: Optional[str] = None,
+        limits: httpx.Limits = httpx.Limits(
+            max_connections=100, max_keepalive_connections=20
+        ),
+        http2: bool = False,
+        retries: int = 0,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        """Initializes a shared transport
+        :param verify: how SSL connections are verified, as per the parameter of the same name of httpx.Client
+        :param proxy: optional URL of the proxy server used by every request going through this transport
+        :param limits: limits of the connection pool, shared by all clients
+        :param http2: whether to enable HTTP/2, which requires the h2 package
+        :param retries: number of retries of failed connection attempts
+        :param transport: optional transport the requests are sent through instead of a new connection pool, e.g. an
+               httpx.MockTransport in tests; the other parameters are then ignored
+        """
+        if transport is not None:
+            validate_class(transport, httpx.BaseTransport)
+            self._transport = transport
+        else:
+            self._transport = httpx.HTTPTransport(
+                verify=shared_ssl_context(verify),
+                proxy=proxy,
+                limits=limits,
+                http2=http2,
+                retries=retries,
+            )
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._closed:
+            raise RuntimeError("SharedTransport was shut down")
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        """Called by every httpx client using the transport when it is closed, the pool stays open for the others."""
+
+    def shutdown(self) -> None:
+        """Closes every pooled connection. The transport can't be used afterwards."""
+        self._closed = True
+        self._transport.close()
@@ -0,0 +1,114 @@
+import time
+from typing import Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Waiter(object):
+    """Polls for a condition with exponentially growing delays, until it is met, fails, or a deadline passes."""
+
+    def __init__(
+        self,
+        initial_delay: float = 1.0,
+        max_delay: float = 15.0,
+        multiplier: float = 2.0,
+        timeout: float = 900.0,
+        sleep: Optional[Callable[[float], None]] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        """Initializes a waiter
+        :param initial_delay: seconds to wait after the first unsuccessful poll
+        :param max_delay: maximum number of seconds between two polls
+        :param multiplier: factor applied to the delay after each unsuccessful poll
+        :param timeout: overall number of seconds after which waiting is abandoned
+        :param sleep: function used to wait, defaults to time.sleep
+        :param clock: monotonic clock used for the deadline, defaults to time.monotonic
+        """
+        if initial_delay <= 0:
+            raise ValueError(f"{initial_delay} shouldn't be lower than or equal to 0")
+        if max_delay < initial_delay:
+            raise ValueError(f"{max_delay} shouldn't be lower than {initial_delay}")
+        if multiplier < 1:
+            raise ValueError(f"{multiplier} shouldn't be lower than 1")
+        if timeout <= 0:
+            raise ValueError(f"{timeout} shouldn't be lower than or equal to 0")
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._multiplier = multiplier
+        self._timeout = timeout
+        self._sleep = sleep
+        self._clock = clock
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    def sleep(self, seconds: float) -> None:
+        (self._sleep or time.sleep)(seconds)
+
+    def delays(self) -> Iterator[float]:
+        """
+        Yields the successive delays to wait between polls. The deadline starts counting when iteration starts, and
+        the iterator is exhausted once it has passed.
+        """
+        clock = self._clock or time.monotonic
+        deadline = clock() + self._timeout
+        delay = self._initial_delay
+        while True:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                return
+            yield min(delay, remaining)
+            delay = min(delay * self._multiplier, self._max_delay)
+
+    def wait(
+        self,
+        poll: Callable[[], T],
+        is_done: Callable[[T], bool],
+        is_failed: Optional[Callable[[T], bool]] = None,
+        description: str = "condition",
+    ) -> T:
+        """
+        Calls poll until is_done returns True for its result.
+        :param poll: function returning the current state
+        :param is_done: function telling whether a state is the expected one
+        :param is_failed: optional function telling whether a state will never become the expected one
+        :param description: what is being waited for, used in error messages
+        :return: the last state returned by poll
+        :raises RuntimeError: if is_failed returns True for a state
+        :raises TimeoutError: if the timeout passes before the expected state is reached
+        """
+        delays = self.delays()
+        while True:
+            state = poll()
+            if is_done(state):
+                return state
+            if is_failed and is_failed(state):
+                raise RuntimeError(f"{description} failed: {state}")
+            delay = next(delays, None)
+            if delay is None:
+                raise TimeoutError(
+                    f"{description} not reached after {self._timeout} seconds: {state}"
+                )
+            self.sleep(delay)
+
+
+def is_stack_complete(stack_status: str) -> bool:
+    """Whether a CloudFormation stack was successfully created or updated."""
+    # a failed update rolls the stack back to its previous, working, configuration
+    return stack_status in (
+        "CREATE_COMPLETE",
+        "UPDATE_COMPLETE",
+        "IMPORT_COMPLETE",
+        "UPDATE_ROLLBACK_COMPLETE",
+    )
+
+
+def is_stack_failed(stack_status: str) -> bool:
+    """Whether a CloudFormation stack reached a state from which it will never complete on its own."""
+    # ROLLBACK_COMPLETE is where a stack whose creation failed ends up, rollbacks in progress are still polled
+    return (
+        stack_status.endswith("_FAILED")
+        or stack_status == "ROLLBACK_COMPLETE"
+        or stack_status.startswith("DELETE_")
+    )
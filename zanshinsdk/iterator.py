@@ -6,7 +6,9 @@ on new alerts, or even automating responses for some high-confidence alerts.
 from abc import ABCMeta, abstractmethod
 from typing import Dict, Iterator
 
-from zanshinsdk import Client, validate_uuid
+from zanshinsdk.client import Client
+from zanshinsdk.common.cancellation import as_token, cancellation_scope
+from zanshinsdk.common.validators import validate_uuid
 
 
 class PersistenceEntry(object):
@@ -67,7 +69,13 @@ class AbstractPersistentAlertsIterator(Iterator):
     __metaclass__ = ABCMeta
 
     def __init__(
-        self, field_name, client, organization_id, filter_ids=None, cursor=None
+        self,
+        field_name,
+        client,
+        organization_id,
+        filter_ids=None,
+        cursor=None,
+        deadline=None,
     ):
         """Initializes a persistent alert iterator
         :param field_name:
@@ -75,6 +83,8 @@ class AbstractPersistentAlertsIterator(Iterator):
         :param organization_id: a string containing an organization ID in UUID format
         :param filter_ids:
         :param cursor:
+        :param deadline: optional time budget in seconds, counted from now, or a CancellationToken. Once it runs out
+               the iterator raises OperationCancelled, and save() persists the cursor of the last alert returned
         """
 
         self._field_name = field_name
@@ -101,6 +111,7 @@ class AbstractPersistentAlertsIterator(Iterator):
         self._filter_ids = filter_ids
 
         self._cursor = cursor
+        self._cancellation = as_token(deadline)
 
         self._persistence_entry = None
         self._alerts = []
@@ -153,15 +164,16 @@ class AbstractPersistentAlertsIterator(Iterator):
         """Abstract method that saves a given organization's persistence data."""
 
     def __next__(self):
-        if not self._alerts:
-            self._alerts = self.load_alerts()
-
-        if self._alerts:
-            alert = next(self._alerts)
-            self.persistence_entry.cursor = alert["cursor"]
-            return alert
-        else:
-            raise StopIteration
+        with cancellation_scope(self._cancellation):
+            if not self._alerts:
+                self._alerts = self.load_alerts()
+
+            if self._alerts:
+                alert = next(self._alerts)
+                self.persistence_entry.cursor = alert["cursor"]
+                return alert
+            else:
+                raise StopIteration
 
     def save(self):
         self._save()
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+This module starts scans on many scan targets of an organization and waits for them to finish. Scans are launched
+with a cap on how many run at the same time, so a large organization doesn't overload the scanned clouds, and all
+running scans are polled together in batches, the interval between two batches backing off up to the maximum delay
+of the waiter. Polls bypass the caches of the client, so that finished scans are seen as soon as the API reports them.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from uuid import UUID
+
+from zanshinsdk.common.concurrency import worker_count
+from zanshinsdk.common.validators import validate_uuid
+from zanshinsdk.common.waiter import Waiter
+
+logger = logging.getLogger(__name__)
+
+SCAN_DONE_STATUSES = frozenset(["DONE"])
+SCAN_FAILED_STATUSES = frozenset(
+    ["ERROR", "FAILED", "TIMEOUT", "CANCELED", "CANCELLED", "STOPPED"]
+)
+
+
+def _scan_id(scan: Optional[Dict]) -> Optional[str]:
+    """Scans are identified by their slot, older API versions used an id."""
+    if not scan:
+        return None
+    return scan.get("slot") or scan.get("id")
+
+
+class ScanOrchestrator(object):
+    """Starts scans on many scan targets of an organization and tracks them until they finish."""
+
+    def __init__(
+        self,
+        client,
+        organization_id: Union[UUID, str],
+        max_concurrent_scans: int = 10,
+        max_workers: Optional[int] = None,
+        force: bool = False,
+        waiter: Optional[Waiter] = None,
+    ):
+        """Initializes a scan orchestrator
+        :param client: an instance of zanshinsdk.Client
+        :param organization_id: the ID of the organization the scan targets belong to
+        :param max_concurrent_scans: maximum number of scans running at the same time
+        :param max_workers: maximum number of concurrent API requests made while starting and polling scans,
+               defaults to the max_limit of the concurrency limiter of the client if it has one, 8 otherwise
+        :param force: whether to force scans on scan targets in state NEW or INVALID_CREDENTIAL
+        :param waiter: controls the delays between polls and the overall deadline, defaults to a 2 hours timeout
+        """
+        if max_concurrent_scans < 1:
+            raise ValueError(f"{max_concurrent_scans} shouldn't be lower than 1")
+        self._client = client
+        self._organization_id = validate_uuid(organization_id)
+        self._max_concurrent_scans = max_concurrent_scans
+        self._max_workers = worker_count(client, max_workers, 8)
+        self._force = force
+        self._waiter = waiter or Waiter(initial_delay=5, max_delay=60, timeout=7200)
+        self._summary = None
+
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def organization_id(self) -> str:
+        return self._organization_id
+
+    @property
+    def summary(self) -> Optional[Dict]:
+        """Summary of the last completed run, None before the first run finishes."""
+        return self._summary
+
+    def run(self, scan_target_ids: Optional[Iterable[Union[UUID, str]]] = None) -> Dict:
+        """
+        Starts scans on the given scan targets and blocks until all of them finish.
+        :param scan_target_ids: the IDs of the scan targets to scan, all scan targets of the organization if None
+        :return: the summary of the run, see iter_events
+        """
+        for _ in self.iter_events(scan_target_ids):
+            pass
+        return self._summary
+
+    def iter_events(
+        self, scan_target_ids: Optional[Iterable[Union[UUID, str]]] = None
+    ) -> Iterator[Dict]:
+        """
+        Starts scans on the given scan targets and yields one event per scan target as soon as its scan finishes.
+        Each event is a dict with the keys scanTargetId, scanId, status (DONE, FAILED or TIMED_OUT), scan and error.
+        Once iteration is over, the summary property holds a dict with the number of scan targets in each status, the
+        elapsed seconds and the list of all events.
+        :param scan_target_ids: the IDs of the scan targets to scan, all scan targets of the organization if None
+        :return: an iterator over the completion events
+        """
+        if scan_target_ids is None:
+            scan_target_ids = [
+                scan_target["id"]
+                for scan_target in self._client.iter_organization_scan_targets(
+                    self._organization_id
+                )
+            ]
+        queue = [validate_uuid(scan_target_id) for scan_target_id in scan_target_ids]
+        queue.reverse()
+
+        started_at = time.monotonic()
+        self._summary = None
+        events = []
+        running = {}
+
+        def finish(scan_target_id, status, scan=None, error=None):
+            running.pop(scan_target_id, None)
+            event = {
+                "scanTargetId": scan_target_id,
+                "scanId": _scan_id(scan),
+                "status": status,
+                "scan": scan,
+                "error": error,
+            }
+            events.append(event)
+            return event
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            delays = self._waiter.delays()
+            while queue or running:
+                launching = []
+                while queue and len(running) + len(launching) < (
+                    self._max_concurrent_scans
+                ):
+                    launching.append(queue.pop())
+                for scan_target_id, (previous, error) in zip(
+                    launching, executor.map(self._start_scan, launching)
+                ):
+                    if error is not None:
+                        yield finish(scan_target_id, "FAILED", error=error)
+                    else:
+                        running[scan_target_id] = previous
+                if not running:
+                    continue
+
+                delay = next(delays, None)
+                if delay is None:
+                    for scan_target_id in list(running) + queue[::-1]:
+                        yield finish(
+                            scan_target_id,
+                            "TIMED_OUT",
+                            error=f"Scan didn't finish in {self._waiter.timeout} seconds",
+                        )
+                    break
+                logger.debug(
+                    "Waiting %s seconds for %d running scans, %d queued",
+                    delay,
+                    len(running),
+                    len(queue),
+                )
+                self._waiter.sleep(delay)
+
+                pending = list(running.items())
+                for (scan_target_id, _), (scan, error) in zip(
+                    pending,
+                    executor.map(lambda item: self._poll_scan(*item), pending),
+                ):
+                    if error is not None:
+                        yield finish(scan_target_id, "FAILED", error=error)
+                    elif scan is None:
+                        continue
+                    elif scan.get("status") in SCAN_DONE_STATUSES:
+                        yield finish(scan_target_id, "DONE", scan)
+                    elif scan.get("status") in SCAN_FAILED_STATUSES:
+                        yield finish(
+                            scan_target_id,
+                            "FAILED",
+                            scan,
+                            f"Scan finished with status {scan['status']}",
+                        )
+
+        self._summary = self._summarize(events, time.monotonic() - started_at)
+
+    def _start_scan(self, scan_target_id: str):
+        """
+        Remembers the latest scan of a scan target, so its new scan can be told apart, then starts a new scan.
+        :return: a tuple with the ID of the previous scan and an error message, if any
+        """
+        try:
+            previous = _scan_id(self._latest_scan(scan_target_id))
+            if not self._client.start_organization_scan_target_scan(
+                self._organization_id, scan_target_id, self._force
+            ):
+                return previous, "Scan couldn't be started"
+            return previous, None
+        except Exception as error:
+            logger.warning("Failed to start scan on %s: %s", scan_target_id, error)
+            return None, str(error)
+
+    def _poll_scan(self, scan_target_id: str, previous: Optional[str]):
+        """
+        :return: a tuple with the scan started by the orchestrator, or None if it isn't listed yet, and an error
+        message, if any
+        """
+        try:
+            scan = self._latest_scan(scan_target_id)
+        except Exception as error:
+            logger.warning("Failed to poll scan on %s: %s", scan_target_id, error)
+            return None, str(error)
+        if scan is None or _scan_id(scan) == previous:
+            return None, None
+        return scan, None
+
+    def _latest_scan(self, scan_target_id: str) -> Optional[Dict]:
+        # a cached list of scans would keep showing the scan as running until the cache entry expires
+        with self._client.uncached():
+            scans = list(
+                self._client.iter_organization_scan_target_scans(
+                    self._organization_id, scan_target_id
+                )
+            )
+        if not scans:
+            return None
+        return max(scans, key=lambda scan: scan.get("createdAt") or "")
+
+    @staticmethod
+    def _summarize(events: List[Dict], elapsed: float) -> Dict:
+        summary = {"total": len(events), "DONE": 0, "FAILED": 0, "TIMED_OUT": 0}
+        for event in events:
+            summary[event["status"]] += 1
+        summary["elapsed"] = elapsed
+        summary["events"] = events
+        return summary
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+This module gathers the scan target summaries of many organizations, and of the organizations they follow, into a
+single structure. Summary requests are made concurrently, so the time taken is about that of the slowest request
+rather than the sum of all of them, and a failed request is reported without discarding the others.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Union
+from uuid import UUID
+
+from zanshinsdk.common.concurrency import worker_count
+from zanshinsdk.common.enums import AlertSeverity, ScanTargetKind
+from zanshinsdk.common.validators import validate_uuid
+
+logger = logging.getLogger(__name__)
+
+SEVERITIES = [severity.value for severity in AlertSeverity]
+
+
+def _scan_targets(summary) -> List[Dict]:
+    """
+    The scan targets of a summary, as returned by get_scan_target_detail_summary and
+    get_scan_targets_following_summary: {"data": [{"scanTargetId": ..., "kind": ..., "alerts": {"CRITICAL": ...}}]},
+    the scan targets of a following summary also holding their followingId.
+    """
+    scan_targets = summary.get("data") if isinstance(summary, dict) else None
+    if not isinstance(scan_targets, list):
+        raise ValueError(f"unexpected summary: {str(summary)[:100]}")
+    return scan_targets
+
+
+def _severity_counts(scan_target: Dict) -> Dict[str, int]:
+    """Alert counts per severity of a scan target of a summary."""
+    alerts = scan_target.get("alerts") or {}
+    return {severity: alerts[severity] for severity in SEVERITIES if severity in alerts}
+
+
+def _add_counts(totals: Dict[str, int], counts: Dict[str, int]) -> None:
+    for severity, count in counts.items():
+        totals[severity] = totals.get(severity, 0) + count
+
+
+class SummaryAggregator(object):
+    """Fetches the scan target summaries of many organizations concurrently and merges them."""
+
+    def __init__(self, client, max_workers: Optional[int] = None):
+        """Initializes a summary aggregator
+        :param client: an instance of zanshinsdk.Client
+        :param max_workers: maximum number of concurrent API requests, defaults to the max_limit of the
+               concurrency limiter of the client if it has one, 16 otherwise
+        """
+        self._client = client
+        self._max_workers = worker_count(client, max_workers, 16)
+
+    @property
+    def client(self):
+        return self._client
+
+    def run(
+        self,
+        organization_ids: Optional[Iterable[Union[UUID, str]]] = None,
+        include_following: bool = True,
+        scan_target_kinds: Optional[Iterable[Union[ScanTargetKind, str]]] = None,
+        alert_severities: Optional[Iterable[Union[AlertSeverity, str]]] = None,
+    ) -> Dict:
+        """
+        Fetches and merges the summaries of the given organizations and of every organization they follow.
+        :param organization_ids: the organizations to summarize, all organizations of the current user if None
+        :param include_following: whether to also summarize the organizations followed by each organization
+        :param scan_target_kinds: optional list of scan targets kinds to summarize
+        :param alert_severities: optional list of severities to summarize
+        :return: a dict with the raw summaries under organizations (per organization ID), the scan targets of the
+                 following summaries under followings (per organization ID then following ID), the alert counts per severity under totals.severities, per
+                 scan target kind under totals.kinds and per scan target ID under totals.scanTargets, the failed
+                 requests under errors, and the elapsed time in seconds. Scan targets seen through more than one
+                 organization are counted once.
+        """
+        started_at = time.monotonic()
+        if organization_ids is None:
+            organization_ids = [
+                organization["id"] for organization in self._client.iter_organizations()
+            ]
+        organization_ids = [validate_uuid(o) for o in organization_ids]
+
+        result = {
+            "organizations": {},
+            "followings": {},
+            "totals": {"severities": {}, "kinds": {}, "scanTargets": {}},
+            "errors": [],
+            "elapsed": 0.0,
+        }
+
+        def detail_summary(organization_id):
+            summary = self._client.get_scan_target_detail_summary(
+                organization_id,
+                scan_target_kinds=scan_target_kinds,
+                alert_severities=alert_severities,
+            )
+            _scan_targets(summary)
+            return summary
+
+        def following_summary(organization_id, following_ids):
+            # one request covers every following of the organization
+            summary = self._client.get_scan_targets_following_summary(
+                organization_id,
+                following_ids=following_ids,
+                scan_target_kinds=scan_target_kinds,
+                alert_severities=alert_severities,
+            )
+            followings = {following_id: [] for following_id in following_ids}
+            for scan_target in _scan_targets(summary):
+                followings.setdefault(scan_target.get("followingId"), []).append(
+                    scan_target
+                )
+            return followings
+
+        def following_ids(organization_id):
+            return [
+                following["id"]
+                for following in self._client.iter_organization_following(
+                    organization_id
+                )
+            ]
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            pending = {}
+            for organization_id in organization_ids:
+                pending[executor.submit(detail_summary, organization_id)] = (
+                    "get_scan_target_detail_summary",
+                    organization_id,
+                )
+                if include_following:
+                    pending[executor.submit(following_ids, organization_id)] = (
+                        "iter_organization_following",
+                        organization_id,
+                    )
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    operation, organization_id = pending.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as error:
+                        logger.warning(
+                            "%s failed for organization %s: %s",
+                            operation,
+                            organization_id,
+                            error,
+                        )
+                        result["errors"].append(
+                            {
+                                "operation": operation,
+                                "organizationId": organization_id,
+                                "error": str(error),
+                            }
+                        )
+                        continue
+
+                    if operation == "iter_organization_following":
+                        # the followings of an organization are summarized as soon as they are listed
+                        if value:
+                            pending[
+                                executor.submit(
+                                    following_summary, organization_id, value
+                                )
+                            ] = ("get_scan_targets_following_summary", organization_id)
+                        else:
+                            result["followings"][organization_id] = {}
+                    elif operation == "get_scan_targets_following_summary":
+                        result["followings"][organization_id] = value
+                    else:
+                        result["organizations"][organization_id] = value
+
+        # merged afterwards, in the order organizations were given, so totals don't depend on request timing
+        for organization_id in organization_ids:
+            if organization_id in result["organizations"]:
+                self._merge(
+                    result["totals"],
+                    _scan_targets(result["organizations"][organization_id]),
+                )
+            for scan_targets in result["followings"].get(organization_id, {}).values():
+                self._merge(result["totals"], scan_targets)
+
+        result["elapsed"] = time.monotonic() - started_at
+        return result
+
+    @staticmethod
+    def _merge(totals: Dict, scan_targets: List[Dict]) -> None:
+        for scan_target in scan_targets:
+            scan_target_id = scan_target.get("scanTargetId")
+            if scan_target_id is not None and scan_target_id in totals["scanTargets"]:
+                continue
+            counts = _severity_counts(scan_target)
+            _add_counts(totals["severities"], counts)
+            kind = scan_target.get("kind")
+            if kind is not None:
+                _add_counts(totals["kinds"].setdefault(kind, {}), counts)
+            if scan_target_id is not None:
+                totals["scanTargets"][scan_target_id] = counts
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+from zanshinsdk.alerts_snapshot import (
+    ADDED,
+    CHANGED,
+    REMOVED,
+    AlertsSnapshot,
+    alert_fingerprint,
+)
+
+
+def _alert(alert_id, state="OPEN", severity="HIGH", updated_at="2022-07-10"):
+    return {
+        "id": alert_id,
+        "state": state,
+        "severity": severity,
+        "updatedAt": updated_at,
+        "resource": "irrelevant",
+    }
+
+
+class TestAlertsSnapshot(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.snapshot = AlertsSnapshot(batch_size=2)
+
+    def tearDown(self):
+        self.snapshot.close()
+
+    ###################################################
+    # fingerprint
+    ###################################################
+
+    def test_fingerprint_ignores_other_fields(self):
+        alert = _alert("a")
+
+        self.assertEqual(
+            alert_fingerprint(alert), alert_fingerprint({**alert, "resource": "x"})
+        )
+        self.assertNotEqual(
+            alert_fingerprint(alert), alert_fingerprint({**alert, "state": "CLOSED"})
+        )
+        self.assertEqual(len(alert_fingerprint(alert)), 8)
+
+    ###################################################
+    # diff
+    ###################################################
+
+    def test_diff(self):
+        self.snapshot.save([_alert("a"), _alert("b"), _alert("c")])
+
+        changes = list(
+            self.snapshot.diff(
+                iter([_alert("a"), _alert("b", state="CLOSED"), _alert("d")])
+            )
+        )
+
+        self.assertEqual(
+            changes,
+            [
+                (CHANGED, "b", _alert("b", state="CLOSED")),
+                (ADDED, "d", _alert("d")),
+                (REMOVED, "c", None),
+            ],
+        )
+        self.assertEqual(len(self.snapshot), 3)
+        self.assertIn("d", self.snapshot)
+        self.assertNotIn("c", self.snapshot)
+        self.assertEqual(
+            list(self.snapshot.diff([_alert("a")], update=False)),
+            [
+                (REMOVED, "b", None),
+                (REMOVED, "d", None),
+            ],
+        )
+
+    def test_diff_without_update(self):
+        self.snapshot.save([_alert("a")])
+
+        list(self.snapshot.diff([_alert("b")], update=False))
+
+        self.assertEqual(list(self.snapshot.diff([_alert("a")])), [])
+
+    def test_interrupted_diff_keeps_the_snapshot(self):
+        self.snapshot.save([_alert("a")])
+
+        changes = self.snapshot.diff([_alert("b"), _alert("c"), _alert("d")])
+        next(changes)
+        changes.close()
+
+        self.assertEqual(len(self.snapshot), 1)
+        self.assertIn("a", self.snapshot)
+
+    def test_snapshot_is_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "alerts.db")
+            with AlertsSnapshot(filename) as snapshot:
+                self.assertEqual(snapshot.save([_alert("a"), _alert("b")]), 2)
+
+            with AlertsSnapshot(filename) as snapshot:
+                self.assertEqual(
+                    list(snapshot.diff([_alert("a")])), [(REMOVED, "b", None)]
+                )
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            AlertsSnapshot(batch_size=0)
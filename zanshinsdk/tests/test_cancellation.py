@@ -0,0 +1,224 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import httpx
+
+from zanshinsdk.alerts_history import FilePersistentAlertsIterator
+from zanshinsdk.client import Client
+from zanshinsdk.common.cancellation import (
+    CANCELLED,
+    DEADLINE_EXCEEDED,
+    CancellationToken,
+    OperationCancelled,
+    cancellation_scope,
+    current_token,
+)
+from zanshinsdk.common.page_size import AdaptivePageSize
+from zanshinsdk.common.paginator import CURSOR, ITEM_CURSOR, Paginator
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _item_cursor_pages(total):
+    def load_page(page_size, cursor):
+        start = 0 if cursor is None else cursor + 1
+        return {
+            "data": [{"cursor": i} for i in range(start, min(start + page_size, total))]
+        }
+
+    return Mock(side_effect=load_page)
+
+
+class TestCancellation(unittest.TestCase):
+    ###################################################
+    # CancellationToken
+    ###################################################
+
+    def test_deadline(self):
+        clock = FakeClock()
+        token = CancellationToken(10, clock=clock)
+
+        self.assertFalse(token.cancelled)
+        self.assertIsNone(token.reason)
+        self.assertEqual(token.remaining(), 10)
+        clock.now = 10
+        self.assertTrue(token.cancelled)
+        self.assertEqual(token.reason, DEADLINE_EXCEEDED)
+        self.assertEqual(token.remaining(), 0)
+
+    def test_cancel(self):
+        token = CancellationToken()
+        self.assertIsNone(token.remaining())
+        token.raise_if_cancelled()
+
+        token.cancel()
+        token.cancel("other")
+
+        self.assertEqual(token.reason, CANCELLED)
+        with self.assertRaises(OperationCancelled) as context:
+            token.raise_if_cancelled("a")
+        self.assertEqual(context.exception.cursor, "a")
+
+    def test_request_timeout_is_bounded_by_deadline(self):
+        clock = FakeClock()
+        token = CancellationToken(30, clock=clock)
+        clock.now = 25
+
+        timeout = token.request_timeout(httpx.Timeout(60, connect=2, pool=None))
+
+        self.assertEqual(
+            (timeout.connect, timeout.read, timeout.write, timeout.pool),
+            (2, 5, 5, 5),
+        )
+
+    def test_scope(self):
+        token = CancellationToken()
+
+        with cancellation_scope(token):
+            with cancellation_scope(None):
+                self.assertIs(current_token(), token)
+        self.assertIsNone(current_token())
+
+    ###################################################
+    # Paginator
+    ###################################################
+
+    def test_item_cursor_resumes_after_last_item(self):
+        token = CancellationToken()
+        paginator = Paginator(
+            _item_cursor_pages(10), ITEM_CURSOR, page_size=4, cancellation=token
+        )
+        items = []
+
+        with self.assertRaises(OperationCancelled) as context:
+            for item in paginator:
+                items.append(item["cursor"])
+                if len(items) == 6:
+                    token.cancel()
+
+        self.assertEqual(items, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(context.exception.cursor, 5)
+        self.assertEqual(paginator.cursor, 5)
+        resumed = Paginator(_item_cursor_pages(10), ITEM_CURSOR, page_size=4, cursor=5)
+        self.assertEqual([item["cursor"] for item in resumed], [6, 7, 8, 9])
+
+    def test_cursor_resumes_from_page_not_consumed(self):
+        load_page = Mock(
+            side_effect=[
+                {"data": [1, 2], "cursor": "a"},
+                {"data": [3, 4], "cursor": "b"},
+            ]
+        )
+        token = CancellationToken()
+        paginator = Paginator(load_page, CURSOR, page_size=2, cancellation=token)
+        items = []
+
+        with self.assertRaises(OperationCancelled) as context:
+            for item in paginator:
+                items.append(item)
+                if item == 3:
+                    token.cancel()
+
+        self.assertEqual(items, [1, 2, 3])
+        self.assertEqual(context.exception.cursor, "a")
+        self.assertEqual(load_page.call_count, 2)
+
+    def test_no_page_loaded_once_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+        load_page = Mock()
+
+        with self.assertRaises(OperationCancelled):
+            list(Paginator(load_page, CURSOR, page_size=2, cancellation=token))
+
+        load_page.assert_not_called()
+
+    def test_timeout_past_deadline_isnt_retried(self):
+        clock = FakeClock()
+        token = CancellationToken(10, clock=clock)
+        page_size = AdaptivePageSize(initial=100)
+
+        def load_page(page_size, cursor):
+            clock.now = 10
+            raise httpx.ReadTimeout("timeout")
+
+        paginator = Paginator(
+            load_page, CURSOR, page_size=page_size, cursor="a", cancellation=token
+        )
+
+        with self.assertRaises(OperationCancelled) as context:
+            list(paginator)
+
+        self.assertIsInstance(context.exception.__cause__, httpx.ReadTimeout)
+        self.assertEqual(context.exception.cursor, "a")
+        self.assertEqual(page_size.size, 100)
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def _client(self, handler):
+        with patch("zanshinsdk.client.isfile", return_value=False):
+            client = Client(api_key="key", api_url="https://api.test")
+        client._client = httpx.Client(
+            transport=httpx.MockTransport(handler), timeout=60
+        )
+        return client
+
+    def test_client_iterator_deadline(self):
+        clock = FakeClock()
+        token = CancellationToken(30, clock=clock)
+        timeouts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions["timeout"]["read"])
+            clock.now += 10
+            return httpx.Response(
+                200,
+                json={"data": [{"id": "a", "cursor": "1"}, {"id": "b", "cursor": "2"}]},
+            )
+
+        client = self._client(handler)
+        alerts = []
+
+        with self.assertRaises(OperationCancelled) as context:
+            for alert in client.iter_alerts_history(
+                ORGANIZATION_ID, page_size=2, deadline=token
+            ):
+                alerts.append(alert)
+
+        self.assertEqual(len(alerts), 4)
+        self.assertEqual(context.exception.cursor, "2")
+        self.assertEqual(timeouts, [30, 20, 10])
+
+    def test_persistent_iterator_deadline(self):
+        client = self._client(
+            lambda request: httpx.Response(
+                200,
+                json={"data": [{"id": "a", "cursor": "1"}, {"id": "b", "cursor": "2"}]},
+            )
+        )
+        token = CancellationToken()
+        iterator = FilePersistentAlertsIterator(
+            filename="test_zanshin",
+            client=client,
+            organization_id=ORGANIZATION_ID,
+            scan_target_ids=[],
+            deadline=token,
+        )
+
+        self.assertEqual(next(iterator)["cursor"], "1")
+        token.cancel()
+        with self.assertRaises(OperationCancelled) as context:
+            next(iterator)
+
+        self.assertEqual(context.exception.cursor, "1")
+        self.assertEqual(iterator.persistence_entry.cursor, "1")
@@ -0,0 +1,204 @@
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from zanshinsdk.client import Client
+from zanshinsdk.common.cancellation import DEADLINE_EXCEEDED, OperationCancelled
+from zanshinsdk.common.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    is_circuit_failure,
+)
+
+ROUTE = "GET /organizations/{id}"
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _status_error(status_code):
+    request = httpx.Request("GET", "https://api.test")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status_code, request=request)
+    )
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=0.5,
+            minimum_requests=4,
+            window=60,
+            open_duration=30,
+            clock=self.clock,
+        )
+
+    def _fail(self, times=1):
+        for _ in range(times):
+            self.breaker.before_request(ROUTE)
+            self.breaker.record(ROUTE, True)
+
+    def _succeed(self, times=1):
+        for _ in range(times):
+            self.breaker.before_request(ROUTE)
+            self.breaker.record(ROUTE, False)
+
+    ###################################################
+    # states
+    ###################################################
+
+    def test_opens_above_failure_rate(self):
+        self._succeed(2)
+        self._fail(1)
+        self.assertEqual(self.breaker.state(ROUTE), CLOSED)
+
+        self._fail(1)
+
+        self.assertEqual(self.breaker.state(ROUTE), OPEN)
+        with self.assertRaises(CircuitOpenError) as context:
+            self.breaker.before_request(ROUTE)
+        self.assertEqual(context.exception.retry_after, 30)
+        self.assertEqual(self.breaker.snapshot(), {ROUTE: OPEN})
+        self.assertEqual(self.breaker.state("GET /me"), CLOSED)
+
+    def test_needs_minimum_requests(self):
+        self._fail(3)
+
+        self.assertEqual(self.breaker.state(ROUTE), CLOSED)
+
+    def test_old_failures_leave_the_window(self):
+        self._fail(3)
+        self.clock.now = 61
+
+        self._succeed(1)
+
+        self.assertEqual(self.breaker.state(ROUTE), CLOSED)
+
+    def test_half_open_probe_closes(self):
+        self._fail(4)
+        self.clock.now = 30
+
+        self.assertEqual(self.breaker.state(ROUTE), HALF_OPEN)
+        self.breaker.before_request(ROUTE)
+        # only one probe at a time
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request(ROUTE)
+        self.breaker.record(ROUTE, False)
+
+        self.assertEqual(self.breaker.state(ROUTE), CLOSED)
+        self._fail(3)
+        self.assertEqual(self.breaker.state(ROUTE), CLOSED)
+
+    def test_half_open_probe_failure_reopens(self):
+        self._fail(4)
+        self.clock.now = 30
+
+        self._fail(1)
+
+        self.assertEqual(self.breaker.state(ROUTE), OPEN)
+        self.clock.now = 59
+        self.assertEqual(self.breaker.state(ROUTE), OPEN)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            CircuitBreaker(failure_rate_threshold=0)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(minimum_requests=0)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(half_open_probes=0)
+
+    ###################################################
+    # failures
+    ###################################################
+
+    def test_is_circuit_failure(self):
+        self.assertTrue(is_circuit_failure(_status_error(503)))
+        self.assertTrue(is_circuit_failure(_status_error(429)))
+        self.assertTrue(is_circuit_failure(httpx.ReadTimeout("timeout")))
+        self.assertTrue(is_circuit_failure(httpx.ConnectError("refused")))
+        self.assertFalse(is_circuit_failure(_status_error(404)))
+        self.assertFalse(is_circuit_failure(ValueError()))
+
+    def test_call_counts_failed_responses(self):
+        response = httpx.Response(502)
+
+        for _ in range(4):
+            self.assertIs(self.breaker.call(ROUTE, lambda: response), response)
+
+        self.assertEqual(self.breaker.state(ROUTE), OPEN)
+
+    def test_call_releases_probes_that_got_no_answer(self):
+        self._fail(4)
+        self.clock.now = 30
+
+        def interrupted():
+            raise KeyboardInterrupt()
+
+        def cancelled():
+            raise OperationCancelled(DEADLINE_EXCEEDED)
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.breaker.call(ROUTE, interrupted)
+        with self.assertRaises(OperationCancelled):
+            self.breaker.call(ROUTE, cancelled)
+
+        # neither closed the circuit, nor kept its probe slot
+        self.assertEqual(self.breaker.state(ROUTE), HALF_OPEN)
+        response = httpx.Response(200)
+        self.assertIs(self.breaker.call(ROUTE, lambda: response), response)
+        self.assertEqual(self.breaker.state(ROUTE), CLOSED)
+
+    def test_call_counts_client_errors_as_answers(self):
+        self._fail(4)
+        self.clock.now = 30
+
+        def not_found():
+            raise _status_error(404)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.breaker.call(ROUTE, not_found)
+
+        self.assertEqual(self.breaker.state(ROUTE), CLOSED)
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def test_client_fails_fast_while_open(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(503)
+
+        with patch("zanshinsdk.client.isfile", return_value=False):
+            client = Client(
+                api_key="key",
+                api_url="https://api.test",
+                circuit_breaker=self.breaker,
+            )
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        for _ in range(4):
+            with self.assertRaises(httpx.HTTPStatusError):
+                client.get_organization(ORGANIZATION_ID)
+        with self.assertRaises(CircuitOpenError):
+            client.get_organization(ORGANIZATION_ID)
+
+        self.assertEqual(len(requests), 4)
+        self.assertEqual(self.breaker.snapshot(), {ROUTE: OPEN})
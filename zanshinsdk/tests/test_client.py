@@ -1,10 +1,14 @@
 import os
+import threading
 import unittest
+from configparser import RawConfigParser
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import Mock, call, mock_open, patch
 from uuid import UUID
 
-from httpx import Request, Response
+from httpx import Client as HttpxClient
+from httpx import MockTransport, Request, Response
 from moto import mock_cloudformation, mock_s3, mock_sts
 
 import zanshinsdk
@@ -186,6 +190,46 @@ class TestClient(unittest.TestCase):
 
         self.assertIsNotNone(client._client)
 
+    @patch("zanshinsdk.client.httpx.Client")
+    @patch("zanshinsdk.client.isfile")
+    def test_http_client_is_built_on_first_use(self, mock_is_file, mock_httpx_client):
+        mock_is_file.return_value = True
+        _data = "[default]\napi_key=api_key"
+
+        with patch("__main__.__builtins__.open", mock_open(read_data=_data)):
+            client = zanshinsdk.Client()
+        mock_httpx_client.assert_not_called()
+
+        self.assertIs(client._client, client._client)
+        mock_httpx_client.assert_called_once()
+
+        client.api_key = "new_api_key"
+        mock_httpx_client.return_value.close.assert_called_once()
+        client._client
+        self.assertEqual(mock_httpx_client.call_count, 2)
+        self.assertEqual(
+            mock_httpx_client.call_args.kwargs["headers"]["Authorization"],
+            "Bearer new_api_key",
+        )
+
+    @patch("zanshinsdk.client.isfile")
+    def test_config_file_is_parsed_once(self, mock_is_file):
+        mock_is_file.return_value = True
+        _data = "[default]\napi_key=cached_api_key"
+        original_read_string = RawConfigParser.read_string
+
+        with patch("__main__.__builtins__.open", mock_open(read_data=_data)):
+            with patch(
+                "zanshinsdk.client.RawConfigParser.read_string", autospec=True
+            ) as read_string:
+                read_string.side_effect = original_read_string
+                first = zanshinsdk.Client()
+                second = zanshinsdk.Client()
+
+        self.assertEqual(first.api_key, "cached_api_key")
+        self.assertEqual(second.api_key, "cached_api_key")
+        self.assertLessEqual(read_string.call_count, 1)
+
     ###################################################
     # Properties
     ###################################################
@@ -1540,6 +1584,95 @@ class TestClient(unittest.TestCase):
             page_size=1000,
         )
 
+    @patch("zanshinsdk.client.time.sleep")
+    @patch("zanshinsdk.client.Client.iter_alerts")
+    def test_watch_alerts(self, iter_alerts, sleep):
+        organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+        first = {"id": "a", "updatedAt": "2022-07-10T00:10:00.000Z"}
+        second = {"id": "b", "updatedAt": "2022-07-10T00:20:00.000000"}
+        second_updated = {"id": "b", "updatedAt": "2022-07-10T00:20:30.000000"}
+        iter_alerts.side_effect = [
+            iter([first, second]),
+            iter([second, second_updated]),
+            iter([second_updated]),
+        ]
+
+        alerts = list(
+            self.sdk.watch_alerts(
+                organization_id, poll_interval=5, overlap=60, max_polls=3
+            )
+        )
+
+        self.assertEqual(alerts, [first, second, second_updated])
+        self.assertEqual(
+            [c.kwargs["updated_at_start"] for c in iter_alerts.call_args_list],
+            [
+                None,
+                datetime(2022, 7, 10, 0, 19),
+                datetime(2022, 7, 10, 0, 19, 30),
+            ],
+        )
+        self.assertEqual(
+            iter_alerts.call_args.kwargs["order"],
+            zanshinsdk.AlertsOrderOpts.UPDATED_AT,
+        )
+        self.assertEqual(sleep.call_count, 2)
+        sleep.assert_called_with(5)
+
+    @patch("zanshinsdk.client.time.sleep")
+    @patch("zanshinsdk.client.Client.iter_alerts")
+    def test_watch_alerts_starts_at_the_given_date(self, iter_alerts, sleep):
+        iter_alerts.return_value = iter([])
+
+        alerts = list(
+            self.sdk.watch_alerts(
+                "822f4225-43e9-4922-b6b8-8b0620bdb1e3",
+                overlap=0,
+                updated_at_start="2022-07-10",
+                max_polls=1,
+            )
+        )
+
+        self.assertEqual(alerts, [])
+        self.assertEqual(
+            iter_alerts.call_args.kwargs["updated_at_start"], datetime(2022, 7, 10)
+        )
+        sleep.assert_not_called()
+
+    @patch("zanshinsdk.client.time.sleep")
+    @patch("zanshinsdk.client.Client.iter_alerts")
+    def test_watch_alerts_starts_at_an_aware_datetime(self, iter_alerts, sleep):
+        iter_alerts.side_effect = [
+            iter([{"id": "a", "updatedAt": "2022-07-10T00:10:00.000Z"}]),
+            iter([]),
+        ]
+        start = datetime(2022, 7, 10, 3, tzinfo=timezone(timedelta(hours=3)))
+
+        alerts = list(
+            self.sdk.watch_alerts(
+                "822f4225-43e9-4922-b6b8-8b0620bdb1e3",
+                overlap=0,
+                updated_at_start=start,
+                max_polls=2,
+            )
+        )
+
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(
+            [c.kwargs["updated_at_start"] for c in iter_alerts.call_args_list],
+            [datetime(2022, 7, 10), datetime(2022, 7, 10, 0, 10)],
+        )
+
+    def test_parse_timestamp(self):
+        self.assertEqual(
+            zanshinsdk.client._parse_timestamp("2022-07-10T00:10:00.000Z"),
+            datetime(2022, 7, 10, 0, 10),
+        )
+        self.assertEqual(
+            zanshinsdk.client._parse_timestamp("2022-07-10T03:10:00+03:00"),
+            datetime(2022, 7, 10, 0, 10),
+        )
+
     def test_get_following_alerts_page(self):
         organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
         following_ids = ["421cfe8a-1777-4000-a000-f836dfdfcfb8"]
@@ -2503,6 +2636,211 @@ class TestClient(unittest.TestCase):
         for cf_stack in cf_stacks["Stacks"]:
             cloudformation.delete_stack(StackName=cf_stack["StackName"])
 
+    def test_check_boto3_installation_is_cached(self):
+        import sys
+
+        boto3 = self.sdk._check_boto3_installation()
+
+        self.assertIs(boto3, sys.modules["boto3"])
+        self.assertIs(self.sdk._check_boto3_installation(), boto3)
+
+    @patch("zanshinsdk.client.import_module")
+    def test_check_boto3_installation_missing(self, mock_import_module):
+        mock_import_module.side_effect = ImportError("No module named 'boto3'")
+
+        with self.assertRaises(ImportError) as context:
+            self.sdk._check_boto3_installation()
+        self.assertEqual(
+            str(context.exception),
+            "boto3 not present. boto3 is required to perform AWS onboard.",
+        )
+
+    def test_get_session_from_boto3_profile_is_reused(self):
+        boto3 = Mock()
+
+        first = self.sdk._get_session_from_boto3_profile("profile", boto3)
+        second = self.sdk._get_session_from_boto3_profile("profile", boto3)
+        self.sdk._get_session_from_boto3_profile("other", boto3)
+
+        self.assertIs(first, second)
+        self.assertEqual(
+            boto3.Session.call_args_list,
+            [call(profile_name="profile"), call(profile_name="other")],
+        )
+
+    def test_get_boto3_client_is_reused(self):
+        session = Mock()
+
+        first = self.sdk._get_boto3_client(session, "cloudformation", "us-east-1")
+        second = self.sdk._get_boto3_client(session, "cloudformation", "us-east-1")
+        self.sdk._get_boto3_client(session, "cloudformation", "us-east-2")
+        self.sdk._get_boto3_client(session, "sts")
+
+        self.assertIs(first, second)
+        self.assertEqual(
+            session.client.call_args_list,
+            [
+                call("cloudformation", region_name="us-east-1"),
+                call("cloudformation", region_name="us-east-2"),
+                call("sts"),
+            ],
+        )
+
+    def mock_boto3_session(self, stack_statuses):
+        """Mocked boto3 session whose CloudFormation stack goes through stack_statuses."""
+
+        class ClientError(Exception):
+            pass
+
+        cloudformation = Mock()
+        cloudformation.exceptions.ClientError = ClientError
+        cloudformation.describe_stacks.side_effect = [
+            ClientError("Stack with id tenchi-zanshin-service-role does not exist")
+        ] + [{"Stacks": [{"StackStatus": status}]} for status in stack_statuses]
+        session = Mock()
+        session.client.side_effect = lambda service, **kwargs: (
+            cloudformation if service == "cloudformation" else Mock()
+        )
+        return session, cloudformation
+
+    def test_onboard_scan_targets(self):
+        organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+        scan_target_ids = {
+            "111111111111": "14f79567-6b68-4e3a-b2f2-4f1383546251",
+            "222222222222": "24f79567-6b68-4e3a-b2f2-4f1383546252",
+            "333333333333": "34f79567-6b68-4e3a-b2f2-4f1383546253",
+        }
+        done_session, done_cloudformation = self.mock_boto3_session(
+            ["CREATE_IN_PROGRESS", "CREATE_COMPLETE"]
+        )
+        failed_session, _ = self.mock_boto3_session(["ROLLBACK_COMPLETE"])
+        sleep = Mock()
+        invalid_session = Mock()
+        invalid_session.client.return_value.get_caller_identity.side_effect = Exception(
+            "invalid"
+        )
+
+        def request(method, path, params=None, body=None):
+            if method == "POST" and path.endswith("/scantargets"):
+                scan_target_id = scan_target_ids[body["credential"]["account"]]
+                return Mock(json=lambda: {"id": scan_target_id})
+            return Mock(json=lambda: {"id": path.split("/")[4]})
+
+        self.sdk._request.side_effect = request
+
+        reports = self.sdk.onboard_scan_targets(
+            organization_id,
+            [
+                ("111111111111", done_session, "us-east-1", "done"),
+                ("222222222222", failed_session, "us-east-2"),
+                ("333333333333", invalid_session, "us-east-1"),
+            ],
+            max_workers=2,
+            waiter=zanshinsdk.Waiter(sleep=sleep),
+        )
+
+        self.assertEqual(
+            [report["status"] for report in reports],
+            ["ONBOARDED", "FAILED", "FAILED"],
+        )
+        self.assertEqual(
+            reports[0]["scanTarget"]["id"], scan_target_ids["111111111111"]
+        )
+        self.assertIsNone(reports[0]["error"])
+        self.assertIn("ROLLBACK_COMPLETE", reports[1]["error"])
+        self.assertIn("boto3 session is invalid", reports[2]["error"])
+        self.assertIsNone(reports[2]["scanTargetId"])
+        done_cloudformation.create_stack.assert_called_once()
+        self.sdk._request.assert_any_call(
+            "POST",
+            f"/organizations/{organization_id}/scantargets/"
+            f"{scan_target_ids['111111111111']}/scan",
+            params={"force": "true"},
+        )
+        self.assertEqual(sleep.call_count, 1)
+
+    def test_onboard_scan_targets_polls_stacks_as_they_are_deployed(self):
+        organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+        scan_target_ids = {
+            "111111111111": "14f79567-6b68-4e3a-b2f2-4f1383546251",
+            "222222222222": "24f79567-6b68-4e3a-b2f2-4f1383546252",
+        }
+        slow_session, _ = self.mock_boto3_session(["CREATE_COMPLETE"])
+        fast_session, _ = self.mock_boto3_session(["CREATE_COMPLETE"])
+        fast_scanned = threading.Event()
+        slow_released = []
+        slow_sts = Mock()
+        slow_sts.get_caller_identity.side_effect = lambda: slow_released.append(
+            fast_scanned.wait(5)
+        )
+        slow_cloudformation = slow_session.client("cloudformation")
+        slow_session.client.side_effect = lambda service, **kwargs: (
+            slow_cloudformation if service == "cloudformation" else slow_sts
+        )
+
+        def request(method, path, params=None, body=None):
+            if method == "POST" and path.endswith("/scantargets"):
+                scan_target_id = scan_target_ids[body["credential"]["account"]]
+                return Mock(json=lambda: {"id": scan_target_id})
+            if path.endswith(f"{scan_target_ids['222222222222']}/scan"):
+                fast_scanned.set()
+            return Mock(json=lambda: {"id": path.split("/")[4]})
+
+        self.sdk._request.side_effect = request
+
+        reports = self.sdk.onboard_scan_targets(
+            organization_id,
+            [
+                ("111111111111", slow_session, "us-east-1"),
+                ("222222222222", fast_session, "us-east-1"),
+            ],
+            max_workers=2,
+            waiter=zanshinsdk.Waiter(sleep=Mock()),
+        )
+
+        self.assertEqual(
+            [report["status"] for report in reports], ["ONBOARDED", "ONBOARDED"]
+        )
+        # the second account was scanned while the first one was still being deployed
+        self.assertEqual(slow_released, [True])
+
+    def test_onboard_scan_targets_pads_short_names(self):
+        organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+        session, _ = self.mock_boto3_session(["CREATE_COMPLETE"])
+        self.sdk._request.return_value = Mock(
+            json=lambda: {"id": "14f79567-6b68-4e3a-b2f2-4f1383546251"}
+        )
+
+        self.sdk.onboard_scan_targets(
+            organization_id,
+            [("111111111111", session, "us-east-1", "ab")],
+            waiter=zanshinsdk.Waiter(sleep=Mock()),
+        )
+
+        create = self.sdk._request.call_args_list[0]
+        self.assertEqual(create.kwargs["body"]["name"], "ab_111111111111")
+
+    def test_onboard_scan_targets_timeout(self):
+        organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+        now = [0.0]
+        sleep = Mock(side_effect=lambda seconds: now.__setitem__(0, now[0] + seconds))
+        session, _ = self.mock_boto3_session(["CREATE_IN_PROGRESS"] * 3)
+        self.sdk._request.return_value = Mock(
+            json=lambda: {"id": "14f79567-6b68-4e3a-b2f2-4f1383546251"}
+        )
+
+        reports = self.sdk.onboard_scan_targets(
+            organization_id,
+            [("111111111111", session, "us-east-1")],
+            waiter=zanshinsdk.Waiter(
+                initial_delay=1, timeout=2, sleep=sleep, clock=lambda: now[0]
+            ),
+        )
+
+        self.assertEqual(reports[0]["status"], "FAILED")
+        self.assertEqual(reports[0]["error"], "CloudFormation Stack wasn't deployed")
+        self.assertEqual(sleep.call_args_list, [call(1), call(1)])
+
     def test_get_alert_comment_page(self):
         alert_id = "e22f4225-43e9-4922-b6b8-8b0620bdb110"
         page = 1
@@ -2572,3 +2910,84 @@ class TestClient(unittest.TestCase):
             call(alert_id=alert_id, page_size=page_size, page=3),
         ]
         self.sdk._get_alert_history_page.assert_has_calls(expected_calls)
+
+    ###################################################
+    # submit / map
+    ###################################################
+
+    def test_submit(self):
+        self.sdk.get_alert = Mock(return_value={"id": "a"})
+
+        future = self.sdk.submit("get_alert", "a")
+
+        self.assertEqual(future.result(), {"id": "a"})
+        self.sdk.get_alert.assert_called_once_with("a")
+
+    def test_submit_consumes_iterators(self):
+        self.sdk.iter_organizations = Mock(return_value=(o for o in ["a", "b"]))
+
+        future = self.sdk.submit(self.sdk.iter_organizations)
+
+        self.assertEqual(future.result(), ["a", "b"])
+
+    def test_map(self):
+        threads = set()
+
+        def get_organization_scan_target(organization_id, scan_target_id, lang):
+            threads.add(threading.get_ident())
+            return f"{organization_id}/{scan_target_id}/{lang}"
+
+        self.sdk.get_organization_scan_target = get_organization_scan_target
+
+        results = list(
+            self.sdk.map(
+                "get_organization_scan_target",
+                ["o1", "o2", "o3"],
+                ["s1", "s2", "s3"],
+                workers=2,
+                lang="en",
+            )
+        )
+
+        self.assertEqual(results, ["o1/s1/en", "o2/s2/en", "o3/s3/en"])
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_map_raises_errors_in_order(self):
+        self.sdk.get_alert = Mock(side_effect=["a", ValueError("b"), "c"])
+
+        results = self.sdk.map("get_alert", ["a", "b", "c"], workers=1)
+
+        self.assertEqual(next(results), "a")
+        with self.assertRaises(ValueError):
+            next(results)
+
+    ###################################################
+    # Thread safety
+    ###################################################
+
+    @patch("zanshinsdk.client.isfile")
+    def test_settings_change_waits_for_requests_in_flight(self, mock_is_file):
+        mock_is_file.return_value = False
+        started = threading.Event()
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def handler(request: Request) -> Response:
+            started.set()
+            released.wait(5)
+            return Response(200, json={"id": "me"})
+
+        client = zanshinsdk.Client(api_key="key", api_url="https://api.test")
+        http_client = HttpxClient(transport=MockTransport(handler))
+        client._client = http_client
+
+        future = client.submit("get_me")
+        self.assertTrue(started.wait(5))
+        client.api_key = "other"
+
+        self.assertFalse(http_client.is_closed)
+        released.set()
+        self.assertEqual(future.result(5), {"id": "me"})
+        self.assertTrue(http_client.is_closed)
+        self.assertIsNot(client._client, http_client)
+        client.close()
@@ -0,0 +1,125 @@
+import threading
+import unittest
+from unittest.mock import mock_open, patch
+
+import httpx
+
+from zanshinsdk.client_pool import ClientPool
+from zanshinsdk.common.transport import SharedTransport
+
+
+class TestClientPool(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.requests = []
+        self.transport = SharedTransport(transport=httpx.MockTransport(self._handler))
+        self.pool = ClientPool(
+            max_clients=2, transport=self.transport, api_url="https://api.test"
+        )
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    ###################################################
+    # get
+    ###################################################
+
+    def test_clients_are_reused_per_api_key(self):
+        first = self.pool.get(api_key="first")
+
+        self.assertIs(self.pool.get(api_key="first"), first)
+        self.assertIsNot(self.pool.get(api_key="second"), first)
+        self.assertEqual(self.pool.stats()["hits"], 1)
+        self.assertEqual(self.pool.stats()["misses"], 2)
+
+    @patch("zanshinsdk.client.isfile")
+    def test_clients_are_reused_per_profile(self, mock_is_file):
+        mock_is_file.return_value = True
+        _data = "[tenant]\napi_key=tenant_api_key"
+
+        with patch("__main__.__builtins__.open", mock_open(read_data=_data)):
+            client = self.pool.get("tenant")
+            self.assertIs(self.pool.get("tenant"), client)
+
+        self.assertEqual(client.api_key, "tenant_api_key")
+
+    def test_least_recently_used_client_is_evicted(self):
+        first = self.pool.get(api_key="first")
+        self.pool.get(api_key="second")
+        self.pool.get(api_key="first")
+        self.pool.get(api_key="third")
+
+        self.assertEqual(len(self.pool), 2)
+        self.assertIs(self.pool.get(api_key="first"), first)
+        self.assertEqual(self.pool.stats()["evictions"], 1)
+        self.assertEqual(self.pool.stats()["misses"], 3)
+
+    def test_concurrent_gets_build_one_client(self):
+        clients = []
+
+        def get():
+            clients.append(self.pool.get(api_key="key"))
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(map(id, clients))), 1)
+
+    ###################################################
+    # metrics and transport
+    ###################################################
+
+    def test_aggregate_metrics(self):
+        self.pool.get(api_key="first").get_me()
+        self.pool.get(api_key="second").get_me()
+
+        stats = self.pool.stats()
+
+        self.assertEqual(stats["requests"]["GET /me"]["count"], 2)
+        self.assertEqual(
+            [request.headers["Authorization"] for request in self.requests],
+            ["Bearer first", "Bearer second"],
+        )
+
+    def test_close_keeps_a_given_transport_open(self):
+        self.pool.get(api_key="first")
+
+        self.pool.close()
+
+        self.assertEqual(len(self.pool), 0)
+        self.assertFalse(self.transport.closed)
+
+    def test_close_shuts_down_an_owned_transport(self):
+        with ClientPool() as pool:
+            transport = pool.transport
+
+        self.assertTrue(transport.closed)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            ClientPool(max_clients=0)
+        with self.assertRaises(ValueError):
+            ClientPool(api_key="key")
+
+    ###################################################
+    # Client.close
+    ###################################################
+
+    def test_client_close_drops_the_http_client(self):
+        client = self.pool.get(api_key="first")
+
+        with client:
+            client.get_me()
+            http_client = client._http_client
+
+        self.assertIsNone(client._http_client)
+        self.assertTrue(http_client.is_closed)
+        client.get_me()
+        self.assertEqual(len(self.requests), 2)
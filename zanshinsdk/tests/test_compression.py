@@ -0,0 +1,117 @@
+import gzip
+import json
+import unittest
+from importlib.util import find_spec
+from unittest.mock import patch
+
+import httpx
+
+from zanshinsdk.client import Client
+from zanshinsdk.common.compression import (
+    GZIP,
+    ZSTD,
+    accept_encoding,
+    encode_json_body,
+    validate_encoding,
+)
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+SCAN_TARGET_IDS = [f"e22f4225-43e9-4922-b6b8-{i:012d}" for i in range(1000)]
+HAVE_ZSTANDARD = find_spec("zstandard") is not None
+
+
+class TestCompression(unittest.TestCase):
+    ###################################################
+    # encode_json_body
+    ###################################################
+
+    def test_small_bodies_arent_compressed(self):
+        content, headers = encode_json_body({"a": 1}, GZIP, threshold=1024)
+
+        self.assertEqual(content, b'{"a":1}')
+        self.assertEqual(headers, {"Content-Type": "application/json"})
+
+    def test_large_bodies_are_compressed(self):
+        body = {"scanTargetIds": SCAN_TARGET_IDS}
+
+        content, headers = encode_json_body(body, GZIP, threshold=1024)
+
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(content)), body)
+        self.assertLess(len(content), len(json.dumps(body)) / 4)
+
+    def test_validate_encoding(self):
+        self.assertIsNone(validate_encoding(None))
+        self.assertEqual(validate_encoding(GZIP), GZIP)
+        with self.assertRaises(ValueError):
+            validate_encoding("br")
+
+    @unittest.skipIf(HAVE_ZSTANDARD, "zstandard is installed")
+    def test_zstd_requires_zstandard(self):
+        with self.assertRaises(ImportError):
+            validate_encoding(ZSTD)
+
+    @unittest.skipUnless(HAVE_ZSTANDARD, "zstandard isn't installed")
+    def test_zstd(self):
+        import zstandard
+
+        body = {"scanTargetIds": SCAN_TARGET_IDS}
+        content, headers = encode_json_body(body, ZSTD, threshold=1024)
+
+        self.assertEqual(headers["Content-Encoding"], "zstd")
+        self.assertEqual(
+            json.loads(zstandard.ZstdDecompressor().decompress(content)), body
+        )
+
+    def test_accept_encoding(self):
+        self.assertTrue(accept_encoding().startswith("gzip, deflate"))
+        self.assertEqual("zstd" in accept_encoding(), HAVE_ZSTANDARD)
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def _client(self, **kwargs):
+        self.requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return httpx.Response(200, json={"data": []})
+
+        with patch("zanshinsdk.client.isfile", return_value=False):
+            client = Client(api_key="key", api_url="https://api.test", **kwargs)
+        client._client = httpx.Client(
+            transport=httpx.MockTransport(handler),
+            headers={"Accept-Encoding": accept_encoding()},
+        )
+        return client
+
+    def test_client_compresses_large_bodies(self):
+        client = self._client(request_compression=GZIP, compression_threshold=1024)
+
+        list(client.iter_alerts(ORGANIZATION_ID, scan_target_ids=SCAN_TARGET_IDS))
+        list(client.iter_alerts(ORGANIZATION_ID))
+
+        large, small = self.requests
+        self.assertEqual(large.headers["Content-Encoding"], "gzip")
+        self.assertEqual(large.headers["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(gzip.decompress(large.content))["scanTargetIds"],
+            SCAN_TARGET_IDS,
+        )
+        self.assertNotIn("Content-Encoding", small.headers)
+        self.assertEqual(json.loads(small.content), {})
+
+    def test_client_doesnt_compress_by_default(self):
+        client = self._client()
+
+        list(client.iter_alerts(ORGANIZATION_ID, scan_target_ids=SCAN_TARGET_IDS))
+
+        self.assertNotIn("Content-Encoding", self.requests[0].headers)
+        self.assertEqual(
+            json.loads(self.requests[0].content)["scanTargetIds"], SCAN_TARGET_IDS
+        )
+
+    def test_client_rejects_unknown_encodings(self):
+        with self.assertRaises(ValueError):
+            self._client(request_compression="deflate")
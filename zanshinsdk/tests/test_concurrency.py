@@ -0,0 +1,182 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+import httpx
+
+from zanshinsdk.client import Client
+from zanshinsdk.common.concurrency import AdaptiveConcurrencyLimiter, worker_count
+from zanshinsdk.summary_aggregator import SummaryAggregator
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=4, max_limit=8, clock=self.clock
+        )
+
+    def _complete(self, in_flight, latency=1.0, overloaded=False):
+        """Completes a round of requests, all in flight at once."""
+        started = [self.limiter.acquire() for _ in range(in_flight)]
+        self.clock.now += latency
+        for start in started:
+            self.limiter.release(
+                start, overloaded=overloaded, latency=None if overloaded else latency
+            )
+
+    ###################################################
+    # Limit
+    ###################################################
+
+    def test_additive_increase(self):
+        self._complete(4)
+        self._complete(4)
+        self.assertEqual(self.limiter.limit, 4)
+        self._complete(4)
+        self.assertEqual(self.limiter.limit, 5)
+
+    def test_increase_needs_saturation(self):
+        for _ in range(10):
+            self._complete(1)
+
+        self.assertEqual(self.limiter.limit, 4)
+
+    def test_increase_stops_at_max_limit(self):
+        for _ in range(50):
+            self._complete(self.limiter.limit)
+
+        self.assertEqual(self.limiter.limit, 8)
+
+    def test_overload_cuts_limit_once_per_round(self):
+        self._complete(4, overloaded=True)
+        self.assertEqual(self.limiter.limit, 2)
+        self._complete(2, overloaded=True)
+        self.assertEqual(self.limiter.limit, 1)
+        self._complete(1, overloaded=True)
+
+        self.assertEqual(self.limiter.limit, 1)
+        self.assertEqual(self.limiter.stats["decreases"], 2)
+
+    def test_latency_spike_cuts_limit(self):
+        self._complete(4, latency=1.0)
+        self._complete(4, latency=1.5)
+        self.assertEqual(self.limiter.limit, 4)
+        self._complete(4, latency=5.0)
+
+        self.assertEqual(self.limiter.limit, 2)
+
+    def test_acquire_waits_for_a_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        started = limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.release(limiter.acquire())
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(started, latency=0.1)
+        thread.join(1)
+
+        self.assertTrue(acquired.is_set())
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=8)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(backoff_ratio=1)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(latency_tolerance=1)
+
+    ###################################################
+    # call
+    ###################################################
+
+    def test_call_counts_overloads(self):
+        self.assertEqual(
+            self.limiter.call(lambda: httpx.Response(429)).status_code, 429
+        )
+        self.assertEqual(self.limiter.limit, 2)
+
+        with self.assertRaises(httpx.ReadTimeout):
+            self.limiter.call(Mock(side_effect=httpx.ReadTimeout("timeout")))
+        self.assertEqual(self.limiter.limit, 1)
+        self.assertEqual(self.limiter.in_flight, 0)
+
+    def test_observe_doesnt_wait_for_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=1, max_limit=4, clock=self.clock
+        )
+        started = limiter.acquire()
+
+        # a request admitted elsewhere goes through although the only slot is taken
+        self.assertEqual(limiter.observe(lambda: httpx.Response(200)).status_code, 200)
+        self.assertEqual(limiter.stats["requests"], 1)
+        limiter.release(started)
+        self.assertEqual(limiter.in_flight, 0)
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, clock=self.clock)
+        limiter.observe(lambda: httpx.Response(503))
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_call_ignores_other_errors(self):
+        with self.assertRaises(ValueError):
+            self.limiter.call(Mock(side_effect=ValueError()))
+
+        self.assertEqual(self.limiter.limit, 4)
+        self.assertEqual(self.limiter.in_flight, 0)
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def test_client_requests_go_through_limiter(self):
+        statuses = iter([200, 503])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(statuses), json={"id": ORGANIZATION_ID})
+
+        with patch("zanshinsdk.client.isfile", return_value=False):
+            client = Client(
+                api_key="key",
+                api_url="https://api.test",
+                concurrency_limiter=self.limiter,
+            )
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        client.get_organization(ORGANIZATION_ID)
+        with self.assertRaises(httpx.HTTPStatusError):
+            client.get_organization(ORGANIZATION_ID)
+
+        self.assertEqual(self.limiter.stats["requests"], 2)
+        self.assertEqual(self.limiter.limit, 2)
+        self.assertIs(client.concurrency_limiter, self.limiter)
+
+    def test_worker_count(self):
+        client = Mock(concurrency_limiter=self.limiter)
+
+        self.assertEqual(worker_count(client, None, 16), 8)
+        self.assertEqual(worker_count(client, 2, 16), 2)
+        self.assertEqual(worker_count(Mock(), None, 16), 16)
+        self.assertEqual(SummaryAggregator(client)._max_workers, 8)
+        with self.assertRaises(ValueError):
+            worker_count(client, 0, 16)
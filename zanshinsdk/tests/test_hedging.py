@@ -0,0 +1,167 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from zanshinsdk.client import Client
+from zanshinsdk.common.hedging import HedgingPolicy
+
+ROUTE = "GET /organizations/{id}"
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+class TestHedgingPolicy(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.policy = HedgingPolicy(
+            percentile=90, initial_delay=0.05, min_delay=0.01, min_samples=10
+        )
+        self.addCleanup(self.policy.close)
+
+    def _sender(self, responses):
+        """Returns a send function answering each call with the next (delay, response or error) of responses."""
+        calls = []
+        lock = threading.Lock()
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def send():
+            with lock:
+                delay, result = responses[len(calls)]
+                calls.append(result)
+            if delay:
+                released.wait(delay)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return send, calls
+
+    ###################################################
+    # Delay
+    ###################################################
+
+    def test_delay_starts_at_initial_delay(self):
+        for _ in range(9):
+            self.policy.record(ROUTE, 1.0)
+
+        self.assertEqual(self.policy.delay(ROUTE), 0.05)
+        self.assertEqual(self.policy.delay("GET /organizations"), 0.05)
+
+    def test_delay_is_percentile_of_latencies(self):
+        for latency in range(1, 21):
+            self.policy.record(ROUTE, latency / 100)
+
+        self.assertEqual(self.policy.delay(ROUTE), 0.19)
+
+    def test_delay_is_bounded(self):
+        policy = HedgingPolicy(min_samples=1, min_delay=0.1, max_delay=2)
+        policy.record(ROUTE, 0.001)
+        policy.record("GET /organizations", 60)
+
+        self.assertEqual(policy.delay(ROUTE), 0.1)
+        self.assertEqual(policy.delay("GET /organizations"), 2)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            HedgingPolicy(percentile=100)
+        with self.assertRaises(ValueError):
+            HedgingPolicy(min_samples=20, window=10)
+
+    ###################################################
+    # Run
+    ###################################################
+
+    def test_fast_response_isnt_hedged(self):
+        response = httpx.Response(200)
+        send, calls = self._sender([(0, response)])
+
+        self.assertIs(self.policy.run(ROUTE, send), response)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            self.policy.stats, {"requests": 1, "hedges": 0, "hedgesWon": 0}
+        )
+
+    def test_slow_response_is_hedged(self):
+        slow = httpx.Response(200)
+        fast = httpx.Response(200)
+        send, calls = self._sender([(5, slow), (0, fast)])
+
+        self.assertIs(self.policy.run(ROUTE, send), fast)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            self.policy.stats, {"requests": 1, "hedges": 1, "hedgesWon": 1}
+        )
+
+    def test_server_error_waits_for_other_request(self):
+        error = httpx.Response(503)
+        success = httpx.Response(200)
+        send, _ = self._sender([(0.1, success), (0, error)])
+
+        self.assertIs(self.policy.run(ROUTE, send), success)
+        self.assertEqual(self.policy.stats["hedgesWon"], 0)
+
+    def test_server_error_wins_if_other_request_fails(self):
+        error = httpx.Response(503)
+        send, _ = self._sender([(0.1, httpx.ConnectError("refused")), (0, error)])
+
+        self.assertIs(self.policy.run(ROUTE, send), error)
+
+    def test_raises_if_both_requests_fail(self):
+        send, _ = self._sender(
+            [(0.1, httpx.ReadTimeout("primary")), (0, httpx.ConnectError("hedge"))]
+        )
+
+        with self.assertRaisesRegex(httpx.ReadTimeout, "primary"):
+            self.policy.run(ROUTE, send)
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def _client(self, handler):
+        with patch("zanshinsdk.client.isfile", return_value=False):
+            client = Client(
+                api_key="key", api_url="https://api.test", hedging=self.policy
+            )
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        return client
+
+    def test_client_hedges_reads(self):
+        requests = []
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if len(requests) == 1:
+                released.wait(5)
+                return httpx.Response(200, json={"id": "slow"})
+            return httpx.Response(200, json={"id": ORGANIZATION_ID})
+
+        client = self._client(handler)
+
+        self.assertEqual(
+            client.get_organization(ORGANIZATION_ID), {"id": ORGANIZATION_ID}
+        )
+        self.assertEqual(len(requests), 2)
+
+    def test_client_doesnt_hedge_writes(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            threading.Event().wait(0.1)
+            return httpx.Response(200, json={"id": ORGANIZATION_ID})
+
+        client = self._client(handler)
+        client.update_organization(ORGANIZATION_ID, "name", None, None)
+
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(self.policy.stats["requests"], 0)
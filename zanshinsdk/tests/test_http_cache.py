@@ -0,0 +1,164 @@
+import tempfile
+import unittest
+from unittest.mock import mock_open, patch
+
+import httpx
+
+import zanshinsdk
+from zanshinsdk.common.http_cache import (
+    FileHttpCache,
+    HttpCacheEntry,
+    InMemoryHttpCache,
+    http_cache_key,
+)
+
+
+class TestHttpCache(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    @patch("zanshinsdk.client.isfile")
+    def setUp(self, mock_is_file):
+        mock_is_file.return_value = True
+        _data = "[default]\napi_key=api_key"
+
+        self.api_url = "https://api.test"
+        self.requests = []
+        self.etag = '"v1"'
+        self.modified = False
+
+        with patch("__main__.__builtins__.open", mock_open(read_data=_data)):
+            self.sdk = zanshinsdk.Client(
+                api_url=self.api_url, http_cache=InMemoryHttpCache()
+            )
+        self.sdk._client = httpx.Client(transport=httpx.MockTransport(self._handler))
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag and not self.modified:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={"id": "me", "etag": self.etag},
+            headers={"ETag": self.etag},
+        )
+
+    ###################################################
+    # HttpCacheEntry
+    ###################################################
+
+    def test_entry_from_response_without_validators(self):
+        response = httpx.Response(200, json={})
+
+        self.assertIsNone(HttpCacheEntry.from_response(response))
+
+    def test_entry_from_response_no_store(self):
+        response = httpx.Response(
+            200, json={}, headers={"ETag": '"a"', "Cache-Control": "no-store"}
+        )
+
+        self.assertIsNone(HttpCacheEntry.from_response(response))
+
+    def test_entry_validators(self):
+        entry = HttpCacheEntry(
+            b"{}", etag='"a"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT"
+        )
+
+        self.assertEqual(
+            entry.validators(),
+            {
+                "If-None-Match": '"a"',
+                "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+            },
+        )
+
+    def test_entry_dict_round_trip(self):
+        entry = HttpCacheEntry(
+            b'{"a": 1}', etag='"a"', headers={"content-type": "application/json"}
+        )
+
+        copy = HttpCacheEntry.from_dict(entry.to_dict())
+
+        self.assertEqual(copy.content, entry.content)
+        self.assertEqual(copy.etag, entry.etag)
+        self.assertEqual(copy.headers, entry.headers)
+
+    ###################################################
+    # Storage
+    ###################################################
+
+    def test_in_memory_cache_evicts_least_recently_used(self):
+        cache = InMemoryHttpCache(max_entries=2)
+        cache.set("a", HttpCacheEntry(b"a", etag="a"))
+        cache.set("b", HttpCacheEntry(b"b", etag="b"))
+        cache.get("a")
+        cache.set("c", HttpCacheEntry(b"c", etag="c"))
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_in_memory_cache_invalid_size(self):
+        with self.assertRaises(ValueError):
+            InMemoryHttpCache(max_entries=0)
+
+    def test_file_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileHttpCache(directory)
+            cache.set("key", HttpCacheEntry(b"body", etag='"a"'))
+
+            self.assertEqual(FileHttpCache(directory).get("key").content, b"body")
+
+            cache.delete("key")
+            self.assertIsNone(cache.get("key"))
+
+            cache.set("key", HttpCacheEntry(b"body", etag='"a"'))
+            cache.clear()
+            self.assertIsNone(cache.get("key"))
+
+    def test_cache_key_depends_on_api_key(self):
+        self.assertNotEqual(
+            http_cache_key("key1", "GET", "https://api.test/me"),
+            http_cache_key("key2", "GET", "https://api.test/me"),
+        )
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def test_conditional_request_served_from_cache(self):
+        first = self.sdk.get_me()
+        second = self.sdk.get_me()
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.requests), 2)
+        self.assertNotIn("If-None-Match", self.requests[0].headers)
+        self.assertEqual(self.requests[1].headers["If-None-Match"], self.etag)
+
+    def test_conditional_request_refreshes_modified_entry(self):
+        self.sdk.get_me()
+        self.modified = True
+        self.etag = '"v2"'
+
+        self.assertEqual(self.sdk.get_me()["etag"], '"v2"')
+        self.modified = False
+        self.sdk.get_me()
+        self.assertEqual(self.requests[2].headers["If-None-Match"], '"v2"')
+
+    def test_conditional_request_ignores_other_methods(self):
+        self.sdk.create_organization("name")
+        self.sdk.create_organization("name")
+
+        self.assertNotIn("If-None-Match", self.requests[1].headers)
+
+    def test_set_invalid_http_cache(self):
+        with self.assertRaises(TypeError):
+            self.sdk.http_cache = {}
+
+    def test_disable_http_cache(self):
+        self.sdk.get_me()
+        self.sdk.http_cache = None
+        self.sdk.get_me()
+
+        self.assertNotIn("If-None-Match", self.requests[1].headers)
@@ -0,0 +1,154 @@
+import unittest
+from unittest.mock import mock_open, patch
+
+import httpx
+
+import zanshinsdk
+from zanshinsdk.common.instrumentation import (
+    AbstractInstrumentation,
+    EndpointMetrics,
+    MetricsCollector,
+    RequestEvent,
+)
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+class RecordingInstrumentation(AbstractInstrumentation):
+    def __init__(self):
+        self.calls = []
+
+    def on_request_start(self, event):
+        self.calls.append(("start", event.method, event.path, event.status_code))
+
+    def on_request_end(self, event):
+        self.calls.append(("end", event.method, event.path, event.status_code))
+
+
+class TestInstrumentation(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    @patch("zanshinsdk.client.isfile")
+    def setUp(self, mock_is_file):
+        mock_is_file.return_value = True
+        _data = "[default]\napi_key=api_key"
+
+        self.status_code = 200
+        self.metrics = MetricsCollector()
+        with patch("__main__.__builtins__.open", mock_open(read_data=_data)):
+            self.sdk = zanshinsdk.Client(
+                api_url="https://api.test", instrumentations=[self.metrics]
+            )
+        self.sdk._client = httpx.Client(transport=httpx.MockTransport(self._handler))
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(self.status_code, json={"data": []})
+
+    def _event(self, duration, status_code=200):
+        event = RequestEvent("get", "/me", "https://api.test/me")
+        event.duration = duration
+        event.status_code = status_code
+        return event
+
+    ###################################################
+    # EndpointMetrics
+    ###################################################
+
+    def test_histogram(self):
+        metrics = EndpointMetrics(buckets=(0.1, 1.0))
+        for duration in (0.05, 0.5, 0.5, 2.0):
+            metrics.record(self._event(duration))
+
+        self.assertEqual(metrics.bucket_counts, [1, 2, 1])
+        self.assertEqual(metrics.count, 4)
+        self.assertEqual(metrics.min_duration, 0.05)
+        self.assertEqual(metrics.max_duration, 2.0)
+        self.assertAlmostEqual(metrics.mean_duration, 0.7625)
+        self.assertEqual(metrics.percentile(25), 0.1)
+        self.assertEqual(metrics.percentile(50), 1.0)
+        self.assertEqual(metrics.percentile(100), 2.0)
+        self.assertEqual(
+            metrics.to_dict()["histogram"], {"0.1": 1, "1.0": 2, "+Inf": 1}
+        )
+
+    def test_errors(self):
+        metrics = EndpointMetrics()
+        metrics.record(self._event(0.1, 404))
+        failed = self._event(0.1, None)
+        failed.error = httpx.ConnectError("boom")
+        metrics.record(failed)
+        metrics.record(self._event(0.1))
+
+        self.assertEqual(metrics.errors, 2)
+        self.assertEqual(metrics.status_codes, {404: 1, 200: 1})
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            MetricsCollector(buckets=())
+        with self.assertRaises(ValueError):
+            MetricsCollector(buckets=(1.0, 0.5))
+        with self.assertRaises(ValueError):
+            EndpointMetrics().percentile(101)
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def test_metrics_per_templated_path(self):
+        self.sdk.get_organization(ORGANIZATION_ID)
+        self.sdk.get_organization("a22f4225-43e9-4922-b6b8-8b0620bdb1e3")
+        self.sdk.get_me()
+
+        snapshot = self.metrics.snapshot()
+
+        self.assertEqual(set(snapshot), {"GET /organizations/{id}", "GET /me"})
+        self.assertEqual(snapshot["GET /organizations/{id}"]["count"], 2)
+        self.assertEqual(snapshot["GET /organizations/{id}"]["errors"], 0)
+        self.assertEqual(
+            self.metrics.get("GET", "/me").response_bytes, len(b'{"data":[]}')
+        )
+
+    def test_failed_requests_are_counted(self):
+        self.status_code = 500
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.sdk.get_me()
+
+        metrics = self.metrics.get("GET", "/me")
+        self.assertEqual(metrics.errors, 1)
+        self.assertEqual(metrics.status_codes, {500: 1})
+
+    def test_hooks_are_called_in_order(self):
+        recording = RecordingInstrumentation()
+        self.sdk.add_instrumentation(recording)
+
+        self.sdk.get_me()
+
+        self.assertEqual(
+            recording.calls,
+            [("start", "GET", "/me", None), ("end", "GET", "/me", 200)],
+        )
+
+    def test_failing_hook_does_not_break_requests(self):
+        class Failing(AbstractInstrumentation):
+            def on_request_end(self, event):
+                raise RuntimeError("boom")
+
+        self.sdk.add_instrumentation(Failing())
+
+        with self.assertLogs("zanshinsdk", "ERROR"):
+            self.assertEqual(self.sdk.get_me(), {"data": []})
+
+    def test_remove_instrumentation(self):
+        self.sdk.remove_instrumentation(self.metrics)
+
+        self.sdk.get_me()
+
+        self.assertEqual(self.sdk.instrumentations, [])
+        self.assertEqual(self.metrics.snapshot(), {})
+
+    def test_add_invalid_instrumentation(self):
+        with self.assertRaises(TypeError):
+            self.sdk.add_instrumentation(object())
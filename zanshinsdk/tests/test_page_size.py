@@ -0,0 +1,119 @@
+import json
+import unittest
+
+import httpx
+
+from zanshinsdk.client import Client
+from zanshinsdk.common.page_size import AdaptivePageSize
+from zanshinsdk.common.transport import SharedTransport
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+class TestAdaptivePageSize(unittest.TestCase):
+    ###################################################
+    # record
+    ###################################################
+
+    def test_fast_full_pages_grow(self):
+        page_size = AdaptivePageSize(initial=100, max_size=300, target_latency=2)
+
+        self.assertEqual(page_size.record(items=100, duration=0.5), 200)
+        self.assertEqual(page_size.record(items=200, duration=0.5), 300)
+
+    def test_short_pages_dont_grow(self):
+        page_size = AdaptivePageSize(initial=100, target_latency=2)
+
+        self.assertEqual(page_size.record(items=10, duration=0.5), 100)
+
+    def test_slow_pages_shrink(self):
+        page_size = AdaptivePageSize(initial=100, min_size=40, target_latency=2)
+
+        self.assertEqual(page_size.record(items=100, duration=3), 66)
+        self.assertEqual(page_size.record(items=66, duration=10), 40)
+
+    def test_page_bytes_are_capped(self):
+        page_size = AdaptivePageSize(initial=100, max_page_bytes=10000)
+
+        self.assertEqual(
+            page_size.record(items=100, duration=0.5, response_bytes=50000), 20
+        )
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            AdaptivePageSize(min_size=0)
+        with self.assertRaises(ValueError):
+            AdaptivePageSize(initial=5, min_size=10)
+        with self.assertRaises(ValueError):
+            AdaptivePageSize(target_latency=0)
+
+    ###################################################
+    # load
+    ###################################################
+
+    def test_load_retries_smaller_pages_after_timeouts(self):
+        page_size = AdaptivePageSize(initial=100, min_size=10)
+        sizes = []
+
+        def load_page(size):
+            sizes.append(size)
+            if size > 30:
+                raise httpx.ReadTimeout("timed out")
+            return {"data": []}
+
+        self.assertEqual(page_size.load(load_page), {"data": []})
+        self.assertEqual(sizes, [100, 50, 25])
+
+    def test_load_gives_up(self):
+        page_size = AdaptivePageSize(initial=100, max_retries=1)
+        response = httpx.Response(503, request=httpx.Request("GET", "https://x"))
+
+        def load_page(size):
+            raise httpx.HTTPStatusError("unavailable", request=None, response=response)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            page_size.load(load_page)
+        self.assertEqual(page_size.size, 50)
+
+    def test_load_doesnt_retry_client_errors(self):
+        page_size = AdaptivePageSize(initial=100)
+
+        def load_page(size):
+            raise ValueError("invalid")
+
+        with self.assertRaises(ValueError):
+            page_size.load(load_page)
+        self.assertEqual(page_size.size, 100)
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def test_iter_alerts_history_tunes_page_size(self):
+        sizes = []
+        response_bytes = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            size = json.loads(request.content)["pageSize"]
+            sizes.append(size)
+            if len(sizes) > 3:
+                return httpx.Response(200, json={"data": []})
+            data = [
+                {"id": str(i), "cursor": str(i), "padding": "x" * 100}
+                for i in range(size)
+            ]
+            response = httpx.Response(200, json={"data": data})
+            response_bytes.append(len(response.content))
+            return response
+
+        transport = SharedTransport(transport=httpx.MockTransport(handler))
+        client = Client(api_key="key", api_url="https://api.test", transport=transport)
+        page_size = AdaptivePageSize(initial=20, max_page_bytes=4000)
+
+        alerts = list(client.iter_alerts_history(ORGANIZATION_ID, page_size=page_size))
+
+        # fast pages grow until responses reach max_page_bytes
+        self.assertEqual(sizes[0], 20)
+        self.assertTrue(20 < sizes[1] <= 40)
+        self.assertTrue(all(size <= 4000 for size in response_bytes))
+        self.assertEqual(len(alerts), sum(sizes[:3]))
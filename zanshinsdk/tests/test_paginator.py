@@ -0,0 +1,169 @@
+import unittest
+from unittest.mock import Mock, call, mock_open, patch
+
+import httpx
+
+import zanshinsdk
+from zanshinsdk.common.page_size import AdaptivePageSize
+from zanshinsdk.common.paginator import CURSOR, ITEM_CURSOR, PAGE_NUMBER, Paginator
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+def _item_cursor_pages(total):
+    """Loads pages of an ITEM_CURSOR paginated operation holding the given number of items."""
+
+    def load_page(page_size, cursor):
+        start = 0 if cursor is None else cursor + 1
+        return {
+            "data": [{"cursor": i} for i in range(start, min(start + page_size, total))]
+        }
+
+    return Mock(side_effect=load_page)
+
+
+class TestPaginator(unittest.TestCase):
+    ###################################################
+    # styles
+    ###################################################
+
+    def test_cursor(self):
+        load_page = Mock(
+            side_effect=[{"data": [1, 2], "cursor": "a"}, {"data": [3], "cursor": None}]
+        )
+
+        items = list(Paginator(load_page, CURSOR, page_size=2))
+
+        self.assertEqual(items, [1, 2, 3])
+        load_page.assert_has_calls(
+            [call(page_size=2, cursor=None), call(page_size=2, cursor="a")]
+        )
+
+    def test_item_cursor_stops_on_short_page(self):
+        load_page = _item_cursor_pages(5)
+
+        items = list(Paginator(load_page, ITEM_CURSOR, page_size=2))
+
+        self.assertEqual([item["cursor"] for item in items], [0, 1, 2, 3, 4])
+        # no request is made for the empty page after the short one
+        self.assertEqual(load_page.call_count, 3)
+
+    def test_item_cursor_without_short_page_stop(self):
+        load_page = _item_cursor_pages(4)
+
+        items = list(
+            Paginator(load_page, ITEM_CURSOR, page_size=2, stop_on_short_page=False)
+        )
+
+        self.assertEqual(len(items), 4)
+        self.assertEqual(load_page.call_count, 3)
+
+    def test_page_number(self):
+        load_page = Mock(
+            side_effect=[{"data": [1, 2], "total": 5}, {"data": [3, 4]}, {"data": [5]}]
+        )
+
+        items = list(Paginator(load_page, PAGE_NUMBER, page_size=2))
+
+        self.assertEqual(items, [1, 2, 3, 4, 5])
+        load_page.assert_has_calls(
+            [
+                call(page_size=2, page=1),
+                call(page_size=2, page=2),
+                call(page_size=2, page=3),
+            ]
+        )
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            Paginator(Mock(), "offset")
+        with self.assertRaises(ValueError):
+            Paginator(Mock(), limit=-1)
+        with self.assertRaises(TypeError):
+            Paginator(Mock(), PAGE_NUMBER, page_size=AdaptivePageSize())
+
+    ###################################################
+    # limit
+    ###################################################
+
+    def test_limit_shrinks_last_request(self):
+        load_page = _item_cursor_pages(100)
+
+        items = list(Paginator(load_page, ITEM_CURSOR, page_size=4, limit=6))
+
+        self.assertEqual(len(items), 6)
+        load_page.assert_has_calls(
+            [call(page_size=4, cursor=None), call(page_size=2, cursor=3)]
+        )
+        self.assertEqual(load_page.call_count, 2)
+
+    def test_limit_respects_min_page_size(self):
+        load_page = _item_cursor_pages(100)
+
+        items = list(
+            Paginator(load_page, ITEM_CURSOR, page_size=50, limit=3, min_page_size=10)
+        )
+
+        self.assertEqual(len(items), 3)
+        load_page.assert_called_once_with(page_size=10, cursor=None)
+
+    def test_limit_caps_adaptive_page_size(self):
+        load_page = _item_cursor_pages(100)
+
+        items = list(
+            Paginator(
+                load_page,
+                ITEM_CURSOR,
+                page_size=AdaptivePageSize(initial=50),
+                limit=20,
+            )
+        )
+
+        self.assertEqual(len(items), 20)
+        load_page.assert_called_once_with(page_size=20, cursor=None)
+
+    ###################################################
+    # iter_pages
+    ###################################################
+
+    def test_iter_pages(self):
+        pages = list(
+            Paginator(_item_cursor_pages(3), ITEM_CURSOR, page_size=2).iter_pages()
+        )
+
+        self.assertEqual([page.number for page in pages], [1, 2])
+        self.assertEqual([page.item_count for page in pages], [2, 1])
+        self.assertEqual([page.cursor for page in pages], [None, 1])
+        self.assertEqual([page.next_cursor for page in pages], [1, None])
+        self.assertEqual(pages[0].page_size, 2)
+        self.assertIsNone(pages[0].bytes)
+
+    @patch("zanshinsdk.client.isfile")
+    def test_client_iter_pages(self, mock_is_file):
+        mock_is_file.return_value = True
+        _data = "[default]\napi_key=api_key"
+        with patch("__main__.__builtins__.open", mock_open(read_data=_data)):
+            client = zanshinsdk.Client()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.params.get("cursor"):
+                return httpx.Response(200, json={"data": [{"id": 3}]})
+            return httpx.Response(
+                200, json={"data": [{"id": 1}, {"id": 2}], "cursor": "c"}
+            )
+
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        pages = list(client.iter_pages("iter_alerts", ORGANIZATION_ID, page_size=2))
+
+        self.assertEqual(
+            [page.items for page in pages], [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+        )
+        self.assertEqual(pages[0].next_cursor, "c")
+        self.assertGreater(pages[0].bytes, 0)
+        self.assertEqual(
+            list(client.iter_alerts(ORGANIZATION_ID, page_size=2, limit=2)),
+            [{"id": 1}, {"id": 2}],
+        )
+        with self.assertRaises(TypeError):
+            list(client.iter_pages(client.iter_organizations))
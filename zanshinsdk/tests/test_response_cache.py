@@ -0,0 +1,312 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import mock_open, patch
+
+import httpx
+
+import zanshinsdk
+from zanshinsdk.common.paths import (
+    READ_ONLY_POST_PATHS,
+    ROUTES,
+    is_read_only_request,
+    templated_path,
+)
+from zanshinsdk.common.response_cache import (
+    CachedResponse,
+    DiskResponseCache,
+    response_cache_key,
+)
+
+
+class TestResponseCache(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    @patch("zanshinsdk.client.isfile")
+    def setUp(self, mock_is_file):
+        mock_is_file.return_value = True
+        _data = "[default]\napi_key=api_key"
+
+        self.now = 1000.0
+        self.requests = []
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = DiskResponseCache(
+            os.path.join(self.directory.name, "cache.sqlite"),
+            ttl=60,
+            max_size=100,
+            clock=lambda: self.now,
+        )
+
+        with patch("__main__.__builtins__.open", mock_open(read_data=_data)):
+            self.sdk = zanshinsdk.Client(api_url="https://api.test")
+        self.sdk._client = httpx.Client(transport=httpx.MockTransport(self._handler))
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(200, json={"data": [len(self.requests)]})
+
+    ###################################################
+    # paths
+    ###################################################
+
+    def test_templated_path(self):
+        self.assertEqual(
+            templated_path(
+                "/organizations/822f4225-43e9-4922-b6b8-8b0620bdb1e3/invites/a@b.com"
+            ),
+            "/organizations/{id}/invites/{email}",
+        )
+        self.assertEqual(templated_path("/oauth/link?organizationId=1"), "/oauth/link")
+
+    def test_templated_path_of_ids_that_are_not_uuids(self):
+        organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+        scan_target_id = "9b7b6b38-6f1c-4bb4-a5a4-0d6f2ae0c5a1"
+
+        self.assertEqual(
+            templated_path(
+                f"/organizations/{organization_id}/scantargets/{scan_target_id}/scans/slot-1"
+            ),
+            "/organizations/{id}/scantargets/{id}/scans/{id}",
+        )
+        self.assertEqual(
+            templated_path(
+                f"/organizations/{organization_id}/followers/requests/tok3n"
+            ),
+            "/organizations/{id}/followers/requests/{id}",
+        )
+        self.assertEqual(
+            templated_path(f"/organizations/{organization_id}/following/requests"),
+            "/organizations/{id}/following/requests",
+        )
+        self.assertEqual(
+            templated_path(f"/organizations/{organization_id}/alerts/rules"),
+            "/organizations/{id}/alerts/rules",
+        )
+        self.assertEqual(templated_path("/alerts/history"), "/alerts/history")
+        # paths outside the routes of the API only template what looks like an ID
+        self.assertEqual(
+            templated_path(f"/unknown/{organization_id}/slot-1"), "/unknown/{id}/slot-1"
+        )
+        for path in READ_ONLY_POST_PATHS:
+            self.assertIn(path, ROUTES)
+
+    def test_is_read_only_request(self):
+        organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+        self.assertTrue(is_read_only_request("GET", "/me"))
+        self.assertTrue(
+            is_read_only_request("POST", f"/organizations/{organization_id}/alerts")
+        )
+        self.assertTrue(is_read_only_request("POST", "/alerts/history"))
+        self.assertFalse(is_read_only_request("POST", "/organizations"))
+        self.assertFalse(
+            is_read_only_request(
+                "PUT", f"/organizations/{organization_id}/alerts/status/batch"
+            )
+        )
+
+    ###################################################
+    # DiskResponseCache
+    ###################################################
+
+    def test_key_depends_on_body(self):
+        self.assertNotEqual(
+            response_cache_key("key", "POST", "/alerts/history", body={"a": 1}),
+            response_cache_key("key", "POST", "/alerts/history", body={"a": 2}),
+        )
+        self.assertEqual(
+            response_cache_key("key", "POST", "/p", body={"a": 1, "b": 2}),
+            response_cache_key("key", "POST", "/p", body={"b": 2, "a": 1}),
+        )
+
+    def test_key_depends_on_api(self):
+        self.assertNotEqual(
+            response_cache_key("key", "GET", "https://api.staging.test/me"),
+            response_cache_key("key", "GET", "https://api.test/me"),
+        )
+
+    def test_ttl(self):
+        self.cache.set("key", CachedResponse(b"body"))
+
+        self.now += 59
+        self.assertEqual(self.cache.get("key").content, b"body")
+        self.now += 1
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        self.cache.set("a", CachedResponse(b"a" * 40))
+        self.now += 1
+        self.cache.set("b", CachedResponse(b"b" * 40))
+        self.now += 1
+        self.cache.get("a")
+        self.now += 1
+        self.cache.set("c", CachedResponse(b"c" * 40))
+
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+        self.assertLessEqual(self.cache.size, 100)
+
+    def test_set_only_sums_sizes_to_evict(self):
+        statements = []
+        self.cache._connection.set_trace_callback(statements.append)
+
+        self.cache.set("a", CachedResponse(b"a" * 40))
+        self.cache.set("a", CachedResponse(b"a" * 30))
+        self.cache.set("b", CachedResponse(b"b" * 40))
+        self.cache.delete("b")
+        self.assertFalse([s for s in statements if "SUM" in s])
+        self.assertEqual(self.cache._total, 30)
+
+        self.cache.set("c", CachedResponse(b"c" * 80))
+        self.assertTrue([s for s in statements if "SUM" in s])
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache._total, 80)
+        self.assertEqual(self.cache.size, 80)
+
+    def test_entry_larger_than_cache(self):
+        self.cache.set("a", CachedResponse(b"a" * 101))
+
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_persistence(self):
+        self.cache.set("key", CachedResponse(b"body", {"content-type": "text/plain"}))
+
+        other = DiskResponseCache(self.cache.filename, clock=lambda: self.now)
+        try:
+            self.assertEqual(other.get("key").headers["content-type"], "text/plain")
+        finally:
+            other.close()
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            DiskResponseCache(self.cache.filename, ttl=0)
+        with self.assertRaises(ValueError):
+            DiskResponseCache(self.cache.filename, max_size=0)
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def test_client_serves_read_requests_from_cache(self):
+        organization_id = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+        self.sdk.response_cache = self.cache
+
+        first = list(self.sdk.iter_alerts(organization_id))
+        second = list(self.sdk.iter_alerts(organization_id))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_clients_of_different_apis_share_a_cache_file(self):
+        self.sdk.response_cache = self.cache
+        with patch("zanshinsdk.client.isfile", return_value=False):
+            staging = zanshinsdk.Client(
+                api_key="api_key",
+                api_url="https://api.staging.test",
+                response_cache=self.cache,
+            )
+        staging._client = httpx.Client(transport=httpx.MockTransport(self._handler))
+
+        production_me = self.sdk.get_me()
+        staging_me = staging.get_me()
+
+        self.assertEqual(len(self.requests), 2)
+        self.assertNotEqual(production_me, staging_me)
+        self.assertEqual(self.sdk.get_me(), production_me)
+        self.assertEqual(staging.get_me(), staging_me)
+
+    def test_client_does_not_cache_writes(self):
+        self.sdk.response_cache = self.cache
+
+        self.sdk.create_organization("name")
+        self.sdk.create_organization("name")
+
+        self.assertEqual(len(self.requests), 2)
+
+    def test_client_cached_context_manager(self):
+        with self.sdk.cached(self.cache):
+            self.sdk.get_me()
+            self.sdk.get_me()
+        self.sdk.get_me()
+
+        self.assertIsNone(self.sdk.response_cache)
+        self.assertEqual(len(self.requests), 2)
+
+    def test_client_cached_only_applies_to_the_current_thread(self):
+        in_block = threading.Event()
+        other_thread_done = threading.Event()
+        seen = []
+
+        def other_thread():
+            in_block.wait(5)
+            seen.append(self.sdk.response_cache)
+            self.sdk.get_me()
+            other_thread_done.set()
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        with self.sdk.cached(self.cache):
+            self.assertIs(self.sdk.response_cache, self.cache)
+            self.sdk.get_me()
+            in_block.set()
+            other_thread_done.wait(5)
+            self.sdk.get_me()
+        thread.join()
+
+        self.assertEqual(seen, [None])
+        # the other thread went to the API, the second request of the block was served from the cache
+        self.assertEqual(len(self.requests), 2)
+
+    def test_client_cache_expires(self):
+        self.sdk.response_cache = self.cache
+
+        self.sdk.get_me()
+        self.now += 60
+        self.sdk.get_me()
+
+        self.assertEqual(len(self.requests), 2)
+
+    def test_client_uncached(self):
+        self.sdk.response_cache = self.cache
+
+        self.sdk.get_me()
+        with self.sdk.uncached():
+            fresh = self.sdk.get_me()
+        cached = self.sdk.get_me()
+
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(fresh, {"data": [2]})
+        self.assertEqual(cached, fresh)
+
+    @patch("zanshinsdk.client.time.sleep")
+    def test_watch_alerts_bypasses_cache(self, sleep):
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return httpx.Response(
+                200, json={"data": [{"id": "a", "updatedAt": "2022-07-10T00:10:00Z"}]}
+            )
+
+        self.sdk._client = httpx.Client(transport=httpx.MockTransport(handler))
+        self.sdk.response_cache = self.cache
+
+        alerts = list(
+            self.sdk.watch_alerts(
+                "822f4225-43e9-4922-b6b8-8b0620bdb1e3", overlap=0, max_polls=3
+            )
+        )
+
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(len(self.requests), 3)
+
+    def test_set_invalid_response_cache(self):
+        with self.assertRaises(TypeError):
+            self.sdk.response_cache = {}
@@ -0,0 +1,191 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from zanshinsdk.common.waiter import Waiter
+from zanshinsdk.scan_orchestrator import ScanOrchestrator
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+SCAN_TARGET_IDS = [
+    "e22f4225-43e9-4922-b6b8-8b0620bdb110",
+    "e22f4225-43e9-4922-b6b8-8b0620bdb111",
+    "e22f4225-43e9-4922-b6b8-8b0620bdb112",
+]
+
+
+class FakeScanApi(object):
+    """Simulates scans that finish a given number of polls after being started."""
+
+    def __init__(self, polls_until_done, final_status="DONE"):
+        self.polls_until_done = polls_until_done
+        self.final_status = final_status
+        self.lock = threading.Lock()
+        self.scans = {}
+        self.polls = {}
+        self.running = 0
+        self.max_running = 0
+
+    def start(self, organization_id, scan_target_id, force):
+        with self.lock:
+            self.scans[scan_target_id] = {
+                "slot": f"slot-{scan_target_id}",
+                "createdAt": "2022-07-10T00:04:08.076Z",
+                "status": "RUNNING",
+            }
+            self.polls[scan_target_id] = 0
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        return True
+
+    def iter_scans(self, organization_id, scan_target_id):
+        previous = {
+            "slot": "old",
+            "createdAt": "2022-07-09T00:04:08.076Z",
+            "status": "DONE",
+        }
+        with self.lock:
+            scan = self.scans.get(scan_target_id)
+            if scan is None:
+                return iter([previous])
+            self.polls[scan_target_id] += 1
+            if (
+                scan["status"] == "RUNNING"
+                and self.polls[scan_target_id] > self.polls_until_done[scan_target_id]
+            ):
+                scan["status"] = self.final_status
+                self.running -= 1
+            return iter([previous, dict(scan)])
+
+
+class TestScanOrchestrator(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.now = 0.0
+        self.sleeps = []
+        self.client = MagicMock()
+
+    def _sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def _orchestrator(self, api, timeout=100, **kwargs):
+        self.client.start_organization_scan_target_scan.side_effect = api.start
+        self.client.iter_organization_scan_target_scans.side_effect = api.iter_scans
+        waiter = Waiter(
+            initial_delay=1,
+            max_delay=4,
+            timeout=timeout,
+            sleep=self._sleep,
+            clock=lambda: self.now,
+        )
+        return ScanOrchestrator(self.client, ORGANIZATION_ID, waiter=waiter, **kwargs)
+
+    ###################################################
+    # run
+    ###################################################
+
+    def test_events_are_yielded_as_scans_finish(self):
+        api = FakeScanApi(dict(zip(SCAN_TARGET_IDS, [2, 0, 1])))
+        orchestrator = self._orchestrator(api)
+
+        events = list(orchestrator.iter_events(SCAN_TARGET_IDS))
+
+        self.assertEqual(
+            [event["scanTargetId"] for event in events],
+            [SCAN_TARGET_IDS[1], SCAN_TARGET_IDS[2], SCAN_TARGET_IDS[0]],
+        )
+        self.assertTrue(all(event["status"] == "DONE" for event in events))
+        self.assertEqual(events[0]["scanId"], f"slot-{SCAN_TARGET_IDS[1]}")
+        self.assertEqual(self.sleeps, [1, 2, 4])
+        self.assertEqual(orchestrator.summary["DONE"], 3)
+        self.assertEqual(orchestrator.summary["total"], 3)
+
+    def test_scans_are_polled_uncached(self):
+        api = FakeScanApi(dict.fromkeys(SCAN_TARGET_IDS, 1))
+        polled_uncached = []
+
+        def iter_scans(organization_id, scan_target_id):
+            polled_uncached.append(self.client.uncached.return_value.__enter__.called)
+            return api.iter_scans(organization_id, scan_target_id)
+
+        orchestrator = self._orchestrator(api)
+        self.client.iter_organization_scan_target_scans.side_effect = iter_scans
+
+        orchestrator.run(SCAN_TARGET_IDS)
+
+        self.assertTrue(polled_uncached)
+        self.assertTrue(all(polled_uncached))
+        self.assertEqual(
+            self.client.uncached.call_count,
+            self.client.iter_organization_scan_target_scans.call_count,
+        )
+
+    def test_concurrency_cap(self):
+        api = FakeScanApi(dict.fromkeys(SCAN_TARGET_IDS, 1))
+        orchestrator = self._orchestrator(api, max_concurrent_scans=2)
+
+        summary = orchestrator.run(SCAN_TARGET_IDS)
+
+        self.assertEqual(summary["DONE"], 3)
+        self.assertEqual(api.max_running, 2)
+
+    def test_scans_all_scan_targets_by_default(self):
+        api = FakeScanApi(dict.fromkeys(SCAN_TARGET_IDS, 0))
+        self.client.iter_organization_scan_targets.return_value = iter(
+            [{"id": scan_target_id} for scan_target_id in SCAN_TARGET_IDS]
+        )
+
+        summary = self._orchestrator(api).run()
+
+        self.client.iter_organization_scan_targets.assert_called_once_with(
+            ORGANIZATION_ID
+        )
+        self.assertEqual(summary["DONE"], 3)
+
+    def test_failed_scans(self):
+        api = FakeScanApi(dict.fromkeys(SCAN_TARGET_IDS, 0), final_status="ERROR")
+        orchestrator = self._orchestrator(api)
+
+        summary = orchestrator.run(SCAN_TARGET_IDS[:1])
+
+        self.assertEqual(summary["FAILED"], 1)
+        self.assertEqual(
+            summary["events"][0]["error"], "Scan finished with status ERROR"
+        )
+
+    def test_scan_that_cannot_be_started(self):
+        api = FakeScanApi(dict.fromkeys(SCAN_TARGET_IDS, 0))
+        orchestrator = self._orchestrator(api)
+
+        def start(organization_id, scan_target_id, force):
+            if scan_target_id == SCAN_TARGET_IDS[0]:
+                raise Exception("Forbidden")
+            return api.start(organization_id, scan_target_id, force)
+
+        self.client.start_organization_scan_target_scan.side_effect = start
+
+        events = list(orchestrator.iter_events(SCAN_TARGET_IDS[:2]))
+
+        self.assertEqual(
+            [(event["status"], event["error"]) for event in events],
+            [("FAILED", "Forbidden"), ("DONE", None)],
+        )
+
+    def test_timeout(self):
+        api = FakeScanApi(dict.fromkeys(SCAN_TARGET_IDS, 1000))
+        orchestrator = self._orchestrator(api, timeout=10, max_concurrent_scans=2)
+
+        summary = orchestrator.run(SCAN_TARGET_IDS)
+
+        self.assertEqual(summary["TIMED_OUT"], 3)
+        self.assertEqual(sum(self.sleeps), 10)
+        self.assertEqual(self.client.start_organization_scan_target_scan.call_count, 2)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            ScanOrchestrator(self.client, ORGANIZATION_ID, max_concurrent_scans=0)
+        with self.assertRaises(ValueError):
+            ScanOrchestrator(self.client, ORGANIZATION_ID, max_workers=0)
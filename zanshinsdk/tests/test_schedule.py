@@ -0,0 +1,94 @@
+import subprocess
+import sys
+import unittest
+
+import zanshinsdk
+from zanshinsdk.common.enums import Day, Frequency, TimeOfDay
+from zanshinsdk.common.schedule import ScanTargetSchedule
+
+
+class TestScanTargetSchedule(unittest.TestCase):
+    ###################################################
+    # ScanTargetSchedule
+    ###################################################
+
+    def test_value(self):
+        self.assertEqual(
+            zanshinsdk.DAILY.value(), {"frequency": "1d", "timeOfDay": "NIGHT"}
+        )
+        self.assertEqual(
+            zanshinsdk.WEEKLY.value(),
+            {"frequency": "7d", "timeOfDay": "NIGHT", "day": "SUNDAY"},
+        )
+        self.assertEqual(
+            ScanTargetSchedule(Frequency.SIX_HOURS).value(), {"frequency": "6h"}
+        )
+        self.assertEqual(
+            zanshinsdk.DAILY.json(), '{"frequency": "1d", "timeOfDay": "NIGHT"}'
+        )
+
+    def test_values_are_converted_to_enums(self):
+        schedule = ScanTargetSchedule("7d", timeOfDay="MORNING", day="MONDAY")
+
+        self.assertEqual(schedule.frequency, Frequency.WEEKLY)
+        self.assertEqual(schedule.time_of_day, TimeOfDay.MORNING)
+        self.assertEqual(schedule.day, Day.MONDAY)
+        self.assertEqual(
+            schedule,
+            ScanTargetSchedule(Frequency.WEEKLY, TimeOfDay.MORNING, Day.MONDAY),
+        )
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            ScanTargetSchedule("2d")
+        with self.assertRaises(ValueError):
+            ScanTargetSchedule(Frequency.DAILY, time_of_day="NOON")
+        with self.assertRaises(TypeError):
+            ScanTargetSchedule(Frequency.DAILY, hour=1)
+
+    ###################################################
+    # Lazy imports
+    ###################################################
+
+    def test_import_does_not_load_http_stack(self):
+        code = (
+            "import sys, zanshinsdk\n"
+            "from zanshinsdk import DAILY, ScanTargetKind\n"
+            "print(' '.join(name for name in ('httpx', 'pydantic', 'zanshinsdk.client') "
+            "if name in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+
+        self.assertEqual(output.strip(), "")
+
+    def test_lazy_attributes(self):
+        from zanshinsdk.client import Client
+
+        self.assertIs(zanshinsdk.Client, Client)
+        self.assertIn("Client", dir(zanshinsdk))
+        with self.assertRaises(AttributeError):
+            zanshinsdk.DoesNotExist
+
+    def test_lazy_submodules(self):
+        code = (
+            "import zanshinsdk\n"
+            "print(zanshinsdk.client.Client.__name__, zanshinsdk.iterator.__name__, "
+            "zanshinsdk.alerts_history.__name__, zanshinsdk.common.__name__)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+
+        self.assertEqual(
+            output.split(),
+            [
+                "Client",
+                "zanshinsdk.iterator",
+                "zanshinsdk.alerts_history",
+                "zanshinsdk.common",
+            ],
+        )
+        with self.assertRaises(AttributeError):
+            zanshinsdk.no_such_module
@@ -0,0 +1,180 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from zanshinsdk.client import Client
+from zanshinsdk.common.concurrency import AdaptiveConcurrencyLimiter
+from zanshinsdk.common.scheduler import (
+    BULK,
+    INTERACTIVE,
+    PriorityClass,
+    RequestScheduler,
+    request_priority,
+)
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def _acquire_in_thread(self, scheduler, priority, admitted):
+        def acquire():
+            scheduler.acquire(priority)
+            admitted.append(priority)
+
+        thread = threading.Thread(target=acquire, daemon=True)
+        thread.start()
+        return thread
+
+    def _wait_for_waiting(self, scheduler, priority, count):
+        for _ in range(200):
+            if scheduler.stats[priority]["waiting"] >= count:
+                return
+            time.sleep(0.005)
+        self.fail(f"no {priority} request waiting")
+
+    ###################################################
+    # Priority
+    ###################################################
+
+    def test_interactive_goes_before_waiting_bulk(self):
+        scheduler = RequestScheduler(max_concurrency=1)
+        scheduler.acquire(BULK)
+        admitted = []
+
+        bulk = self._acquire_in_thread(scheduler, BULK, admitted)
+        self._wait_for_waiting(scheduler, BULK, 1)
+        interactive = self._acquire_in_thread(scheduler, INTERACTIVE, admitted)
+        self._wait_for_waiting(scheduler, INTERACTIVE, 1)
+
+        scheduler.release(BULK)
+        interactive.join(1)
+        self.assertEqual(admitted, [INTERACTIVE])
+        scheduler.release(INTERACTIVE)
+        bulk.join(1)
+
+        self.assertEqual(admitted, [INTERACTIVE, BULK])
+        self.assertEqual(scheduler.stats[INTERACTIVE]["completed"], 1)
+
+    def test_bulk_leaves_capacity_to_interactive(self):
+        scheduler = RequestScheduler(max_concurrency=4)
+        for _ in range(3):
+            scheduler.acquire(BULK)
+        admitted = []
+
+        bulk = self._acquire_in_thread(scheduler, BULK, admitted)
+        self._wait_for_waiting(scheduler, BULK, 1)
+        scheduler.acquire(INTERACTIVE)
+
+        self.assertEqual(admitted, [])
+        self.assertEqual(
+            scheduler.stats[BULK], {"inFlight": 3, "waiting": 1, "completed": 0}
+        )
+        scheduler.release(BULK)
+        bulk.join(1)
+        self.assertEqual(admitted, [BULK])
+
+    def test_rate_share(self):
+        scheduler = RequestScheduler(max_concurrency=100, max_rate=40)
+        started = time.monotonic()
+        for _ in range(30):
+            scheduler.release(scheduler.acquire(BULK))
+        self.assertLess(time.monotonic() - started, 0.02)
+
+        scheduler.release(scheduler.acquire(BULK))
+        self.assertGreaterEqual(time.monotonic() - started, 0.02)
+        # interactive calls have their own share of the rate
+        started = time.monotonic()
+        scheduler.release(scheduler.acquire(INTERACTIVE))
+        self.assertLess(time.monotonic() - started, 0.02)
+
+    def test_capacity_follows_limiter(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=8)
+        scheduler = RequestScheduler(max_concurrency=limiter)
+
+        self.assertEqual(scheduler.capacity, 4)
+        limiter.release(limiter.acquire(), overloaded=True)
+        self.assertEqual(scheduler.capacity, 2)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            RequestScheduler(max_concurrency=0)
+        with self.assertRaises(ValueError):
+            RequestScheduler(classes=[PriorityClass(BULK, 1)])
+        with self.assertRaises(ValueError):
+            PriorityClass(BULK, 1, concurrency_share=0)
+        with self.assertRaises(ValueError):
+            RequestScheduler().acquire("urgent")
+
+    ###################################################
+    # Client
+    ###################################################
+
+    def test_client_pages_are_bulk(self):
+        scheduler = RequestScheduler()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                return httpx.Response(200, json={"data": [{"id": "a", "cursor": "1"}]})
+            return httpx.Response(200, json={"id": ORGANIZATION_ID})
+
+        with patch("zanshinsdk.client.isfile", return_value=False):
+            client = Client(
+                api_key="key", api_url="https://api.test", scheduler=scheduler
+            )
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        list(client.iter_alerts_history(ORGANIZATION_ID, page_size=2))
+        client.get_organization(ORGANIZATION_ID)
+        with request_priority(INTERACTIVE):
+            list(client.iter_alerts_history(ORGANIZATION_ID, page_size=2))
+        with request_priority(BULK):
+            client.get_organization(ORGANIZATION_ID)
+
+        self.assertEqual(scheduler.stats[BULK]["completed"], 2)
+        self.assertEqual(scheduler.stats[INTERACTIVE]["completed"], 2)
+
+    def test_client_with_limiter_is_only_gated_by_scheduler(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=4)
+        scheduler = RequestScheduler(max_concurrency=2)
+        release_pages = threading.Event()
+        completed = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path != "/me":
+                release_pages.wait(5)
+            completed.append(request.url.path)
+            return httpx.Response(200, json={"id": ORGANIZATION_ID})
+
+        with patch("zanshinsdk.client.isfile", return_value=False):
+            client = Client(
+                api_key="key",
+                api_url="https://api.test",
+                concurrency_limiter=limiter,
+                scheduler=scheduler,
+            )
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        def bulk_call():
+            with request_priority(BULK):
+                client.get_organization(ORGANIZATION_ID)
+
+        threads = [threading.Thread(target=bulk_call, daemon=True) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        # the bulk share of the scheduler lets one page through, the other one waits
+        self._wait_for_waiting(scheduler, BULK, 1)
+
+        # admitted ahead of the waiting page, it doesn't wait again behind the page in flight
+        client.get_me()
+        self.assertEqual(completed, ["/me"])
+        self.assertEqual(scheduler.stats[BULK]["waiting"], 1)
+
+        release_pages.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(completed), 3)
+        self.assertEqual(limiter.stats["requests"], 3)
+        self.assertEqual(limiter.in_flight, 0)
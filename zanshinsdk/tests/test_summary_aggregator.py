@@ -0,0 +1,147 @@
+import unittest
+from unittest.mock import Mock
+
+from zanshinsdk.summary_aggregator import SummaryAggregator
+
+ORGANIZATION_IDS = [
+    "822f4225-43e9-4922-b6b8-8b0620bdb1e3",
+    "822f4225-43e9-4922-b6b8-8b0620bdb1e4",
+]
+FOLLOWING_IDS = [
+    "a22f4225-43e9-4922-b6b8-8b0620bdb1e5",
+    "a22f4225-43e9-4922-b6b8-8b0620bdb1e6",
+]
+
+
+def _scan_target(scan_target_id, kind, critical, high, following_id=None):
+    scan_target = {
+        "scanTargetId": scan_target_id,
+        "name": f"{kind} account {scan_target_id}",
+        "kind": kind,
+        "alerts": {
+            "CRITICAL": critical,
+            "HIGH": high,
+            "MEDIUM": 0,
+            "LOW": 0,
+            "INFO": 1,
+        },
+    }
+    if following_id is not None:
+        scan_target["followingId"] = following_id
+    return scan_target
+
+
+class TestSummaryAggregator(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.iter_organizations.return_value = iter(
+            [{"id": organization_id} for organization_id in ORGANIZATION_IDS]
+        )
+        self.client.get_scan_target_detail_summary.side_effect = (
+            lambda organization_id, **kwargs: {
+                "data": [
+                    _scan_target(f"{organization_id}-st", "AWS", 1, 2),
+                ]
+            }
+        )
+        self.client.iter_organization_following.side_effect = (
+            lambda organization_id: iter(
+                [{"id": following_id} for following_id in FOLLOWING_IDS]
+            )
+        )
+        self.client.get_scan_targets_following_summary.return_value = {
+            "data": [
+                _scan_target("followed-st", "GCP", 0, 5, FOLLOWING_IDS[0]),
+                _scan_target("other-followed-st", "AZURE", 3, 0, FOLLOWING_IDS[1]),
+            ]
+        }
+
+    ###################################################
+    # run
+    ###################################################
+
+    def test_run_merges_every_summary(self):
+        result = SummaryAggregator(self.client, max_workers=4).run()
+
+        self.assertEqual(set(result["organizations"]), set(ORGANIZATION_IDS))
+        self.assertEqual(
+            result["followings"][ORGANIZATION_IDS[0]],
+            {
+                FOLLOWING_IDS[0]: [
+                    _scan_target("followed-st", "GCP", 0, 5, FOLLOWING_IDS[0])
+                ],
+                FOLLOWING_IDS[1]: [
+                    _scan_target("other-followed-st", "AZURE", 3, 0, FOLLOWING_IDS[1])
+                ],
+            },
+        )
+        # the followed scan targets are seen through both organizations, and counted once
+        self.assertEqual(
+            result["totals"]["severities"],
+            {"CRITICAL": 5, "HIGH": 9, "MEDIUM": 0, "LOW": 0, "INFO": 4},
+        )
+        self.assertEqual(
+            result["totals"]["kinds"]["AWS"],
+            {"CRITICAL": 2, "HIGH": 4, "MEDIUM": 0, "LOW": 0, "INFO": 2},
+        )
+        self.assertEqual(result["totals"]["kinds"]["GCP"]["HIGH"], 5)
+        self.assertEqual(result["totals"]["kinds"]["AZURE"]["CRITICAL"], 3)
+        self.assertEqual(len(result["totals"]["scanTargets"]), 4)
+        self.assertEqual(result["errors"], [])
+        # a single following summary request per organization
+        self.assertEqual(self.client.get_scan_targets_following_summary.call_count, 2)
+        self.client.get_scan_targets_following_summary.assert_called_with(
+            ORGANIZATION_IDS[1],
+            following_ids=FOLLOWING_IDS,
+            scan_target_kinds=None,
+            alert_severities=None,
+        )
+
+    def test_run_reports_unexpected_summaries(self):
+        self.client.get_scan_targets_following_summary.return_value = [
+            _scan_target("followed-st", "GCP", 0, 5, FOLLOWING_IDS[0])
+        ]
+
+        result = SummaryAggregator(self.client).run(ORGANIZATION_IDS[:1])
+
+        self.assertEqual(result["followings"], {})
+        self.assertEqual(result["totals"]["severities"]["CRITICAL"], 1)
+        self.assertEqual(
+            [error["operation"] for error in result["errors"]],
+            ["get_scan_targets_following_summary"],
+        )
+
+    def test_run_reports_partial_failures(self):
+        def detail_summary(organization_id, **kwargs):
+            if organization_id == ORGANIZATION_IDS[1]:
+                raise RuntimeError("unavailable")
+            return {"data": [_scan_target("st", "AWS", 1, 0)]}
+
+        self.client.get_scan_target_detail_summary.side_effect = detail_summary
+
+        result = SummaryAggregator(self.client).run(
+            ORGANIZATION_IDS, include_following=False
+        )
+
+        self.assertEqual(list(result["organizations"]), [ORGANIZATION_IDS[0]])
+        self.assertEqual(result["totals"]["severities"]["CRITICAL"], 1)
+        self.assertEqual(
+            result["errors"],
+            [
+                {
+                    "operation": "get_scan_target_detail_summary",
+                    "organizationId": ORGANIZATION_IDS[1],
+                    "error": "unavailable",
+                }
+            ],
+        )
+        self.client.iter_organizations.assert_not_called()
+        self.client.iter_organization_following.assert_not_called()
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            SummaryAggregator(self.client, max_workers=0)
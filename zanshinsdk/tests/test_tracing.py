@@ -0,0 +1,126 @@
+import unittest
+from unittest.mock import mock_open, patch
+
+import httpx
+
+import zanshinsdk
+from zanshinsdk.common import tracing
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+except ImportError:
+    TracerProvider = None
+
+ORGANIZATION_ID = "822f4225-43e9-4922-b6b8-8b0620bdb1e3"
+
+
+class TestTracing(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    @patch("zanshinsdk.client.isfile")
+    def setUp(self, mock_is_file):
+        mock_is_file.return_value = True
+        _data = "[default]\napi_key=api_key"
+
+        self.status_code = 200
+        self.pages = [
+            {"data": [{"id": 1}, {"id": 2}], "cursor": "2"},
+            {"data": [{"id": 3}]},
+        ]
+        with patch("__main__.__builtins__.open", mock_open(read_data=_data)):
+            self.sdk = zanshinsdk.Client(api_url="https://api.test")
+        self.sdk._client = httpx.Client(transport=httpx.MockTransport(self._handler))
+
+        if TracerProvider is not None:
+            self.exporter = InMemorySpanExporter()
+            provider = TracerProvider()
+            provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+            self.tracer = provider.get_tracer("test")
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/alerts"):
+            return httpx.Response(self.status_code, json=self.pages.pop(0))
+        return httpx.Response(self.status_code, json={"id": ORGANIZATION_ID})
+
+    def _spans(self):
+        return {span.name: span for span in self.exporter.get_finished_spans()}
+
+    ###################################################
+    # Without OpenTelemetry
+    ###################################################
+
+    def test_enable_tracing_without_opentelemetry(self):
+        with patch.object(tracing, "_load_trace", return_value=None):
+            self.assertFalse(self.sdk.enable_tracing())
+
+        self.assertNotIn("get_me", self.sdk.__dict__)
+        self.assertNotIn("_request", self.sdk.__dict__)
+
+    ###################################################
+    # With OpenTelemetry
+    ###################################################
+
+    @unittest.skipIf(TracerProvider is None, "OpenTelemetry SDK not installed")
+    def test_method_and_request_spans(self):
+        self.assertTrue(self.sdk.enable_tracing(self.tracer))
+
+        self.sdk.get_organization(ORGANIZATION_ID)
+
+        spans = self._spans()
+        method_span = spans["zanshinsdk.Client.get_organization"]
+        request_span = spans["GET /organizations/{id}"]
+        self.assertEqual(request_span.parent.span_id, method_span.context.span_id)
+        self.assertEqual(request_span.attributes["http.response.status_code"], 200)
+        self.assertEqual(request_span.attributes["url.template"], "/organizations/{id}")
+
+    @unittest.skipIf(TracerProvider is None, "OpenTelemetry SDK not installed")
+    def test_iterator_span(self):
+        self.sdk.enable_tracing(self.tracer)
+
+        alerts = []
+        for alert in self.sdk.iter_alerts(ORGANIZATION_ID, page_size=2):
+            with self.tracer.start_as_current_span("consumer"):
+                alerts.append(alert)
+
+        self.assertEqual(len(alerts), 3)
+        finished = self.exporter.get_finished_spans()
+        iterator_span = self._spans()["zanshinsdk.Client.iter_alerts"]
+        self.assertEqual(iterator_span.attributes["zanshin.page_count"], 2)
+        self.assertEqual(iterator_span.attributes["zanshin.item_count"], 3)
+        request_spans = [
+            span for span in finished if span.name == "POST /organizations/{id}/alerts"
+        ]
+        self.assertEqual(len(request_spans), 2)
+        for span in request_spans:
+            self.assertEqual(span.parent.span_id, iterator_span.context.span_id)
+        for span in finished:
+            if span.name == "consumer":
+                self.assertIsNone(span.parent)
+
+    @unittest.skipIf(TracerProvider is None, "OpenTelemetry SDK not installed")
+    def test_failed_request_span(self):
+        self.sdk.enable_tracing(self.tracer)
+        self.status_code = 404
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.sdk.get_organization(ORGANIZATION_ID)
+
+        request_span = self._spans()["GET /organizations/{id}"]
+        self.assertEqual(request_span.attributes["http.response.status_code"], 404)
+        self.assertFalse(request_span.status.is_ok)
+
+    @unittest.skipIf(TracerProvider is None, "OpenTelemetry SDK not installed")
+    def test_disable_tracing(self):
+        self.sdk.enable_tracing(self.tracer)
+        self.sdk.disable_tracing()
+
+        self.sdk.get_organization(ORGANIZATION_ID)
+
+        self.assertEqual(self.exporter.get_finished_spans(), ())
+        self.assertNotIn("get_organization", self.sdk.__dict__)
@@ -0,0 +1,85 @@
+import ssl
+import unittest
+from unittest.mock import Mock, mock_open, patch
+
+import httpx
+
+import zanshinsdk
+from zanshinsdk.common.transport import SharedTransport, shared_ssl_context
+
+
+class TestTransport(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.requests = []
+        self.transport = SharedTransport(transport=httpx.MockTransport(self._handler))
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    @patch("zanshinsdk.client.isfile")
+    def _client(self, api_key, mock_is_file, **kwargs):
+        mock_is_file.return_value = True
+        with patch("__main__.__builtins__.open", mock_open(read_data="[default]")):
+            return zanshinsdk.Client(
+                api_key=api_key,
+                api_url="https://api.test",
+                transport=self.transport,
+                **kwargs,
+            )
+
+    ###################################################
+    # shared_ssl_context
+    ###################################################
+
+    def test_ssl_context_is_created_once(self):
+        self.assertIs(shared_ssl_context(True), shared_ssl_context(True))
+        self.assertIsNot(shared_ssl_context(True), shared_ssl_context(False))
+
+    def test_ssl_context_is_returned_as_is(self):
+        context = Mock(spec=ssl.SSLContext)
+
+        self.assertIs(shared_ssl_context(context), context)
+
+    ###################################################
+    # SharedTransport
+    ###################################################
+
+    def test_clients_share_the_transport(self):
+        first = self._client("first")
+        second = self._client("second")
+
+        first.get_me()
+        second.get_me()
+        first._client.close()
+        second.get_me()
+
+        self.assertEqual(
+            [request.headers["Authorization"] for request in self.requests],
+            ["Bearer first", "Bearer second", "Bearer second"],
+        )
+        self.assertFalse(self.transport.closed)
+
+    def test_proxy_from_environment_is_ignored(self):
+        with patch.dict("os.environ", {"HTTPS_PROXY": "http://proxy.test:3128"}):
+            client = self._client("key")
+
+            client.get_me()
+
+        self.assertEqual(len(self.requests), 1)
+
+    def test_shutdown(self):
+        client = self._client("key")
+
+        self.transport.shutdown()
+
+        with self.assertRaises(RuntimeError):
+            client.get_me()
+
+    def test_invalid_inner_transport(self):
+        with self.assertRaises(TypeError):
+            SharedTransport(transport="http://api.test")
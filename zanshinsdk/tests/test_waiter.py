@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import Mock
+
+from zanshinsdk.common.waiter import Waiter, is_stack_complete, is_stack_failed
+
+
+class TestWaiter(unittest.TestCase):
+    ###################################################
+    # setUp
+    ###################################################
+
+    def setUp(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def _sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def _waiter(self, **kwargs):
+        return Waiter(sleep=self._sleep, clock=lambda: self.now, **kwargs)
+
+    ###################################################
+    # delays
+    ###################################################
+
+    def test_delays_back_off_up_to_max_delay(self):
+        waiter = self._waiter(initial_delay=1, max_delay=5, multiplier=2, timeout=100)
+        delays = waiter.delays()
+
+        self.assertEqual([next(delays) for _ in range(5)], [1, 2, 4, 5, 5])
+
+    def test_delays_stop_at_deadline(self):
+        waiter = self._waiter(initial_delay=1, max_delay=4, timeout=6)
+
+        delays = []
+        for delay in waiter.delays():
+            delays.append(delay)
+            self._sleep(delay)
+        self.assertEqual(delays, [1, 2, 3])
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            Waiter(initial_delay=0)
+        with self.assertRaises(ValueError):
+            Waiter(initial_delay=2, max_delay=1)
+        with self.assertRaises(ValueError):
+            Waiter(multiplier=0.5)
+        with self.assertRaises(ValueError):
+            Waiter(timeout=0)
+
+    ###################################################
+    # wait
+    ###################################################
+
+    def test_wait_returns_immediately_when_done(self):
+        poll = Mock(return_value="CREATE_COMPLETE")
+
+        state = self._waiter().wait(poll, is_stack_complete, is_stack_failed)
+
+        self.assertEqual(state, "CREATE_COMPLETE")
+        self.assertEqual(self.sleeps, [])
+
+    def test_wait_polls_until_done(self):
+        poll = Mock(
+            side_effect=["CREATE_IN_PROGRESS", "CREATE_IN_PROGRESS", "CREATE_COMPLETE"]
+        )
+
+        self._waiter(initial_delay=0.5).wait(poll, is_stack_complete, is_stack_failed)
+
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+
+    def test_wait_stops_on_failure(self):
+        poll = Mock(
+            side_effect=[
+                "CREATE_IN_PROGRESS",
+                "ROLLBACK_IN_PROGRESS",
+                "ROLLBACK_COMPLETE",
+            ]
+        )
+
+        with self.assertRaises(RuntimeError):
+            self._waiter().wait(poll, is_stack_complete, is_stack_failed)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_wait_times_out(self):
+        poll = Mock(return_value="CREATE_IN_PROGRESS")
+
+        with self.assertRaises(TimeoutError):
+            self._waiter(initial_delay=1, timeout=10).wait(
+                poll, is_stack_complete, is_stack_failed
+            )
+        self.assertEqual(sum(self.sleeps), 10)
+
+    ###################################################
+    # stack states
+    ###################################################
+
+    def test_stack_states(self):
+        self.assertTrue(is_stack_complete("CREATE_COMPLETE"))
+        self.assertTrue(is_stack_complete("UPDATE_COMPLETE"))
+        self.assertTrue(is_stack_complete("UPDATE_ROLLBACK_COMPLETE"))
+        self.assertFalse(is_stack_complete("CREATE_IN_PROGRESS"))
+        self.assertFalse(is_stack_complete("ROLLBACK_COMPLETE"))
+        self.assertTrue(is_stack_failed("CREATE_FAILED"))
+        self.assertTrue(is_stack_failed("ROLLBACK_COMPLETE"))
+        self.assertTrue(is_stack_failed("ROLLBACK_FAILED"))
+        self.assertTrue(is_stack_failed("UPDATE_ROLLBACK_FAILED"))
+        self.assertTrue(is_stack_failed("DELETE_IN_PROGRESS"))
+        self.assertFalse(is_stack_failed("CREATE_IN_PROGRESS"))
+        self.assertFalse(is_stack_failed("ROLLBACK_IN_PROGRESS"))
+        self.assertFalse(is_stack_failed("UPDATE_ROLLBACK_IN_PROGRESS"))
+        self.assertFalse(is_stack_failed("UPDATE_ROLLBACK_COMPLETE"))
+        self.assertFalse(
+            is_stack_failed("UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS")
+        )